@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from nflake8 import __version__
+from nflake8.checks.ast import run_ast_checks
+from nflake8.checks.project import run_project_checks
+from nflake8.checks.tokens import run_token_checks
+from nflake8.core.root import configure_run
+from nflake8.rules.registry import RuleSet, get_all_rules
+
+from .corpus import generate_module
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def _measure(fn: Callable[[], object], *, repeat: int) -> tuple[float, int]:
+    """Best wall time over `repeat` runs, then peak traced memory of one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _row(name: str, lines: int, seconds: float, peak: int) -> dict[str, object]:
+    return {
+        "target": name,
+        "seconds": round(seconds, 6),
+        "lines_per_second": round(lines / seconds) if seconds > 0 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_module(text: str, *, filename: str, repeat: int) -> list[dict[str, object]]:
+    lines = text.count("\n")
+    tree = ast.parse(text)
+    rows: list[dict[str, object]] = []
+
+    def project() -> None:
+        configure_run(None)
+        run_project_checks(filename=filename)
+
+    checks: list[tuple[str, Callable[[], object]]] = [
+        ("layer:project", project),
+        ("layer:ast", lambda: run_ast_checks(tree=tree, filename=filename)),
+        ("layer:tokens", lambda: run_token_checks(text=text, filename=filename)),
+    ]
+    for rule in get_all_rules():
+        rule_set = RuleSet([rule])
+        checks.append(
+            (
+                f"rule:{type(rule).__name__}",
+                lambda rs=rule_set: run_ast_checks(tree=tree, filename=filename, rule_set=rs),
+            )
+        )
+
+    for name, fn in checks:
+        seconds, peak = _measure(fn, repeat=repeat)
+        rows.append(_row(name, lines, seconds, peak))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time every nflake8 check layer and rule on synthetic modules.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated module sizes in lines.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per target (best is kept).")
+    parser.add_argument("--output", default="-", help="JSON output file (default: stdout).")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results: list[dict[str, object]] = []
+
+    with tempfile.TemporaryDirectory() as root:
+        filename = os.path.join(root, "N1", "n1.py")
+        os.makedirs(os.path.dirname(filename))
+        for size in sizes:
+            for n_notation in (True, False):
+                text = generate_module(size, n_notation=n_notation)
+                with open(filename, "w", encoding="utf-8") as f:
+                    f.write(text)
+                for row in bench_module(text, filename=filename, repeat=args.repeat):
+                    row.update({"size": size, "lines": text.count("\n"), "n_notation": n_notation})
+                    results.append(row)
+                print(f"benchmarked {size} lines (n_notation={n_notation})", file=sys.stderr)
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    data = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(data)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import sys
+
+_STDLIB = sorted(m for m in getattr(sys, "stdlib_module_names", ()) if m.isidentifier() and not m.startswith("_"))
+
+
+def _ident(i: int) -> str:
+    return f"{i:010d}"
+
+
+def _imports(width: int, *, n_notation: bool) -> list[str]:
+    out: list[str] = []
+    for i, module in enumerate(_STDLIB[:width]):
+        out.append(f"import {module} as N{i + 1}" if n_notation else f"import {module}")
+    out.append("")
+    for i in range(width):
+        if n_notation:
+            out.append(f"from N1.n{i + 1} import n{_ident(i + 1)}")
+        else:
+            out.append(f"from pkg.mod{i} import helper_{i}")
+    out.append("")
+    out.append("")
+    return out
+
+
+def _class_block(idx: int, members: int, *, n_notation: bool) -> list[str]:
+    if n_notation:
+        cls = f"N{_ident(idx)}"
+        receiver = f"n{_ident(idx)}"
+        out = [f"class {cls}:"]
+        for m in range(members):
+            out.append(f"    n_{_ident(m)} = {m}")
+        for m in range(members // 4):
+            out.append(f"    def _n{_ident(m)}({receiver}, n1, n{_ident(1)}=None):")
+            out.append("        return n1")
+    else:
+        out = [f"class Widget{idx}(Base):", '    """Widget."""']
+        for m in range(members):
+            out.append(f"    field_{m}: int = {m}  # field")
+        for m in range(members // 4):
+            out.append(f"    def method_{m}(self, value, option=None) -> int:")
+            out.append("        return value")
+    out.append("")
+    out.append("")
+    return out
+
+
+def _loop_block(idx: int, depth: int, *, n_notation: bool) -> list[str]:
+    if n_notation:
+        out = [f"def n{_ident(idx)}(n1):"]
+        names = ["n" * (d + 1) for d in range(depth)]
+        total = f"n{_ident(0)}"
+    else:
+        out = [f"def process_{idx}(items):", '    """Process."""']
+        names = [f"i{d}" for d in range(depth)]
+        total = "total"
+    out.append(f"    {total} = 0")
+    for d, name in enumerate(names):
+        if d == 0:
+            source = "n1" if n_notation else "items"
+        else:
+            source = f"range({names[d - 1]})"
+        out.append("    " * (d + 1) + f"for {name} in {source}:")
+    body_indent = "    " * (depth + 1)
+    if n_notation:
+        out.append(body_indent + f"{total} += sum([n for n in range({names[-1]}) for nn in range(n)])")
+    else:
+        out.append(body_indent + f"total += sum([x for x in range({names[-1]}) for y in range(x)])  # sum")
+    out.append(f"    return {total}")
+    out.append("")
+    out.append("")
+    return out
+
+
+def generate_module(lines: int, *, n_notation: bool = True, import_width: int = 40) -> str:
+    """
+    Synthetic module of roughly `lines` lines: a wide import block, then
+    alternating large class bodies and deeply nested loops.
+
+    n_notation=True produces (mostly) clean code, False produces code that
+    violates nearly every rule.
+    """
+    out = _imports(min(import_width, max(1, lines // 20)), n_notation=n_notation)
+    idx = 1
+    while len(out) < lines:
+        if idx % 2:
+            out.extend(_class_block(idx, members=40, n_notation=n_notation))
+        else:
+            out.extend(_loop_block(idx, depth=1 + idx % 6, n_notation=n_notation))
+        idx += 1
+    return "\n".join(out) + "\n"
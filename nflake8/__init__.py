@@ -1,3 +1,5 @@
-__all__ = ["__version__"]
+__all__ = ["FileResult", "__version__", "lint_files", "lint_stats"]
 
 __version__ = "1.2.0"
+
+from .api import FileResult, lint_files, lint_stats  # noqa: E402
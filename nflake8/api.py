@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+from .checks.project import run_project_checks
+from .core.batch import ViolationBatch
+from .core.ids import enable_id_ledger, get_ledger_dir
+from .core.index import SymbolIndex, get_symbol_index, install_symbol_index, symbol_index_for
+from .core.profile import checkpoint, enable_profiling, get_dump_dir, get_profiler, timed
+from .core.root import configure_run, find_project_root
+from .core.source import read_lines
+from .core.types import Violation
+from .runner import check_text, filter_noqa
+from .stats import ViolationStats
+
+DEFAULT_EXCLUDE = (".svn", "CVS", ".bzr", ".hg", ".git", "__pycache__", ".tox", ".nox", ".eggs", "*.egg")
+
+# chunks kept queued per worker, so workers never wait for the parent
+_CHUNKS_IN_FLIGHT_PER_JOB = 2
+_MAX_CHUNK_SIZE = 64
+
+# (filename, project-level violations, look imports up in the symbol index)
+_Task = tuple[str, list[Violation], bool]
+_R = TypeVar("_R")
+
+
+@dataclass(frozen=True, slots=True)
+class FileResult:
+    _filename: str
+    _batch: ViolationBatch
+    _violations: list[Violation] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def batch(self) -> ViolationBatch:
+        """The violations in columns: count or filter them without building objects."""
+        return self._batch
+
+    @property
+    def violations(self) -> list[Violation]:
+        """The violations as objects (built from the batch once, on first access)."""
+        found = self._violations
+        if found is None:
+            found = list(self._batch)
+            # a cache of the batch, not state of its own
+            object.__setattr__(self, "_violations", found)
+        return found
+
+
+def lint_files(
+    paths: Iterable[str],
+    *,
+    jobs: int = 1,
+    ordered: bool = False,
+    chunksize: int | None = None,
+    exclude: Sequence[str] = DEFAULT_EXCLUDE,
+    symbol_index: bool = False,
+) -> Iterator[FileResult]:
+    """
+    Check files (directories are expanded to their .py files) with all three layers.
+
+    Project-level checks run in this process, once for the whole batch (roots and
+    README.md are resolved once, NNO500 is reported once per root); the AST and
+    token layers run on `jobs` worker processes, which receive the files in chunks.
+    Results come in completion order, or in input order with ordered=True.
+
+    With symbol_index=True, the symbol index of every project involved is brought
+    up to date here too, and from-imports are checked against it (NNO304).
+    """
+    # biggest files first, unless results must follow the input order anyway
+    files = _expand(paths, exclude=exclude) if ordered else discover_files(paths, exclude=exclude)
+    for results in _run_chunks(
+        _check_chunk, files, jobs=jobs, ordered=ordered, chunksize=chunksize, symbol_index=symbol_index
+    ):
+        yield from results
+
+
+def lint_stats(
+    paths: Iterable[str],
+    *,
+    jobs: int = 1,
+    chunksize: int | None = None,
+    exclude: Sequence[str] = DEFAULT_EXCLUDE,
+    symbol_index: bool = False,
+) -> ViolationStats:
+    """
+    Count violations per file and code like lint_files() would report them.
+
+    Workers count the violations of their chunks themselves and send back only
+    the counters, which are merged here; no result objects cross processes and
+    no message or suggested name is ever rendered.
+    """
+    files = discover_files(paths, exclude=exclude)
+    stats = ViolationStats()
+    for chunk_stats in _run_chunks(
+        _count_chunk, files, jobs=jobs, ordered=False, chunksize=chunksize, symbol_index=symbol_index
+    ):
+        stats.merge(chunk_stats)
+    return stats
+
+
+def _run_chunks(
+    check: Callable[[list[_Task]], _R],
+    files: list[str],
+    *,
+    jobs: int,
+    ordered: bool,
+    chunksize: int | None,
+    symbol_index: bool,
+) -> Iterator[_R]:
+    configure_run(None)
+    indexes = _symbol_indexes(files) if symbol_index else []
+    tasks = (
+        (filename, timed("layer:project", run_project_checks, filename=filename), symbol_index) for filename in files
+    )
+
+    if jobs <= 1 or len(files) <= 1:
+        for task in tasks:
+            yield check([task])
+        return
+
+    if chunksize is None:
+        chunksize = max(1, min(_MAX_CHUNK_SIZE, len(files) // (jobs * 4)))
+    yield from _lint_in_pool(check, _chunks(tasks, chunksize), jobs=jobs, ordered=ordered, indexes=indexes)
+
+
+def _symbol_indexes(files: list[str]) -> list[SymbolIndex]:
+    roots = {find_project_root(filename) for filename in files}
+    return [get_symbol_index(root) for root in sorted(r for r in roots if r is not None)]
+
+
+def _lint_in_pool(
+    check: Callable[[list[_Task]], _R],
+    chunks: Iterator[list[_Task]],
+    *,
+    jobs: int,
+    ordered: bool,
+    indexes: list[SymbolIndex],
+) -> Iterator[_R]:
+    """Results of check() for each chunk, run on a pool."""
+    dump_dir = get_dump_dir() if get_profiler() is not None else None
+    initargs = (dump_dir, get_ledger_dir(), indexes)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        pending: dict[Future[_R], int] = {}
+        done_chunks: dict[int, _R] = {}
+        next_index = 0
+        next_to_yield = 0
+
+        def submit() -> bool:
+            nonlocal next_index
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            pending[pool.submit(check, chunk)] = next_index
+            next_index += 1
+            return True
+
+        for _ in range(jobs * _CHUNKS_IN_FLIGHT_PER_JOB):
+            if not submit():
+                break
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = pending.pop(future)
+                submit()
+                if not ordered:
+                    yield future.result()
+                    continue
+                done_chunks[index] = future.result()
+                while next_to_yield in done_chunks:
+                    yield done_chunks.pop(next_to_yield)
+                    next_to_yield += 1
+
+
+def _init_worker(dump_dir: str | None, ledger_dir: str | None, indexes: list[SymbolIndex]) -> None:
+    # spawned workers start from scratch: enable what the parent has enabled
+    if dump_dir is not None:
+        enable_profiling(dump_dir)
+    if ledger_dir is not None:
+        enable_id_ledger(ledger_dir)
+    for index in indexes:
+        install_symbol_index(index)
+
+
+def _check_chunk(chunk: list[_Task]) -> list[FileResult]:
+    results = [_check_task(task) for task in chunk]
+    checkpoint()
+    return results
+
+
+def _count_chunk(chunk: list[_Task]) -> ViolationStats:
+    stats = ViolationStats()
+    for task in chunk:
+        stats.add(task[0], Counter(v.code for v in _task_violations(task)))
+    checkpoint()
+    return stats
+
+
+def _check_task(task: _Task) -> FileResult:
+    return FileResult(_filename=task[0], _batch=ViolationBatch.from_violations(_task_violations(task)))
+
+
+def _task_violations(task: _Task) -> list[Violation]:
+    filename, project, indexed = task
+    lines = read_lines(filename)
+    v = project + check_text(text=lines, filename=filename, index=symbol_index_for(filename) if indexed else None)
+    return filter_noqa(v, lines)
+
+
+def _chunks(tasks: Iterable[_Task], size: int) -> Iterator[list[_Task]]:
+    chunk: list[_Task] = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def discover_files(paths: Iterable[str], *, exclude: Sequence[str] = DEFAULT_EXCLUDE) -> list[str]:
+    """Expand paths into .py files, biggest first (so huge files do not start last)."""
+    found = [(_size(path), path) for path in _expand(paths, exclude=exclude)]
+    found.sort(key=lambda item: -item[0])
+    return [path for _, path in found]
+
+
+def _expand(paths: Iterable[str], *, exclude: Sequence[str]) -> list[str]:
+    """Expand paths into .py files, in the order given (directories sorted by name)."""
+    out: list[str] = []
+    seen: set[str] = set()
+
+    def add(path: str) -> None:
+        if path not in seen:
+            seen.add(path)
+            out.append(path)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not is_excluded(d, exclude))
+                for name in sorted(filenames):
+                    if name.endswith(".py") and not is_excluded(name, exclude):
+                        add(os.path.join(dirpath, name))
+        else:
+            add(path)
+    return out
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def is_excluded(name: str, exclude: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in exclude if pattern)
@@ -1,44 +1,151 @@
 from __future__ import annotations
 
 import ast
+import time
 
+from ..core.profile import get_profiler
 from ..rules.base import Source
-from ..rules.registry import get_all_rules
+from ..rules.registry import RuleSet, get_rule_set
 from ..core.types import Violation
 
+# (scope, node, its global/nonlocal declarations) of an enclosing function
+_Frame = tuple[str, ast.FunctionDef | ast.AsyncFunctionDef, dict[str, str]]
 
-def run_ast_checks(*, tree: ast.AST, filename: str) -> list[Violation]:
-    walker = _AstWalker(tree=tree, filename=filename)
-    walker.visit(tree)
+
+def run_ast_checks(*, tree: ast.AST, filename: str, rule_set: RuleSet | None = None) -> list[Violation]:
+    if rule_set is None:
+        rule_set = get_rule_set()
+    rule_set.begin_file()
+    walker = _AstWalker(tree=tree, filename=filename, rule_set=rule_set)
+    walker.walk(tree)
     return walker.violations
 
 
-class _AstWalker(ast.NodeVisitor):
-    def __init__(self, *, tree: ast.AST, filename: str) -> None:
+class _AstWalker:
+    """
+    Single pass over the tree that tracks the traversal context on the way down
+    (enclosing class and scope, class-body statements, loop depth, generator
+    index), so rules read it from Source instead of climbing parents.
+
+    `global`/`nonlocal` declarations are recorded as they are met: Python
+    requires them before any binding of the name in the scope, so every binding
+    they affect is walked after them.
+    """
+
+    def __init__(self, *, tree: ast.AST, filename: str, rule_set: RuleSet) -> None:
         self._tree = tree
         self._filename = filename
-        self._class_stack: list[ast.ClassDef] = []
+        self._dispatch = rule_set.dispatch
+        self._profiler = get_profiler()
         self.violations: list[Violation] = []
 
-    @property
-    def _current_class(self) -> ast.ClassDef | None:
-        return self._class_stack[-1] if self._class_stack else None
-
-    def _check_rules(self, node: ast.AST) -> None:
-        source = Source(
-            _node=node,
-            _current_class=self._current_class,
-            _tree=self._tree,
-            _filename=self._filename,
-        )
-        for rule in get_all_rules():
-            self.violations.extend(rule.check(source))
-
-    def visit(self, node: ast.AST) -> None:
-        self._check_rules(node)
-        super().visit(node)
-
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
-        self._class_stack.append(node)
-        self.generic_visit(node)
-        self._class_stack.pop()
+    def walk(
+        self,
+        node: ast.AST,
+        *,
+        current_class: ast.ClassDef | None = None,
+        is_class_body_stmt: bool = False,
+        loop_depth: int = 0,
+        generator_index: int = 0,
+        scope: str = "",
+        declared: dict[str, str] | None = None,
+        frames: tuple[_Frame, ...] = (),
+    ) -> None:
+        rules = self._dispatch.get(type(node))
+        if rules:
+            source = Source(
+                _node=node,
+                _current_class=current_class,
+                _tree=self._tree,
+                _filename=self._filename,
+                _is_class_body_stmt=is_class_body_stmt,
+                _loop_depth=loop_depth,
+                _generator_index=generator_index,
+                _scope=scope,
+                _declared=declared or None,
+            )
+            if self._profiler is None:
+                for rule in rules:
+                    self.violations.extend(rule.check(source))
+            else:
+                self._check_profiled(rules, source)
+
+        is_class = isinstance(node, ast.ClassDef)
+        child_class = node if is_class else current_class
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            loop_depth += 1
+        if is_class or isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            scope = f"{scope}.{node.name}" if scope else node.name
+            declared = {}
+            if not is_class:
+                frames = (*frames, (scope, node, declared))
+        elif isinstance(node, ast.Global) and declared is not None:
+            declared.update(dict.fromkeys(node.names, ""))
+        elif isinstance(node, ast.Nonlocal) and declared is not None:
+            outer = frames[:-1] if frames and frames[-1][0] == scope else frames
+            declared.update((name, _nonlocal_scope(name, outer, scope)) for name in node.names)
+
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.AST):
+                self.walk(
+                    value,
+                    current_class=child_class,
+                    loop_depth=loop_depth,
+                    scope=scope,
+                    declared=declared,
+                    frames=frames,
+                )
+            elif isinstance(value, list):
+                in_class_body = is_class and field == "body"
+                is_generators = field == "generators"
+                for index, item in enumerate(value):
+                    if isinstance(item, ast.AST):
+                        self.walk(
+                            item,
+                            current_class=child_class,
+                            is_class_body_stmt=in_class_body,
+                            loop_depth=loop_depth,
+                            generator_index=index if is_generators else 0,
+                            scope=scope,
+                            declared=declared,
+                            frames=frames,
+                        )
+
+    def _check_profiled(self, rules, source: Source) -> None:
+        for rule in rules:
+            started = time.perf_counter()
+            found = rule.check(source)
+            self._profiler.add(f"rule:{type(rule).__name__}", time.perf_counter() - started, len(found))
+            self.violations.extend(found)
+
+
+def _nonlocal_scope(name: str, frames: tuple[_Frame, ...], default: str) -> str:
+    """The scope of the enclosing function that binds name, following its own `nonlocal`."""
+    for scope, node, declared in reversed(frames):
+        if name in declared:
+            return declared[name]
+        if name in _local_names(node):
+            return scope
+    return default
+
+
+def _local_names(node: ast.FunctionDef | ast.AsyncFunctionDef) -> set[str]:
+    args = node.args
+    names = {arg.arg for arg in (*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg) if arg}
+    stack: list[ast.AST] = list(node.body)
+    while stack:
+        inner = stack.pop()
+        if isinstance(inner, ast.Name) and not isinstance(inner.ctx, ast.Load):
+            names.add(inner.id)
+        elif isinstance(inner, (ast.Import, ast.ImportFrom)):
+            names.update(alias.asname or alias.name.split(".")[0] for alias in inner.names)
+        elif isinstance(inner, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and inner.name:
+            names.add(inner.name)
+        if isinstance(inner, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # bound here, but their bodies are scopes of their own
+            names.add(inner.name)
+            stack.extend(inner.decorator_list)
+            continue
+        if not isinstance(inner, ast.Lambda):
+            stack.extend(ast.iter_child_nodes(inner))
+    return names
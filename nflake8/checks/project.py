@@ -2,57 +2,117 @@ from __future__ import annotations
 
 import os
 import re
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator
 
 from ..core.errors import ErrorCodes
-from ..core.root import (
-    find_project_root,
-    get_readme_status,
-    mark_readme_reported,
-    was_readme_reported,
-)
+from ..core.root import ROOT_MARKER_DIRS, ROOT_MARKER_FILES, claim_readme_check, find_project_root, get_readme_status
 from ..core.types import Violation
 
+PROJECT_CODES = frozenset({"NNO401", "NNO420", "NNO500"})
+
 _FILENAME_RE = re.compile(r"n\d+\.py\Z")
 _DIR_RE = re.compile(r"N\d+(?:_\d+)*\Z")
 
 
-def run_project_checks(*, filename: str) -> list[Violation]:
+def run_project_checks(*, filename: str, codes: frozenset[str] | None = None) -> list[Violation]:
+    if codes is None:
+        codes = PROJECT_CODES
+    root = find_project_root(filename) if "NNO420" in codes or "NNO500" in codes else None
+    return _project_violations(
+        base=os.path.basename(filename),
+        dirpath=os.path.dirname(os.path.abspath(filename)),
+        root=root,
+        codes=codes,
+    )
+
+
+def scan_project(
+    paths: Iterable[str],
+    *,
+    codes: frozenset[str] | None = None,
+    skip: Callable[[str], bool] | None = None,
+) -> Iterator[tuple[str, list[Violation]]]:
+    """
+    Project-level violations of every .py file under paths, without opening them.
+
+    Each directory is listed once with os.scandir; its project root is derived
+    from the listing (marker files) instead of being searched for per file.
+    `skip(name)` excludes files and directories by name.
+    """
+    if codes is None:
+        codes = PROJECT_CODES
+    for path in paths:
+        if os.path.isdir(path):
+            yield from _scan_tree(path, codes=codes, skip=skip)
+        else:
+            yield path, run_project_checks(filename=path, codes=codes)
+
+
+def _scan_tree(
+    top: str,
+    *,
+    codes: frozenset[str],
+    skip: Callable[[str], bool] | None,
+) -> Iterator[tuple[str, list[Violation]]]:
+    # (path as given, absolute path, project root of the parent directory)
+    stack: list[tuple[str, str, str | None]] = [(top, os.path.abspath(top), None)]
+    while stack:
+        dirpath, abs_dir, parent_root = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        is_root = False
+        files: list[str] = []
+        subdirs: list[str] = []
+        for entry in entries:
+            name = entry.name
+            try:
+                if (name in ROOT_MARKER_DIRS and entry.is_dir()) or (name in ROOT_MARKER_FILES and entry.is_file()):
+                    is_root = True
+                if skip is not None and skip(name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(name)
+                elif name.endswith(".py") and entry.is_file():
+                    files.append(name)
+            except OSError:
+                continue
+
+        if is_root:
+            root: str | None = abs_dir
+        elif abs_dir == os.path.abspath(top):
+            root = find_project_root(os.path.join(abs_dir, "__init__.py"))
+        else:
+            root = parent_root
+
+        for name in files:
+            yield os.path.join(dirpath, name), _project_violations(base=name, dirpath=abs_dir, root=root, codes=codes)
+        for name in reversed(subdirs):
+            stack.append((os.path.join(dirpath, name), os.path.join(abs_dir, name), root))
+
+
+def _project_violations(*, base: str, dirpath: str, root: str | None, codes: frozenset[str]) -> list[Violation]:
     v: list[Violation] = []
 
-    base = os.path.basename(filename)
-    if base and not _FILENAME_RE.fullmatch(base):
-        v.append(
-            Violation(
-                _line=1,
-                _col=0,
-                _code="NNO401",
-                _message=ErrorCodes.NNO401.format(name=base),
-            )
-        )
+    if "NNO401" in codes:
+        found = _filename_violation(base)
+        if found is not None:
+            v.append(found)
 
-    root = find_project_root(filename)
     if root is None:
         return v
 
     # Check parent-chain directories
-    rel_dir = os.path.relpath(os.path.dirname(filename), root)
-    if rel_dir not in (".", ""):
-        parts = [p for p in rel_dir.split(os.sep) if p and p != "."]
-        for p in parts:
-            if not _DIR_RE.fullmatch(p):
-                v.append(
-                    Violation(
-                        _line=1,
-                        _col=0,
-                        _code="NNO420",
-                        _message=ErrorCodes.NNO420.format(name=p),
-                    )
-                )
-                break
-
-    status = get_readme_status(root)
-    if not status.ok and not was_readme_reported(root):
-        mark_readme_reported(root)
+    if "NNO420" in codes:
+        found = _directory_violation(dirpath, root)
+        if found is not None:
+            v.append(found)
+
+    if "NNO500" in codes and claim_readme_check(root) and not get_readme_status(root).ok:
         v.append(
             Violation(
                 _line=1,
@@ -63,3 +123,37 @@ def run_project_checks(*, filename: str) -> list[Violation]:
         )
 
     return v
+
+
+@lru_cache(maxsize=1 << 14)
+def _filename_violation(base: str) -> Violation | None:
+    if not base or _FILENAME_RE.fullmatch(base):
+        return None
+    return Violation(
+        _line=1,
+        _col=0,
+        _code="NNO401",
+        _message=ErrorCodes.NNO401,
+        _args=(("name", base),),
+    )
+
+
+@lru_cache(maxsize=1 << 14)
+def _directory_violation(dirpath: str, root: str) -> Violation | None:
+    """NNO420 for the topmost invalid directory between root and dirpath (each name is checked once)."""
+    parent = os.path.dirname(dirpath)
+    if dirpath == root or parent == dirpath:
+        return None
+    found = _directory_violation(parent, root)
+    if found is not None:
+        return found
+    name = os.path.basename(dirpath)
+    if _DIR_RE.fullmatch(name):
+        return None
+    return Violation(
+        _line=1,
+        _col=0,
+        _code="NNO420",
+        _message=ErrorCodes.NNO420,
+        _args=(("name", name),),
+    )
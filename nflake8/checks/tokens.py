@@ -1,48 +1,128 @@
 from __future__ import annotations
 
 import ast
-import io
+import difflib
 import sys
 import tokenize
 from dataclasses import dataclass
 from typing import Iterable
 
 from ..core.errors import ErrorCodes
-from ..core.patterns import (
-    is_class_name,
-    is_const_name,
-    is_func_name,
-    is_import_alias,
-    is_noqa_comment,
-    is_var_name,
-)
+from ..core.index import SymbolIndex
+from ..core.patterns import NameKind, classify_name, is_import_alias, is_noqa_comment
+from ..core.profile import timed
+from ..core.source import SourceText, head_lines, joined, readline
 from ..core.types import Violation
 
-
-def run_token_checks(*, text: str, filename: str) -> list[Violation]:
+COMMENT_CODES = frozenset({"NNO601"})
+IMPORT_CODES = frozenset({"NNO301", "NNO302", "NNO303", "NNO304", "NNO310", "NNO311", "NNO312"})
+TOKEN_CODES = COMMENT_CODES | IMPORT_CODES
+
+
+def run_token_checks(
+    *,
+    text: SourceText,
+    filename: str,
+    tree: ast.AST | None = None,
+    tokens: Iterable[tokenize.TokenInfo] | None = None,
+    codes: frozenset[str] | None = None,
+    index: SymbolIndex | None = None,
+) -> list[Violation]:
+    """
+    Run comment and import checks.
+
+    `text` is the file as one string or as its lines (e.g. flake8's `lines`);
+    lines are tokenized as they are, without joining them. `tree` and `tokens`
+    are what flake8 already built for the file; when they are not given
+    (standalone use), the text is tokenized / parsed here, the import checks only
+    up to the end of the first import block. With `codes`, passes
+    that cannot emit any of them are skipped. With the project's symbol `index`,
+    from-imports of project modules are checked against what they define (NNO304).
+    """
+    want_comments = codes is None or bool(COMMENT_CODES & codes)
+    want_imports = codes is None or bool(IMPORT_CODES & codes)
     v: list[Violation] = []
 
-    # Comments (allow only noqa)
-    for tok in _iter_tokens(text):
-        if tok.type == tokenize.COMMENT and not is_noqa_comment(tok.string):
-            v.append(
-                Violation(
-                    _line=tok.start[0],
-                    _col=tok.start[1],
-                    _code="NNO601",
-                    _message=ErrorCodes.NNO601,
-                )
-            )
+    # Comments and, without a tree, the end of the import block come from one
+    # token stream; with comments off it is abandoned right after the imports
+    scan = _TokenScan(comments=want_comments, find_import_end=want_imports and tree is None)
+    if scan.comments or scan.find_import_end:
+        v.extend(timed("tokens:comments", scan.run, tokens=_iter_tokens(text) if tokens is None else tokens))
 
     # Imports (aliasing + grouping + ordering)
-    v.extend(_check_imports(text))
+    if want_imports:
+        v.extend(
+            timed(
+                "tokens:imports",
+                _check_imports,
+                text=text,
+                tree=tree,
+                end_line=scan.import_end,
+                filename=filename,
+                index=index,
+            )
+        )
 
     return v
 
 
-def _iter_tokens(text: str) -> Iterable[tokenize.TokenInfo]:
+class _TokenScan:
+    """
+    One pass over the token stream: NNO601 comments and/or the line where the
+    first import block ends (first logical line not starting with import/from).
+    Without comments, the stream is abandoned as soon as that line is found.
+    """
+
+    def __init__(self, *, comments: bool, find_import_end: bool) -> None:
+        self.comments = comments
+        self.find_import_end = find_import_end
+        self.import_end: int | None = None
+
+    def run(self, *, tokens: Iterable[tokenize.TokenInfo]) -> list[Violation]:
+        v: list[Violation] = []
+        searching = self.find_import_end
+        at_line_start = True
+
+        for tok in tokens:
+            if searching:
+                if tok.type == tokenize.NEWLINE:
+                    at_line_start = True
+                elif tok.type not in _NON_CODE_TOKENS:
+                    if at_line_start and not (tok.type == tokenize.NAME and tok.string in ("import", "from")):
+                        self.import_end = tok.start[0]
+                        searching = False
+                        if not self.comments:
+                            break
+                    at_line_start = False
+
+            # Comments (allow only noqa)
+            if self.comments and tok.type == tokenize.COMMENT and not is_noqa_comment(tok.string):
+                v.append(
+                    Violation(
+                        _line=tok.start[0],
+                        _col=tok.start[1],
+                        _code="NNO601",
+                        _message=ErrorCodes.NNO601,
+                    )
+                )
+        return v
+
+
+_NON_CODE_TOKENS = frozenset(
+    {
+        tokenize.COMMENT,
+        tokenize.NL,
+        tokenize.ENCODING,
+        tokenize.INDENT,
+        tokenize.DEDENT,
+        tokenize.ENDMARKER,
+    }
+)
+
+
+def _iter_tokens(text: SourceText) -> Iterable[tokenize.TokenInfo]:
     # tokenize works on readline
-    return tokenize.generate_tokens(io.StringIO(text).readline)
+    return tokenize.generate_tokens(readline(text))
 
 
 @dataclass(frozen=True, slots=True)
@@ -79,25 +159,46 @@ class _ImportStmt:
         return self._col
 
 
-def _check_imports(text: str) -> list[Violation]:
-    try:
-        tree = ast.parse(text)
-    except SyntaxError:
-        return []
+def _check_imports(
+    *,
+    text: SourceText,
+    tree: ast.AST | None = None,
+    end_line: int | None = None,
+    filename: str = "",
+    index: SymbolIndex | None = None,
+) -> list[Violation]:
+    """
+    Alias, grouping and ordering checks for the first contiguous import block.
+
+    Without a tree only the lines before end_line (where the import block ends)
+    are parsed, so a syntax error further down does not stop these checks (with
+    a tree, or when end_line is not known, nothing is reported for a file that
+    does not parse).
+    """
+    if tree is None:
+        try:
+            tree = ast.parse("".join(head_lines(text, end_line)) if end_line is not None else joined(text))
+        except SyntaxError:
+            return []
 
-    lines = text.splitlines()
     imports: list[_ImportStmt] = []
+    missing: list[Violation] = []
 
     for node in tree.body:
         if isinstance(node, ast.Import):
             imports.extend(_collect_import(node))
         elif isinstance(node, ast.ImportFrom):
             imports.extend(_collect_importfrom(node))
+            if index is not None:
+                missing.extend(_check_imported_names(node, filename, index))
         else:
             # do not enforce "imports only at top"; just stop the first block
             # grouping/order rules apply within the first contiguous block only
             break
 
+    # blank lines are only looked at between imports
+    lines = [line.rstrip("\n") for line in head_lines(text, imports[-1].end_lineno + 1)] if imports else []
+
     v: list[Violation] = []
 
     # aliasing errors
@@ -113,12 +214,37 @@ def _check_imports(text: str) -> list[Violation]:
                 )
             )
 
+    # names the project's modules do not define
+    v.extend(missing)
+
     # grouping, ordering, blank lines
     v.extend(_check_import_grouping_and_order(imports, lines))
 
     return v
 
 
+def _check_imported_names(node: ast.ImportFrom, filename: str, index: SymbolIndex) -> list[Violation]:
+    module = index.resolve(filename, node.module, node.level or 0)
+    if module is None:
+        return []
+    v: list[Violation] = []
+    for alias in node.names:
+        if alias.name == "*" or index.has_name(module, alias.name) is not False:
+            continue
+        close = difflib.get_close_matches(alias.name, sorted(index.names(module)), n=1)
+        v.append(
+            Violation(
+                _line=node.lineno,
+                _col=getattr(node, "col_offset", 0) or 0,
+                _code="NNO304",
+                _message=ErrorCodes.NNO304,
+                _args=(("name", alias.name), ("module", module)),
+                _suggest=close[0] if close else None,
+            )
+        )
+    return v
+
+
 def _collect_import(node: ast.Import) -> list[_ImportStmt]:
     out: list[_ImportStmt] = []
     end_lineno = getattr(node, "end_lineno", node.lineno) or node.lineno
@@ -135,7 +261,7 @@ def _collect_import(node: ast.Import) -> list[_ImportStmt]:
             key = None
         else:
             code = None
-            key = int(alias.asname[1:])
+            key = classify_name(alias.asname).segments[0]
 
         out.append(
             _ImportStmt(
@@ -216,38 +342,23 @@ def _is_n_module_path(path: str) -> bool:
 
 
 def _is_n_object_name(name: str) -> bool:
-    return bool(
-        is_var_name(name)
-        or is_func_name(name)
-        or is_const_name(name)
-        or is_class_name(name)
-    )
+    return bool(classify_name(name).kinds & (NameKind.VAR | NameKind.CLASS))
 
 
 def _is_valid_from_alias(imported_name: str, asname: str) -> bool:
+    kinds = classify_name(asname).kinds
     # If original looks like Class/Const (Uppercase), alias must be N-notation class/const.
     if imported_name and imported_name[0].isupper():
-        return bool(is_const_name(asname) or is_class_name(asname))
+        return bool(kinds & NameKind.CLASS)
     # Otherwise treat as function/variable (lowercase/underscore/etc).
-    return bool(is_var_name(asname) or is_func_name(asname))
+    return bool(kinds & NameKind.VAR)
 
 
 def _alias_sort_key(asname: str) -> int | None:
-    if not asname:
-        return None
-    if asname[0] == "N":
-        # N<10 digits> or derived class N<10 digits>n<10 digits>...
-        digits = asname[1:11]
-        if len(digits) == 10 and digits.isdigit():
-            return int(digits)
-        return None
-    if asname[0] == "n":
-        payload = asname[1:]
-        if len(payload) == 10 and payload.isdigit():
-            return int(payload)
-        if len(payload) == 10 and set(payload) <= {"0", "1"}:
-            return int(payload, 2)
-        return None
+    # N<10 digits>[n<10 digits>...] sorts by the root id, n<10 digits/bits> by its value
+    info = classify_name(asname)
+    if info.kinds & (NameKind.VAR | NameKind.CLASS):
+        return info.segments[0]
     return None
 
 
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from collections import Counter
+from typing import Iterable, Sequence
+
+from . import __version__
+from .api import DEFAULT_EXCLUDE, discover_files, is_excluded, lint_files, lint_stats
+from .checks.project import scan_project
+from .core.ids import enable_id_ledger
+from .core.profile import collect, enable_profiling, get_profiler
+from .core.root import configure_run
+from .core.runs import default_runs_dir, end_run, start_run
+from .core.types import Violation
+from .diff import GitError, changed_lines, filter_to_ranges
+from .stats import ViolationStats
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    exclude = tuple(args.exclude.split(",")) if args.exclude is not None else DEFAULT_EXCLUDE
+
+    if args.daemon or args.client:
+        return _run_daemon_mode(args, exclude=exclude)
+
+    if args.diff is not None:
+        try:
+            changed = changed_lines(args.diff)
+        except GitError as e:
+            print(f"nflake8: {e}", file=sys.stderr)
+            return 2
+        targets = _select_changed(changed, args.paths, exclude=exclude)
+    else:
+        changed = {}
+        targets = args.paths
+
+    run_dir: str | None = None
+    if args.profile or args.profile_json:
+        # workers write their stats to the run directory
+        run_dir = start_run(default_runs_dir())
+        enable_profiling(run_dir)
+
+    if args.id_ledger:
+        enable_id_ledger()
+
+    if args.nno_fix:
+        _fix(targets, jobs=args.jobs, exclude=exclude)
+
+    stats = ViolationStats() if args.nno_stats else None
+    results: Iterable[tuple[str, list[Violation]]]
+    if stats is not None and not (args.project_only or args.diff_hunks):
+        # counted in the workers: violations never leave them
+        stats = lint_stats(targets, jobs=args.jobs, exclude=exclude, symbol_index=args.symbol_index)
+        results = ()
+    elif args.project_only:
+        configure_run(None)
+        results = scan_project(targets, skip=lambda name: is_excluded(name, exclude))
+    else:
+        results = (
+            (r.filename, r.violations)
+            for r in lint_files(targets, jobs=args.jobs, exclude=exclude, symbol_index=args.symbol_index)
+        )
+
+    found = 0
+    for filename, violations in results:
+        if args.diff_hunks:
+            violations = filter_to_ranges(violations, changed.get(os.path.realpath(filename)))
+        if stats is not None:
+            stats.add(filename, Counter(v.code for v in violations))
+            continue
+        found += len(violations)
+        _write_violations(filename, violations, sys.stdout)
+
+    if stats is not None:
+        found = stats.total
+        sys.stdout.write(stats.to_csv() if args.nno_stats_format == "csv" else stats.to_json() + "\n")
+
+    if get_profiler() is not None:
+        _report_profile(args.profile_json)
+    if run_dir is not None:
+        end_run(run_dir)
+
+    if found and not args.exit_zero:
+        return 1
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="nflake8",
+        description="Check files against N notation without going through flake8.",
+    )
+    parser.add_argument("paths", nargs="*", default=["."], help="Files or directories to check.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--exclude",
+        default=None,
+        help="Comma-separated glob patterns of files/directories to skip.",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs="?",
+        const="HEAD",
+        default=None,
+        metavar="REF",
+        help="Only check .py files changed against git REF (default: HEAD), including untracked files.",
+    )
+    parser.add_argument(
+        "--diff-hunks",
+        action="store_true",
+        help="With --diff, only report violations on changed lines (project-level checks are always kept).",
+    )
+    parser.add_argument(
+        "--project-only",
+        action="store_true",
+        help="Only check file/directory names and README.md; Python files are not opened (no noqa).",
+    )
+    parser.add_argument(
+        "--symbol-index",
+        action="store_true",
+        help="Check from-imports of project modules against a project-wide index of their names (NNO304).",
+    )
+    parser.add_argument(
+        "--id-ledger",
+        action="store_true",
+        help="Give suggested names ids that are unique in the project, recorded in a ledger between runs.",
+    )
+    parser.add_argument(
+        "--nno-fix",
+        action="store_true",
+        help="Rename symbols to their suggested names in place before checking (files are written atomically).",
+    )
+    parser.add_argument(
+        "--nno-stats",
+        action="store_true",
+        help="Print violation counts per code, directory and file instead of the violations.",
+    )
+    parser.add_argument(
+        "--nno-stats-format",
+        default="json",
+        choices=("json", "csv"),
+        help="Format of the --nno-stats report (default: json).",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Serve lint requests on a local socket, keeping caches warm between requests.",
+    )
+    parser.add_argument("--client", action="store_true", help="Send the paths to a running --daemon.")
+    parser.add_argument("--socket", default=None, help="Socket path for --daemon/--client.")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time, calls and violations per rule and check layer to stderr.",
+    )
+    parser.add_argument("--profile-json", default=None, metavar="PATH", help="Write the profile as JSON to PATH.")
+    parser.add_argument("--exit-zero", action="store_true", help="Exit with 0 even if violations were found.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return parser
+
+
+def _run_daemon_mode(args: argparse.Namespace, *, exclude: Sequence[str]) -> int:
+    from . import daemon
+
+    try:
+        socket_path = args.socket or daemon.default_socket_path()
+        if args.daemon:
+            daemon.serve(socket_path)
+            return 0
+    except OSError as e:
+        print(f"nflake8: {e}", file=sys.stderr)
+        return 2
+
+    found = 0
+    for filename in discover_files(args.paths, exclude=exclude):
+        response = daemon.request(socket_path, {"op": "lint", "path": os.path.abspath(filename)})
+        if "error" in response:
+            print(f"nflake8: {filename}: {response['error']}", file=sys.stderr)
+            return 2
+        violations = [
+            Violation(_line=line, _col=col, _code=code, _message=message)
+            for line, col, code, message in response["results"]
+        ]
+        found += len(violations)
+        _write_violations(filename, violations, sys.stdout)
+
+    if found and not args.exit_zero:
+        return 1
+    return 0
+
+
+def _fix(targets: Iterable[str], *, jobs: int, exclude: Sequence[str]) -> None:
+    from .fix import fix_files
+
+    for result in fix_files(targets, jobs=jobs, exclude=exclude):
+        if result.error is not None:
+            print(f"nflake8: {result.filename}: not fixed: {result.error}", file=sys.stderr)
+        else:
+            if result.renames:
+                print(f"nflake8: {result.filename}: renamed {result.renames} symbols", file=sys.stderr)
+            if result.imports:
+                print(f"nflake8: {result.filename}: updated {result.imports} imports", file=sys.stderr)
+
+
+def _select_changed(changed: dict[str, object], paths: Iterable[str], *, exclude: Sequence[str]) -> list[str]:
+    roots = [os.path.realpath(p) for p in paths]
+    out: list[str] = []
+    for path in sorted(changed):
+        if not any(path == r or path.startswith(r.rstrip(os.sep) + os.sep) for r in roots):
+            continue
+        if any(is_excluded(part, exclude) for part in path.split(os.sep)):
+            continue
+        out.append(os.path.relpath(path))
+    return out
+
+
+def _report_profile(json_path: str | None) -> None:
+    profile = collect()
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write(profile.to_json() + "\n")
+    else:
+        sys.stderr.write(profile.format_summary())
+
+
+def _write_violations(filename: str, violations: list[Violation], out) -> None:
+    for v in sorted(violations, key=lambda v: (v.line, v.col)):
+        out.write(f"{filename}:{v.line}:{v.col + 1}: {v.code} {v.message}\n")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
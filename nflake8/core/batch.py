@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator
+
+from .errors import ALL_CODES, ErrorCodes
+from .suggestions import Suggestion, suggest_names
+from .types import Violation
+
+# Code ids are positions in this table; codes not known in advance are added
+# on first use (ids of those are per process, so pickling goes by name)
+_CODES: list[str] = sorted(ALL_CODES) + ["E999"]
+_CODE_IDS: dict[str, int] = {code: index for index, code in enumerate(_CODES)}
+
+
+def code_id(code: str) -> int:
+    found = _CODE_IDS.get(code)
+    if found is None:
+        found = _CODE_IDS[code] = len(_CODES)
+        _CODES.append(code)
+    return found
+
+
+def code_name(code_id: int) -> str:
+    return _CODES[code_id]
+
+
+def _default_template(code: str) -> str | None:
+    return getattr(ErrorCodes, code, None)
+
+
+class ViolationBatch:
+    """
+    The violations of one file in columns: line and col in array('I'), codes as
+    interned ids in array('H'). Message templates are only kept for rows whose
+    template is not their code's, args and suggestions only for rows that have
+    them, so a batch is a few bytes per violation and counting or filtering by
+    code never builds Violation objects or messages.
+
+    Violation objects are made on demand (iteration, indexing) and equal the
+    ones the batch was built from.
+    """
+
+    __slots__ = ("_lines", "_cols", "_codes", "_templates", "_args", "_suggests")
+
+    def __init__(self) -> None:
+        self._lines = array("I")
+        self._cols = array("I")
+        self._codes = array("H")
+        # row -> value, for the rows that have one
+        self._templates: dict[int, str] = {}
+        self._args: dict[int, tuple[tuple[str, str], ...]] = {}
+        self._suggests: dict[int, Suggestion | str] = {}
+
+    @classmethod
+    def from_violations(cls, violations: Iterable[Violation]) -> ViolationBatch:
+        batch = cls()
+        for v in violations:
+            batch.append(v.line, v.col, v.code, template=v.template, args=v.args, suggest=v.suggestion)
+        return batch
+
+    def append(
+        self,
+        line: int,
+        col: int,
+        code: str,
+        *,
+        template: str | None = None,
+        args: tuple[tuple[str, str], ...] = (),
+        suggest: Suggestion | str | None = None,
+    ) -> None:
+        row = len(self._codes)
+        self._lines.append(line)
+        self._cols.append(col)
+        self._codes.append(code_id(code))
+        if template is not None and template != _default_template(code):
+            self._templates[row] = template
+        if args:
+            self._args[row] = args
+        if suggest is not None:
+            self._suggests[row] = suggest
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @property
+    def lines(self) -> array:
+        return self._lines
+
+    @property
+    def cols(self) -> array:
+        return self._cols
+
+    def code_at(self, row: int) -> str:
+        return _CODES[self._codes[row]]
+
+    def codes(self) -> Iterator[str]:
+        return map(_CODES.__getitem__, self._codes)
+
+    def count_by_code(self) -> Counter[str]:
+        counts = Counter(self._codes)
+        return Counter({_CODES[code]: n for code, n in counts.items()})
+
+    def __getitem__(self, row: int) -> Violation:
+        return self._violation(row, self._suggests)
+
+    def _violation(self, row: int, suggests: dict[int, Suggestion | str]) -> Violation:
+        code = _CODES[self._codes[row]]
+        template = self._templates.get(row)
+        return Violation(
+            _line=self._lines[row],
+            _col=self._cols[row],
+            _code=code,
+            _message=template if template is not None else _default_template(code) or "",
+            _args=self._args.get(row, ()),
+            _suggest=suggests.get(row),
+        )
+
+    def __iter__(self) -> Iterator[Violation]:
+        return map(self.__getitem__, range(len(self._codes)))
+
+    def select(self, codes: frozenset[str]) -> ViolationBatch:
+        """The rows with one of codes (compared as ids, no strings per row)."""
+        wanted = {_CODE_IDS[code] for code in codes if code in _CODE_IDS}
+        out = ViolationBatch()
+        for row, code in enumerate(self._codes):
+            if code in wanted:
+                out._copy_row(self, row)
+        return out
+
+    def _copy_row(self, other: ViolationBatch, row: int) -> None:
+        new = len(self._codes)
+        self._lines.append(other._lines[row])
+        self._cols.append(other._cols[row])
+        self._codes.append(other._codes[row])
+        for mine, theirs in (
+            (self._templates, other._templates),
+            (self._args, other._args),
+            (self._suggests, other._suggests),
+        ):
+            if row in theirs:
+                mine[new] = theirs[row]  # type: ignore[index]
+
+    def to_flake8(self, plugin_type: type, *, with_suggestion: bool = True) -> Iterator[tuple[int, int, str, type]]:
+        """flake8 result tuples; messages are only rendered here, all suggestions of the batch at once."""
+        suggests: dict[int, Suggestion | str] = self._suggests
+        if with_suggestion and suggests:
+            suggests = dict(zip(suggests, suggest_names(suggests.values())))
+        for row in range(len(self._codes)):
+            yield self._violation(row, suggests).to_flake8(plugin_type, with_suggestion=with_suggestion)
+
+    def __getstate__(self) -> tuple:
+        # code ids are per process: send the codes this batch uses by name
+        used = sorted(set(self._codes))
+        local = {code: index for index, code in enumerate(used)}
+        codes = array("H", (local[code] for code in self._codes))
+        names = [_CODES[code] for code in used]
+        return (self._lines, self._cols, names, codes, self._templates, self._args, self._suggests)
+
+    def __setstate__(self, state: tuple) -> None:
+        self._lines, self._cols, names, codes, self._templates, self._args, self._suggests = state
+        ids = [code_id(name) for name in names]
+        self._codes = array("H", (ids[code] for code in codes))
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Iterable
+
+from .. import __version__
+from .suggestions import dump_suggestion, load_suggestion
+from .types import Violation
+
+_FORMAT_VERSION = 4
+_PRUNE_EVERY = 256
+_STALE_TMP_SECONDS = 3600
+
+
+def cache_key(*, content: bytes | Iterable[bytes], filename: str, settings: dict[str, object]) -> str:
+    """
+    Key for one file's results. `content` is the file's bytes, whole or in chunks
+    (the key is the same either way).
+
+    Covers everything the AST/token results depend on: file content, filename
+    (suggested names are derived from it), plugin version and the run settings
+    (enabled rules, options).
+    """
+    header = json.dumps(
+        [_FORMAT_VERSION, __version__, filename, settings],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    h = hashlib.sha256(header.encode("utf-8"))
+    h.update(b"\0")
+    if isinstance(content, bytes):
+        h.update(content)
+    else:
+        for chunk in content:
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of Violation lists, shared between processes.
+
+    Entries are written atomically (temp file + os.replace), so concurrent
+    flake8 --jobs workers never observe partial files. The number of entries is
+    bounded; the least recently used ones are evicted first.
+    """
+
+    def __init__(self, directory: str, *, max_entries: int = 10000) -> None:
+        self._directory = os.path.abspath(directory)
+        self._max_entries = max(1, max_entries)
+        self._puts = 0
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> list[Violation] | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            violations = [
+                Violation(
+                    _line=line,
+                    _col=col,
+                    _code=code,
+                    _message=template,
+                    _args=tuple((k, a) for k, a in args),
+                    _suggest=load_suggestion(suggest),
+                )
+                for line, col, code, template, args, suggest in rows
+            ]
+        except (TypeError, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return violations
+
+    def put(self, key: str, violations: list[Violation]) -> None:
+        # templates, args and suggestion fields, not text: nothing is rendered
+        # (or given a ledger id) here, and replayed violations stay lazy too
+        rows = [[v.line, v.col, v.code, v.template, v.args, dump_suggestion(v.suggestion)] for v in violations]
+        path = self._path(key)
+        subdir = os.path.dirname(path)
+        try:
+            os.makedirs(subdir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=subdir, prefix=".tmp-", suffix=".json")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(rows, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        if self._puts % _PRUNE_EVERY == 0:
+            self.prune()
+        self._puts += 1
+
+    def prune(self) -> None:
+        entries: list[tuple[float, str]] = []
+        now = time.time()
+        for subdir in _scandir(self._directory):
+            # entries live in <2 hex chars>/; other directories (runs/) are not ours
+            if len(subdir.name) != 2 or not subdir.is_dir(follow_symlinks=False):
+                continue
+            for entry in _scandir(subdir.path):
+                try:
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+                if entry.name.startswith(".tmp-"):
+                    if now - mtime > _STALE_TMP_SECONDS:
+                        _unlink(entry.path)
+                    continue
+                entries.append((mtime, entry.path))
+
+        if len(entries) <= self._max_entries:
+            return
+
+        # Evict down to 90% of the bound, so pruning does not run on every put
+        keep = self._max_entries * 9 // 10
+        entries.sort()
+        for _, path in entries[: len(entries) - keep]:
+            _unlink(path)
+
+
+def _scandir(path: str) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
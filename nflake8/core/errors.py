@@ -36,6 +36,10 @@ class ErrorCodes:
     NNO301 = "import requires alias N<k> (example: import os as N1)"
     NNO302 = "from-import requires alias N<10 digits> (example: from typing import List as N0000000001)"
     NNO303 = "from-import alias must be N<10 digits> (example: ... as N0000000001)"
+    NNO304 = "from-import name {name} not found in {module}"
     NNO310 = "import groups order invalid"
     NNO311 = "import group separation invalid"
     NNO312 = "import ordering invalid"
+
+
+ALL_CODES = frozenset(name for name in vars(ErrorCodes) if name.startswith("NNO"))
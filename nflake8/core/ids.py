@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+
+from .index import default_index_dir
+from .root import ProjectCache, find_project_root
+
+ID_SPACE = 10**10
+
+_ledger_dir: str | None = None
+# root -> IdLedger of this process
+_ledgers = ProjectCache(max_entries=64)
+# filename -> (project root, filename relative to it), for suggestions rendered one by one
+_file_roots = ProjectCache(max_entries=1 << 14)
+
+
+def hashed_id(key: str) -> int:
+    """Deterministic id for key (64 bits of blake2b folded into the id space); not unique."""
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % ID_SPACE
+
+
+class IdLedger:
+    """
+    Unique 10-digit ids for the symbols of one project.
+
+    Every allocation is one line appended to a journal file ("<id> <key>"). The
+    journal is replayed in order and the first line wins: a key keeps the first
+    id written for it, and an id belongs to the first key that claimed it. A
+    process that loses a race (another worker appended the same id first) sees
+    that when it reads back past its own line and probes for the next free id,
+    so workers never need a lock. Ids start at the key's hash, so without
+    collisions they are the same in every project state.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._ids: dict[str, int] = {}
+        self._owners: dict[int, str] = {}
+        self._offset = 0
+        self._pending = b""
+        self._writable = True
+        self._sync()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def id_for(self, key: str) -> int:
+        """The id of key, allocating (and recording) it on first use."""
+        key = key.replace("\n", "\\n")
+        found = self._ids.get(key)
+        if found is not None:
+            return found
+        with self._lock:
+            self._sync()
+            while key not in self._ids:
+                candidate = self._probe(key)
+                if not self._append(candidate, key):
+                    # cannot record it: the id is only unique within this process
+                    self._claim(candidate, key)
+                    break
+                self._sync()
+            return self._ids[key]
+
+    def _probe(self, key: str) -> int:
+        value = hashed_id(key)
+        while value in self._owners:
+            value = (value + 1) % ID_SPACE
+        return value
+
+    def _claim(self, value: int, key: str) -> None:
+        if key not in self._ids and value not in self._owners:
+            self._ids[key] = value
+            self._owners[value] = key
+
+    def _append(self, value: int, key: str) -> bool:
+        if not self._writable:
+            return False
+        line = f"{value:010d} {key}\n".encode("utf-8", "surrogatepass")
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError:
+            self._writable = False
+            return False
+        try:
+            # one write() with O_APPEND: lines of concurrent writers never interleave
+            os.write(fd, line)
+        except OSError:
+            self._writable = False
+            return False
+        finally:
+            os.close(fd)
+        return True
+
+    def _sync(self) -> None:
+        """Replay the lines other processes appended since the last read."""
+        try:
+            with open(self._path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        self._offset += len(data)
+        data = self._pending + data
+        # a line still being written is kept for the next read
+        end = data.rfind(b"\n") + 1
+        self._pending = data[end:]
+        for raw in data[:end].splitlines():
+            value, _, key = raw.decode("utf-8", "surrogatepass").partition(" ")
+            if len(value) == 10 and value.isdigit() and key:
+                self._claim(int(value), key)
+
+
+def enable_id_ledger(directory: str | None = None) -> None:
+    """
+    Give suggested names ids from each project's ledger (stored in directory,
+    the symbol index directory by default) instead of hashes.
+    """
+    global _ledger_dir
+    _ledger_dir = directory or default_index_dir()
+    _ledgers.clear()
+
+
+def disable_id_ledger() -> None:
+    global _ledger_dir
+    _ledger_dir = None
+    _ledgers.clear()
+    _file_roots.clear()
+
+
+def get_ledger_dir() -> str | None:
+    """The ledger directory when ledgers are enabled (to enable them in worker processes)."""
+    return _ledger_dir
+
+
+def ledger_for(filename: str) -> tuple[IdLedger, str] | None:
+    """The ledger of filename's project and filename relative to its root; None when ledgers are off."""
+    if _ledger_dir is None:
+        return None
+    located = _file_roots.get(filename, default=None)
+    if located is None:
+        root = find_project_root(filename)
+        rel = None if root is None else os.path.relpath(os.path.abspath(filename), root).replace(os.sep, "/")
+        located = (root, rel)
+        _file_roots.put(filename, located)
+    root, rel = located  # type: ignore[misc]
+    if root is None:
+        return None
+    ledger = _ledgers.get(root, default=None)
+    if ledger is None:
+        digest = hashlib.sha1(root.encode("utf-8", "surrogatepass")).hexdigest()
+        ledger = IdLedger(os.path.join(_ledger_dir, f"{digest}.ids"))
+        _ledgers.put(root, ledger)
+    return ledger, rel  # type: ignore[return-value]
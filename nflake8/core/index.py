@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import tokenize
+from typing import Iterable
+
+from .root import ROOT_MARKER_DIRS, ROOT_MARKER_FILES, ProjectCache, find_project_root
+from .runs import default_runs_dir
+
+_FORMAT_VERSION = 2
+
+# A module whose names cannot be listed (star import, module __getattr__,
+# unparsable): every name is taken to exist
+_OPEN = 1
+# A module that may refer to any other one (importlib, __import__, unparsable)
+_DYNAMIC = 2
+
+# (mtime_ns, size, flags, space-separated top-level names, space-separated
+# modules the file refers to: imports and dotted paths in strings)
+_Entry = tuple[int, int, int, str, str]
+
+
+def default_index_dir() -> str:
+    return os.path.join(os.path.dirname(default_runs_dir()), "nflake8-index")
+
+
+class SymbolIndex:
+    """
+    Top-level names of every module of one project, keyed by dotted module path
+    relative to the root (N1/N1_2/n3.py -> "N1.N1_2.n3", packages by their
+    __init__.py).
+
+    Built once and stored as one compact JSON file; refresh() only re-reads
+    files whose (mtime, size) changed since the last run. Directories that are
+    project roots of their own are not part of the index.
+    """
+
+    def __init__(self, root: str, files: dict[str, _Entry] | None = None) -> None:
+        self._root = os.path.abspath(root)
+        self._files: dict[str, _Entry] = files or {}
+        self._build_modules()
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    @property
+    def files(self) -> list[str]:
+        """Absolute paths of the indexed files."""
+        return [os.path.join(self._root, rel) for rel in self._files]
+
+    @property
+    def digest(self) -> str:
+        h = hashlib.sha1()
+        for rel in sorted(self._files):
+            _, _, flags, names, _ = self._files[rel]
+            h.update(f"{rel}\0{flags}\0{names}\n".encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def _build_modules(self) -> None:
+        self._modules: dict[str, tuple[int, frozenset[str]]] = {}
+        self._children: dict[str, set[str]] = {}
+        for rel, (_, _, flags, names, _) in self._files.items():
+            module = _module_path(rel)
+            self._modules[module] = (flags, frozenset(names.split()))
+            # every package on the way down has this module or package as a member
+            parts = module.split(".")
+            for depth in range(1, len(parts)):
+                self._children.setdefault(".".join(parts[:depth]), set()).add(parts[depth])
+
+    # --- lookups -------------------------------------------------------
+
+    def module_for(self, filename: str) -> str | None:
+        """Dotted module path of filename, None outside the root."""
+        rel = os.path.relpath(os.path.abspath(filename), self._root)
+        if rel.startswith(os.pardir + os.sep) or rel == os.pardir or not rel.endswith(".py"):
+            return None
+        return _module_path(rel)
+
+    def resolve(self, filename: str, module: str | None, level: int) -> str | None:
+        """The module `from <level dots><module> import ...` in filename refers to."""
+        if not level:
+            return module
+        current = self.module_for(filename)
+        if current is None:
+            return None
+        return _resolve(current, os.path.basename(filename) == "__init__.py", module, level)
+
+    def is_module(self, name: str) -> bool:
+        """Whether name is a module or package of the project."""
+        return name in self._modules or name in self._children
+
+    def importers(self, modules: Iterable[str]) -> list[str]:
+        """
+        Absolute paths of the files that may refer to one of modules: through an
+        import of it, of a package above it or of a member of it, or a dotted
+        path in a string.
+        """
+        targets = set(modules)
+        out = []
+        for rel, (_, _, flags, _, refs) in self._files.items():
+            if flags & _DYNAMIC or any(
+                ref == target or target.startswith(ref + ".") or ref.startswith(target + ".")
+                for ref in refs.split()
+                for target in targets
+            ):
+                out.append(os.path.join(self._root, rel))
+        return out
+
+    def exports(self, module: str) -> frozenset[str] | None:
+        """Top-level names of module, None when it is not in the project."""
+        entry = self._modules.get(module)
+        return entry[1] if entry is not None else None
+
+    def has_name(self, module: str, name: str) -> bool | None:
+        """
+        Whether `from module import name` finds something: a top-level name or a
+        submodule. None when the module is not part of the project (or not
+        listable), so nothing can be said about it.
+        """
+        entry = self._modules.get(module)
+        children = self._children.get(module)
+        if entry is None and children is None:
+            return None
+        if entry is not None and entry[0] & _OPEN:
+            return True
+        return (entry is not None and name in entry[1]) or (children is not None and name in children)
+
+    def names(self, module: str) -> set[str]:
+        """Everything `from module import ...` can import."""
+        entry = self._modules.get(module)
+        found = set(entry[1]) if entry is not None else set()
+        found.update(self._children.get(module, ()))
+        return found
+
+    def dependency_digest(self, filename: str, tree: ast.AST) -> str:
+        """
+        Digest of what the module-level from-imports of tree see in the index, for
+        result caches: it changes only when one of the imported modules does.
+        """
+        h = hashlib.sha1()
+        for node in getattr(tree, "body", ()):
+            if not isinstance(node, ast.ImportFrom):
+                continue
+            module = self.resolve(filename, node.module, node.level or 0)
+            if module is None:
+                continue
+            flags, names = self._modules.get(module, (0, frozenset()))
+            seen = (module, flags, sorted(names), sorted(self._children.get(module, ())))
+            h.update(repr(seen).encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    # --- building ------------------------------------------------------
+
+    def refresh(self) -> int:
+        """Re-read new and changed files, forget removed ones; returns how many files changed."""
+        seen: dict[str, tuple[int, int]] = {}
+        for rel, st in _walk(self._root):
+            seen[rel] = (st.st_mtime_ns, st.st_size)
+
+        changed = 0
+        files: dict[str, _Entry] = {}
+        for rel, (mtime_ns, size) in seen.items():
+            entry = self._files.get(rel)
+            if entry is None or entry[0] != mtime_ns or entry[1] != size:
+                flags, names, refs = _scan_module(os.path.join(self._root, rel), _module_path(rel))
+                entry = (mtime_ns, size, flags, " ".join(sorted(names)), " ".join(sorted(refs)))
+                changed += 1
+            files[rel] = entry
+        changed += sum(1 for rel in self._files if rel not in files)
+
+        if changed:
+            self._files = files
+            self._build_modules()
+        return changed
+
+    # --- storage -------------------------------------------------------
+
+    @classmethod
+    def load(cls, root: str, *, directory: str | None = None) -> SymbolIndex:
+        """The stored index of root, or an empty one when there is none (or it is unreadable)."""
+        root = os.path.abspath(root)
+        try:
+            with open(_index_path(root, directory), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] != _FORMAT_VERSION or data["root"] != root:
+                return cls(root)
+            files = {
+                rel: (int(m), int(s), int(flags), str(names), str(refs))
+                for rel, (m, s, flags, names, refs) in data["files"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(root)
+        return cls(root, files)
+
+    def save(self, *, directory: str | None = None) -> None:
+        """Write the index atomically; concurrent writers of one root do not corrupt it."""
+        path = _index_path(self._root, directory)
+        data = {"version": _FORMAT_VERSION, "root": self._root, "files": self._files}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+# root -> SymbolIndex of this process
+_indexes = ProjectCache(max_entries=64)
+
+
+def get_symbol_index(root: str, *, directory: str | None = None) -> SymbolIndex:
+    """
+    The index of root, loaded from disk and refreshed once per process (and
+    saved back when anything changed).
+    """
+    root = os.path.abspath(root)
+    index = _indexes.get(root, default=None)
+    if index is None:
+        index = SymbolIndex.load(root, directory=directory)
+        if index.refresh():
+            index.save(directory=directory)
+        _indexes.put(root, index)
+    return index  # type: ignore[return-value]
+
+
+def install_symbol_index(index: SymbolIndex) -> None:
+    """Use an index built by another process (pool workers get the parent's)."""
+    _indexes.put(index.root, index)
+
+
+def symbol_index_for(filename: str) -> SymbolIndex | None:
+    """The already built index of filename's project, if any; never builds one."""
+    if not len(_indexes):
+        return None
+    root = find_project_root(filename)
+    if root is None:
+        return None
+    return _indexes.get(root, default=None)  # type: ignore[return-value]
+
+
+def clear_symbol_indexes() -> None:
+    _indexes.clear()
+
+
+def _index_path(root: str, directory: str | None) -> str:
+    digest = hashlib.sha1(root.encode("utf-8", "surrogatepass")).hexdigest()
+    return os.path.join(directory or default_index_dir(), f"{digest}.json")
+
+
+def _resolve(current: str, is_package: bool, module: str | None, level: int) -> str | None:
+    # the module `from <level dots><module> import ...` refers to in module current
+    parts = current.split(".") if current else []
+    if not is_package:
+        parts = parts[:-1]
+    if level - 1 > len(parts):
+        return None
+    parts = parts[: len(parts) - (level - 1)]
+    if module:
+        parts.extend(module.split("."))
+    return ".".join(parts) if parts else None
+
+
+def _module_path(rel: str) -> str:
+    parts = rel[: -len(".py")].split(os.sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _walk(root: str):
+    """(relative path, stat) of the .py files of the project, one scandir per directory."""
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir)) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        if rel_dir and any(
+            (e.name in ROOT_MARKER_DIRS and e.is_dir()) or (e.name in ROOT_MARKER_FILES and e.is_file())
+            for e in entries
+        ):
+            # a project of its own
+            continue
+        for entry in entries:
+            name = entry.name
+            if name.startswith(".") or name == "__pycache__" or name.endswith(".egg"):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(os.path.join(rel_dir, name))
+                elif name.endswith(".py") and entry.is_file():
+                    yield os.path.join(rel_dir, name), entry.stat()
+            except OSError:
+                continue
+
+
+def _scan_module(path: str, module: str) -> tuple[int, set[str], set[str]]:
+    try:
+        with tokenize.open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return _OPEN | _DYNAMIC, set(), set()
+    collector = _TopLevelNames()
+    collector.visit(tree)
+    flags, refs = _module_refs(tree, module, os.path.basename(path) == "__init__.py")
+    return (_OPEN if collector.open else 0) | flags, collector.names, refs
+
+
+def _module_refs(tree: ast.AST, module: str, is_package: bool) -> tuple[int, set[str]]:
+    """The modules tree refers to, anywhere in it, and _DYNAMIC if it imports by computed name."""
+    flags = 0
+    refs: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            refs.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = _resolve(module, is_package, node.module, node.level or 0) if node.level else node.module
+            if base is not None:
+                refs.add(base)
+                refs.update(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            parts = node.value.split(".")
+            if len(parts) > 1 and all(part.isidentifier() for part in parts):
+                refs.add(node.value)
+        elif isinstance(node, ast.Call):
+            func = node.func
+            name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+            if name in ("__import__", "import_module"):
+                flags |= _DYNAMIC
+    return flags, refs
+
+
+class _TopLevelNames(ast.NodeVisitor):
+    """Names bound at module level, including `global` ones bound inside functions."""
+
+    def __init__(self) -> None:
+        self.names: set[str] = set()
+        self.open = False
+
+    def _skip_body(self, node: ast.AST) -> None:
+        # names inside are local; only `global` declarations bind module names
+        for inner in ast.walk(node):
+            if isinstance(inner, ast.Global):
+                self.names.update(inner.names)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        self.names.add(node.name)
+        if node.name == "__getattr__":
+            self.open = True
+        self._skip_body(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.names.add(node.name)
+        self._skip_body(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._skip_body(node)
+
+    def visit_ListComp(self, node: ast.AST) -> None:
+        self._skip_body(node)
+
+    visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if not isinstance(node.ctx, ast.Load):
+            self.names.add(node.id)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.names.add(alias.asname or alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            if alias.name == "*":
+                self.open = True
+            else:
+                self.names.add(alias.asname or alias.name)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.name:
+            self.names.add(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node: ast.MatchAs) -> None:
+        if node.name:
+            self.names.add(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node: ast.MatchStar) -> None:
+        if node.name:
+            self.names.add(node.name)
+
+    def visit_MatchMapping(self, node: ast.MatchMapping) -> None:
+        if node.rest:
+            self.names.add(node.rest)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # globals()[...] = ... / globals().update(...)
+        if isinstance(node.func, ast.Name) and node.func.id == "globals":
+            self.open = True
+        self.generic_visit(node)
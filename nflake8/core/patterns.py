@@ -2,21 +2,8 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-
-_VAR_DEC_RE = re.compile(r"n\d{10}\Z")
-_VAR_BOOL_RE = re.compile(r"n[01]{10}\Z")
-_CONST_RE = re.compile(r"N\d{10}\Z")
-_FUNC_RE = _VAR_DEC_RE
-_FUNC_BOOL_RE = _VAR_BOOL_RE
-_CLASS_RE = re.compile(r"N\d{10}(?:n\d{10})*\Z")
-_CLASS_DERIVED_RE = re.compile(r"N\d{10}(?:n\d{10})+\Z")
-_MEMBER_PUBLIC_RE = re.compile(r"n_(?:\d{10}|[01]{10})\Z")
-_MEMBER_PRIVATE_RE = re.compile(r"_n(?:\d{10}|[01]{10})\Z")
-_ITER_RE = re.compile(r"n+\Z")
-_REQUIRED_PARAM_RE = re.compile(r"n[1-9]\d*\Z")
-
-_IMPORT_ALIAS_RE = re.compile(r"N[1-9]\d*\Z")
-_FROM_ALIAS_RE = re.compile(r"(?:N\d{10}(?:n\d{10})*|n(?:\d{10}|[01]{10}))\Z")
+from enum import IntFlag
+from functools import lru_cache
 
 _NOQA_COMMENT_RE = re.compile(r"#\s*noqa(?::\s*[A-Z0-9, ]+)?\s*\Z")
 
@@ -41,49 +28,143 @@ README_DECLARATION_BLOCK = (
 )
 
 
+class NameKind(IntFlag):
+    """Categories an identifier can belong to (a name may match several)."""
+
+    NONE = 0
+    VAR = 1  # n<10 digits> / n<10 bits>; functions use the same shape
+    BOOL_VAR = 2  # n<10 bits>
+    CONST = 4  # N<10 digits>
+    CLASS = 8  # N<10 digits>(n<10 digits>)*
+    DERIVED_CLASS = 16  # N<10 digits>(n<10 digits>)+
+    PUBLIC_MEMBER = 32  # n_<10 digits/bits>
+    PRIVATE_MEMBER = 64  # _n<10 digits/bits>
+    ITERATOR = 128  # n, nn, nnn, ...
+    REQUIRED_PARAM = 256  # n<posint>
+    IMPORT_ALIAS = 512  # N<posint>
+    FROM_ALIAS = 1024  # class/const or var/func shape
+
+
+@dataclass(frozen=True, slots=True)
+class NameInfo:
+    _kinds: NameKind
+    _segments: tuple[int, ...]
+
+    @property
+    def kinds(self) -> NameKind:
+        return self._kinds
+
+    @property
+    def segments(self) -> tuple[int, ...]:
+        """Numeric segments: N1234567890n0000000001 -> (1234567890, 1), n12 -> (12,)."""
+        return self._segments
+
+
+_NO_NAME = NameInfo(_kinds=NameKind.NONE, _segments=())
+_POSITIVE_LEAD = frozenset("123456789")
+_BITS = frozenset("01")
+
+
+def _is_id10(text: str) -> bool:
+    # same as regex \d{10}: ten Unicode decimal digits
+    return len(text) == 10 and text.isdecimal()
+
+
+@lru_cache(maxsize=1 << 16)
+def classify_name(name: str) -> NameInfo:
+    """
+    Classify an identifier in a single scan.
+
+    Memoized: real code repeats the same names over and over.
+    """
+    if not name:
+        return _NO_NAME
+
+    kinds = NameKind.NONE
+    segments: tuple[int, ...] = ()
+    head = name[0]
+    body = name[1:]
+
+    if head == "n":
+        if not body.strip("n"):
+            return NameInfo(_kinds=NameKind.ITERATOR, _segments=())
+        if body[0] == "_":
+            if _is_id10(body[1:]):
+                kinds = NameKind.PUBLIC_MEMBER
+                segments = (int(body[1:]),)
+        elif body.isdecimal():
+            if len(body) == 10:
+                kinds = NameKind.VAR | NameKind.FROM_ALIAS
+                if _BITS.issuperset(body):
+                    kinds |= NameKind.BOOL_VAR
+            if body[0] in _POSITIVE_LEAD:
+                kinds |= NameKind.REQUIRED_PARAM
+            segments = (int(body),)
+
+    elif head == "N":
+        if body.isdecimal():
+            if len(body) == 10:
+                kinds = NameKind.CONST | NameKind.CLASS | NameKind.FROM_ALIAS
+            if body[0] in _POSITIVE_LEAD:
+                kinds |= NameKind.IMPORT_ALIAS
+            segments = (int(body),)
+        elif len(body) > 10:
+            parts = body.split("n")
+            if all(_is_id10(p) for p in parts):
+                kinds = NameKind.CLASS | NameKind.DERIVED_CLASS | NameKind.FROM_ALIAS
+                segments = tuple(int(p) for p in parts)
+
+    elif head == "_" and body[:1] == "n":
+        if _is_id10(body[1:]):
+            kinds = NameKind.PRIVATE_MEMBER
+            segments = (int(body[1:]),)
+
+    return NameInfo(_kinds=kinds, _segments=segments)
+
+
 def is_var_name(name: str) -> bool:
     # bool is subset of decimal; accept both
-    return bool(_VAR_BOOL_RE.fullmatch(name) or _VAR_DEC_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.VAR)
 
 
 def is_const_name(name: str) -> bool:
-    return bool(_CONST_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.CONST)
 
 
 def is_func_name(name: str) -> bool:
-    return bool(_FUNC_BOOL_RE.fullmatch(name) or _FUNC_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.VAR)
 
 
 def is_class_name(name: str) -> bool:
-    return bool(_CLASS_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.CLASS)
 
 
 def is_derived_class_name(name: str) -> bool:
-    return bool(_CLASS_DERIVED_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.DERIVED_CLASS)
 
 
 def is_public_member_name(name: str) -> bool:
-    return bool(_MEMBER_PUBLIC_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.PUBLIC_MEMBER)
 
 
 def is_private_member_name(name: str) -> bool:
-    return bool(_MEMBER_PRIVATE_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.PRIVATE_MEMBER)
 
 
 def is_iterator_name(name: str) -> bool:
-    return bool(_ITER_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.ITERATOR)
 
 
 def is_required_param_name(name: str) -> bool:
-    return bool(_REQUIRED_PARAM_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.REQUIRED_PARAM)
 
 
 def is_import_alias(name: str) -> bool:
-    return bool(_IMPORT_ALIAS_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.IMPORT_ALIAS)
 
 
 def is_from_alias(name: str) -> bool:
-    return bool(_FROM_ALIAS_RE.fullmatch(name))
+    return bool(classify_name(name).kinds & NameKind.FROM_ALIAS)
 
 
 def is_noqa_comment(text: str) -> bool:
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Callable, Sized, TypeVar
+
+_PREFIX = "profile-"
+
+_T = TypeVar("_T", bound=Sized)
+
+
+class Profiler:
+    """Cumulative wall time, call count and violations per rule / check layer."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, list[float]] = {}
+
+    def add(self, key: str, seconds: float, violations: int) -> None:
+        row = self._stats.get(key)
+        if row is None:
+            self._stats[key] = [seconds, 1, violations]
+            return
+        row[0] += seconds
+        row[1] += 1
+        row[2] += violations
+
+    def merge(self, stats: dict[str, list[float]]) -> None:
+        for key, (seconds, calls, violations) in stats.items():
+            row = self._stats.setdefault(key, [0.0, 0, 0])
+            row[0] += seconds
+            row[1] += calls
+            row[2] += violations
+
+    def snapshot(self) -> dict[str, list[float]]:
+        return {key: list(row) for key, row in self._stats.items()}
+
+    def to_json(self) -> str:
+        rows = [
+            {"name": key, "seconds": round(seconds, 6), "calls": int(calls), "violations": int(violations)}
+            for key, (seconds, calls, violations) in self._sorted()
+        ]
+        return json.dumps({"profile": rows}, indent=2)
+
+    def format_summary(self) -> str:
+        lines = [f"{'name':<32} {'seconds':>10} {'calls':>10} {'violations':>10}"]
+        for key, (seconds, calls, violations) in self._sorted():
+            lines.append(f"{key:<32} {seconds:>10.4f} {int(calls):>10} {int(violations):>10}")
+        return "\n".join(lines) + "\n"
+
+    def _sorted(self) -> list[tuple[str, list[float]]]:
+        return sorted(self._stats.items(), key=lambda item: (-item[1][0], item[0]))
+
+
+_profiler: Profiler | None = None
+_dump_dir: str | None = None
+
+
+def get_profiler() -> Profiler | None:
+    """The active profiler, or None when profiling is off (the common, free path)."""
+    return _profiler
+
+
+def get_dump_dir() -> str | None:
+    """Where worker processes write their stats (see enable_profiling)."""
+    return _dump_dir
+
+
+def enable_profiling(dump_dir: str | None = None) -> Profiler:
+    """
+    Start collecting stats in this process. Worker processes write their stats to
+    dump_dir after each file so the main process can merge them at the end.
+    """
+    global _profiler, _dump_dir
+    _profiler = Profiler()
+    _dump_dir = dump_dir
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler, _dump_dir
+    _profiler = None
+    _dump_dir = None
+
+
+def timed(key: str, fn: Callable[..., _T], /, **kwargs) -> _T:
+    """Call fn(**kwargs), recording time and len(result) under key when profiling."""
+    profiler = _profiler
+    if profiler is None:
+        return fn(**kwargs)
+    started = time.perf_counter()
+    result = fn(**kwargs)
+    profiler.add(key, time.perf_counter() - started, len(result))
+    return result
+
+
+def checkpoint() -> None:
+    """Persist this worker's stats (no-op in the main process or when disabled)."""
+    if _profiler is None or _dump_dir is None or multiprocessing.parent_process() is None:
+        return
+    path = os.path.join(_dump_dir, f"{_PREFIX}{os.getpid()}.json")
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=_dump_dir, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(_profiler.snapshot(), f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def collect() -> Profiler:
+    """Stats of this process merged with those written by its workers."""
+    total = Profiler()
+    if _profiler is not None:
+        total.merge(_profiler.snapshot())
+    if _dump_dir is None:
+        return total
+
+    try:
+        names = os.listdir(_dump_dir)
+    except OSError:
+        return total
+    own = f"{_PREFIX}{os.getpid()}.json"
+    for name in names:
+        if not name.startswith(_PREFIX) or name == own:
+            continue
+        try:
+            with open(os.path.join(_dump_dir, name), "r", encoding="utf-8") as f:
+                total.merge(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return total
@@ -1,52 +1,179 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 
 from .patterns import README_DECLARATION_BLOCK, ReadmeStatus
 
+# A directory containing any of these is a project root
+ROOT_MARKER_DIRS = frozenset({".git"})
+ROOT_MARKER_FILES = frozenset({"pyproject.toml", "setup.cfg", "tox.ini", "README.md"})
 
-_root_by_dir: dict[str, str | None] = {}
-_readme_status_by_root: dict[str, ReadmeStatus] = {}
-_readme_reported_by_root: set[str] = set()
+_Signature = tuple[int, int, int] | None
+
+_MISSING = object()
+
+
+def stat_signature(path: str) -> _Signature:
+    """(mtime_ns, size, inode) of path, None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ProjectCache:
+    """
+    LRU mapping for project-level lookups, safe to share between threads.
+
+    Each entry may carry a stat signature of the path it was computed from;
+    get() with a different signature is a miss (the file or directory changed),
+    so long-lived processes do not serve stale results.
+    """
+
+    def __init__(self, *, max_entries: int = 4096) -> None:
+        self._lock = threading.RLock()
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[_Signature, object]] = OrderedDict()
+
+    def get(self, key: str, signature: _Signature = None, default: object = _MISSING) -> object:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] != signature:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: object, signature: _Signature = None) -> None:
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def claim(self, key: str) -> bool:
+        """Add key; True only for the caller that added it."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return False
+            self.put(key, True)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# directory -> project root (or None), validated by the directory's own signature
+_roots = ProjectCache(max_entries=1 << 16)
+# root -> ReadmeStatus, validated by README.md's signature
+_readme_statuses = ProjectCache(max_entries=1024)
+# roots whose README was checked in this run
+_readme_reported = ProjectCache(max_entries=1 << 16)
+_run_dir: str | None = None
+
+
+def configure_run(run_dir: str | None) -> None:
+    """
+    Share NNO500 bookkeeping between processes of one run through marker files
+    in run_dir (None: per-process only).
+    """
+    global _run_dir
+    _run_dir = run_dir
+    _readme_reported.clear()
+
+
+def invalidate_project_caches() -> None:
+    """
+    Forget resolved roots and README statuses. Entries are also revalidated on
+    use; this is for changes the signatures do not show (e.g. a marker file
+    created above an already resolved directory).
+    """
+    _roots.clear()
+    _readme_statuses.clear()
 
 
 def was_readme_reported(root: str) -> bool:
-    return root in _readme_reported_by_root
+    return _readme_reported.get(root, default=False) is True
 
 
 def mark_readme_reported(root: str) -> None:
-    _readme_reported_by_root.add(root)
+    _readme_reported.put(root, True)
+
+
+def claim_readme_check(root: str) -> bool:
+    """
+    Return True for exactly one caller per root and run; that caller checks the
+    README and reports NNO500. Other processes of the run never read it.
+    """
+    if not _readme_reported.claim(root):
+        return False
+
+    if _run_dir is None:
+        return True
+
+    digest = hashlib.sha1(root.encode("utf-8", "surrogatepass")).hexdigest()
+    marker = os.path.join(_run_dir, f"readme-{digest}")
+    try:
+        fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    except OSError:
+        # can not coordinate: fall back to per-process reporting
+        return True
+    os.close(fd)
+    return True
 
 
 def find_project_root(start_path: str) -> str | None:
     start_dir = os.path.abspath(os.path.dirname(start_path))
-    if start_dir in _root_by_dir:
-        return _root_by_dir[start_dir]
 
+    # every directory visited on the way up is cached, so siblings stop at
+    # their common parent instead of walking up to / again
+    visited: list[tuple[str, _Signature]] = []
     cur = start_dir
     while True:
-        if (
-            os.path.isdir(os.path.join(cur, ".git"))
-            or os.path.isfile(os.path.join(cur, "pyproject.toml"))
-            or os.path.isfile(os.path.join(cur, "setup.cfg"))
-            or os.path.isfile(os.path.join(cur, "tox.ini"))
-            or os.path.isfile(os.path.join(cur, "README.md"))
+        signature = stat_signature(cur)
+        cached = _roots.get(cur, signature)
+        if cached is not _MISSING:
+            root = cached
+            break
+        visited.append((cur, signature))
+        if any(os.path.isdir(os.path.join(cur, name)) for name in ROOT_MARKER_DIRS) or any(
+            os.path.isfile(os.path.join(cur, name)) for name in ROOT_MARKER_FILES
         ):
-            _root_by_dir[start_dir] = cur
-            return cur
+            root = cur
+            break
 
         parent = os.path.dirname(cur)
         if parent == cur:
-            _root_by_dir[start_dir] = None
-            return None
+            root = None
+            break
         cur = parent
 
+    for directory, signature in visited:
+        _roots.put(directory, root, signature)
+    return root  # type: ignore[return-value]
 
-def get_readme_status(root: str) -> ReadmeStatus:
-    if root in _readme_status_by_root:
-        return _readme_status_by_root[root]
 
+def get_readme_status(root: str) -> ReadmeStatus:
     path = os.path.join(root, "README.md")
+    signature = stat_signature(path)
+    cached = _readme_statuses.get(root, signature)
+    if cached is not _MISSING:
+        return cached  # type: ignore[return-value]
+
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = f.read()
@@ -59,5 +186,5 @@ def get_readme_status(root: str) -> ReadmeStatus:
         ok = README_DECLARATION_BLOCK in normalized
         status = ReadmeStatus(_ok=ok, _reason=("ok" if ok else "mismatch"))
 
-    _readme_status_by_root[root] = status
+    _readme_statuses.put(root, status, signature)
     return status
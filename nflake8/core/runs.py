@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+_RUN_ID_ENV = "NFLAKE8_RUN_ID"
+_STALE_RUN_SECONDS = 24 * 3600
+
+
+def default_runs_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "nflake8-runs")
+
+
+def start_run(runs_dir: str) -> str:
+    """
+    Return the directory shared by all processes of the current lint run.
+
+    The main process creates a new run id and exports it through the environment,
+    so workers started with either `fork` or `spawn` join the same directory.
+    """
+    is_main = multiprocessing.parent_process() is None
+    run_id = os.environ.get(_RUN_ID_ENV)
+    if is_main or not run_id:
+        run_id = f"{os.getpid()}-{uuid.uuid4().hex}"
+        os.environ[_RUN_ID_ENV] = run_id
+        _prune_stale_runs(runs_dir)
+
+    path = os.path.join(runs_dir, run_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def end_run(path: str) -> None:
+    """Remove the run directory once all processes of the run are done (main process only)."""
+    if multiprocessing.parent_process() is not None:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+    if os.environ.get(_RUN_ID_ENV) == os.path.basename(path):
+        del os.environ[_RUN_ID_ENV]
+
+
+def _prune_stale_runs(runs_dir: str) -> None:
+    try:
+        with os.scandir(runs_dir) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    now = time.time()
+    for entry in entries:
+        try:
+            mtime = entry.stat(follow_symlinks=False).st_mtime
+        except OSError:
+            continue
+        if now - mtime > _STALE_RUN_SECONDS:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import codecs
+import io
+import itertools
+import mmap
+import os
+import re
+import tokenize
+from typing import Callable, Iterator, Sequence
+
+# Files at least this big are memory-mapped and decoded line by line
+MMAP_THRESHOLD = 1 << 20
+
+_NEWLINE_RE = re.compile(r"\r\n?|\n")
+
+# A file as one string or as its lines (line endings kept, like flake8's `lines`)
+SourceText = str | Sequence[str]
+
+
+def read_lines(filename: str) -> list[str]:
+    """
+    Lines of a Python file decoded the way the interpreter does (BOM, PEP 263
+    coding cookie, UTF-8 by default), with universal newlines.
+
+    Returns [] when the file cannot be read or decoded.
+    """
+    try:
+        with open(filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                encoding, _ = tokenize.detect_encoding(f.readline)
+                f.seek(0)
+                with io.TextIOWrapper(f, encoding=encoding) as text:
+                    return text.readlines()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return list(_decode_lines(mm))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return []
+
+
+def _decode_lines(mm: mmap.mmap) -> Iterator[str]:
+    """
+    Lines decoded straight from the map (no bytes copy, no joined string), split
+    on \\r\\n, \\r and \\n like the universal newlines of smaller files.
+    """
+    encoding, _ = tokenize.detect_encoding(mm.readline)
+    mm.seek(0)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for raw in iter(mm.readline, b""):
+        text = decoder.decode(raw)
+        if "\r" not in text:
+            if text:
+                yield text
+            continue
+        # mm.readline() only splits on \n
+        start = 0
+        for m in _NEWLINE_RE.finditer(text):
+            yield text[start : m.start()] + "\n"
+            start = m.end()
+        if start < len(text):
+            yield text[start:]
+    decoder.decode(b"", final=True)
+
+
+def readline(source: SourceText) -> Callable[[], str]:
+    """readline() over source, for tokenize.generate_tokens."""
+    if isinstance(source, str):
+        return io.StringIO(source).readline
+    it = iter(source)
+    return lambda: next(it, "")
+
+
+def head_lines(source: SourceText, end_line: int) -> list[str]:
+    """Physical lines before end_line, split the way the parser numbers them."""
+    if isinstance(source, str):
+        return list(itertools.islice(io.StringIO(source, newline=None), end_line - 1))
+    return list(source[: end_line - 1])
+
+
+def joined(source: SourceText) -> str:
+    return source if isinstance(source, str) else "".join(source)
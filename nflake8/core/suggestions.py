@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import hashlib
 import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
 
+from .ids import ID_SPACE, IdLedger, ledger_for
 
 _MOD = 10**10
 
+_SIGILS = {
+    "var": "n",
+    "func": "n",
+    "const": "N",
+    "class": "N",
+    "derived": "n",
+    "member_public": "n_",
+    "member_private": "_n",
+}
+
 
 def _stable_10_digits(*, kind: str, filename: str, line: int, col: int) -> str:
     """
@@ -20,40 +35,142 @@ def _stable_10_digits(*, kind: str, filename: str, line: int, col: int) -> str:
     return f"{value:010d}"
 
 
-def suggest_var_name(*, filename: str, line: int, col: int) -> str:
-    return f"n{_stable_10_digits(kind='var', filename=filename, line=line, col=col)}"
-
-
-def suggest_func_name(*, filename: str, line: int, col: int) -> str:
-    return f"n{_stable_10_digits(kind='func', filename=filename, line=line, col=col)}"
-
-
-def suggest_const_name(*, filename: str, line: int, col: int) -> str:
-    return f"N{_stable_10_digits(kind='const', filename=filename, line=line, col=col)}"
-
+def _symbol_10_digits(*, kind: str, filename: str, scope: str, name: str) -> str:
+    """
+    10-digit identifier of a symbol (name in scope), the same wherever it is bound.
 
-def suggest_class_name(*, filename: str, line: int, col: int) -> str:
-    return f"N{_stable_10_digits(kind='class', filename=filename, line=line, col=col)}"
+    With the id ledger enabled it is unique within the project and recorded, so
+    it stays the same between runs; otherwise it is a hash of the symbol.
+    """
+    found = ledger_for(filename)
+    if found is None:
+        value = _hashed_symbol_id(kind, filename, scope, name)
+    else:
+        ledger, rel = found
+        value = ledger.id_for(f"{kind}|{rel}|{scope}|{name}")
+    return f"{value:010d}"
 
 
-def suggest_derived_class_suffix(*, filename: str, line: int, col: int) -> str:
+def symbol_ids(symbols: Iterable[tuple[str, str, str, str]]) -> list[str]:
     """
-    Suffix for derived class names: n<10digits>
-    (caller decides the base/root part).
+    The 10-digit ids of many (kind, filename, scope, name) symbols, as
+    _symbol_10_digits gives them, locating the ledger once per file.
     """
-    return f"n{_stable_10_digits(kind='derived', filename=filename, line=line, col=col)}"
-
-
-def suggest_public_member_name(*, filename: str, line: int, col: int) -> str:
-    return f"n_{_stable_10_digits(kind='member_public', filename=filename, line=line, col=col)}"
-
-
-def suggest_private_member_name(*, filename: str, line: int, col: int) -> str:
-    return f"_n{_stable_10_digits(kind='member_private', filename=filename, line=line, col=col)}"
+    located: dict[str, tuple[IdLedger, str] | None] = {}
+    out: list[str] = []
+    for kind, filename, scope, name in symbols:
+        if filename in located:
+            found = located[filename]
+        else:
+            found = located[filename] = ledger_for(filename)
+        if found is None:
+            value = _hashed_symbol_id(kind, filename, scope, name)
+        else:
+            ledger, rel = found
+            value = ledger.id_for(f"{kind}|{rel}|{scope}|{name}")
+        out.append(f"{value:010d}")
+    return out
+
+
+@lru_cache(maxsize=1 << 16)
+def _hashed_symbol_id(kind: str, filename: str, scope: str, name: str) -> int:
+    # hashed_id(f"{kind}|{filename}|{scope}|{name}"), resuming from the hashed prefix
+    h = _prefix_state(kind, filename).copy()
+    h.update(f"{scope}|{name}".encode("utf-8", "surrogatepass"))
+    return int.from_bytes(h.digest(), "big") % ID_SPACE
+
+
+@lru_cache(maxsize=1 << 12)
+def _prefix_state(kind: str, filename: str) -> hashlib.blake2b:
+    return hashlib.blake2b(f"{kind}|{filename}|".encode("utf-8", "surrogatepass"), digest_size=8)
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    """
+    A suggested name that is only computed when the message is rendered.
 
+    Renders as <head><sigil><10 digits>; head is empty except for derived class
+    names, where it is the (possibly suggested) base class name. With the name
+    being replaced and its scope, the digits identify the symbol; without them,
+    its position.
+    """
 
-def suggest_optional_param_name(*, filename: str, line: int, col: int) -> str:
-    return suggest_var_name(filename=filename, line=line, col=col)
+    _kind: str
+    _filename: str
+    _line: int
+    _col: int
+    _head: "str | Suggestion" = ""
+    _name: str = ""
+    _scope: str = ""
+
+    def __str__(self) -> str:
+        if self._name:
+            digits = _symbol_10_digits(kind=self._kind, filename=self._filename, scope=self._scope, name=self._name)
+        else:
+            digits = _stable_10_digits(kind=self._kind, filename=self._filename, line=self._line, col=self._col)
+        return f"{self._head}{_SIGILS[self._kind]}{digits}"
+
+
+def suggest_names(suggests: Iterable[Suggestion | str]) -> list[str]:
+    """Render many suggestions at once; the symbol ids are looked up in one symbol_ids() call."""
+    items = list(suggests)
+    named = [s for s in items if isinstance(s, Suggestion) and s._name]
+    digits = iter(symbol_ids((s._kind, s._filename, s._scope, s._name) for s in named))
+    out: list[str] = []
+    for suggest in items:
+        if not isinstance(suggest, Suggestion):
+            out.append(suggest)
+        elif suggest._name:
+            out.append(f"{suggest._head}{_SIGILS[suggest._kind]}{next(digits)}")
+        else:
+            out.append(str(suggest))
+    return out
+
+
+def suggestion(
+    kind: str,
+    *,
+    filename: str,
+    line: int,
+    col: int,
+    head: str | Suggestion = "",
+    name: str = "",
+    scope: str = "",
+) -> Suggestion:
+    return Suggestion(_kind=kind, _filename=filename, _line=line, _col=col, _head=head, _name=name, _scope=scope)
+
+
+def dump_suggestion(suggest: Suggestion | str | None) -> object:
+    """JSON-ready form of a suggestion that keeps it unrendered (see load_suggestion)."""
+    if not isinstance(suggest, Suggestion):
+        return suggest
+    return [
+        suggest._kind,
+        suggest._filename,
+        suggest._line,
+        suggest._col,
+        dump_suggestion(suggest._head),
+        suggest._name,
+        suggest._scope,
+    ]
+
+
+def load_suggestion(data: object) -> Suggestion | str | None:
+    if data is None or isinstance(data, str):
+        return data
+    kind, filename, line, col, head, name, scope = data  # type: ignore[misc]
+    if kind not in _SIGILS:
+        raise ValueError(f"unknown suggestion kind {kind!r}")
+    return suggestion(
+        kind,
+        filename=filename,
+        line=int(line),
+        col=int(col),
+        head=load_suggestion(head) or "",
+        name=name,
+        scope=scope,
+    )
 
 
 def format_with_suggestion(message: str, *, suggest: str) -> str:
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .suggestions import Suggestion, format_with_suggestion
+
 
 @dataclass(frozen=True, slots=True)
 class Violation:
@@ -9,6 +11,8 @@ class Violation:
     _col: int
     _code: str
     _message: str
+    _args: tuple[tuple[str, str], ...] = ()
+    _suggest: Suggestion | str | None = None
 
     @property
     def line(self) -> int:
@@ -23,8 +27,36 @@ class Violation:
         return self._code
 
     @property
-    def message(self) -> str:
+    def template(self) -> str:
         return self._message
 
-    def to_flake8(self, plugin_type: type) -> tuple[int, int, str, type]:
-        return (self._line, self._col, f"{self._code} {self._message}", plugin_type)
+    @property
+    def args(self) -> tuple[tuple[str, str], ...]:
+        return self._args
+
+    @property
+    def bare_message(self) -> str:
+        """The message without the "(suggest ...)" part."""
+        if not self._args:
+            return self._message
+        return self._message.format_map(dict(self._args))
+
+    @property
+    def suggestion(self) -> Suggestion | str | None:
+        """The suggested name as given, not rendered yet."""
+        return self._suggest
+
+    @property
+    def suggest(self) -> str | None:
+        return None if self._suggest is None else str(self._suggest)
+
+    @property
+    def message(self) -> str:
+        # rendered on demand: filtered-out violations never build their text
+        if self._suggest is None:
+            return self.bare_message
+        return format_with_suggestion(self.bare_message, suggest=str(self._suggest))
+
+    def to_flake8(self, plugin_type: type, *, with_suggestion: bool = True) -> tuple[int, int, str, type]:
+        message = self.message if with_suggestion else self.bare_message
+        return (self._line, self._col, f"{self._code} {message}", plugin_type)
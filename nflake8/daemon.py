@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from .checks.project import run_project_checks
+from .core.root import configure_run, find_project_root, invalidate_project_caches, stat_signature
+from .core.source import read_lines
+from .core.types import Violation
+from .runner import check_text, filter_noqa
+
+
+def default_socket_path() -> str:
+    """
+    The socket in $XDG_RUNTIME_DIR, else in a directory of the temp dir that only
+    this user can enter (created with mode 0700; refused when someone else owns
+    it or can write to it), so no other local user can take the name first.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "nflake8.sock")
+    uid = getattr(os, "getuid", lambda: 0)()
+    directory = os.path.join(tempfile.gettempdir(), f"nflake8-{uid}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or st.st_mode & 0o077:
+        raise OSError(f"{directory} is not a private directory of this user")
+    return os.path.join(directory, "daemon.sock")
+
+
+@dataclass(frozen=True, slots=True)
+class _FileResult:
+    _signature: tuple[str, object]
+    _violations: list[Violation]
+    _first_line: str
+
+    @property
+    def signature(self) -> tuple[str, object]:
+        return self._signature
+
+    @property
+    def violations(self) -> list[Violation]:
+        return self._violations
+
+    @property
+    def first_line(self) -> str:
+        return self._first_line
+
+
+class LintDaemon:
+    """
+    Warm, in-memory linting state for a long-running process.
+
+    AST/token results are kept per file and reused while the file is unchanged.
+    Directories between each linted file and its project root, and the root's
+    README.md, are watched: when they change the root/README caches are dropped.
+    """
+
+    def __init__(self, *, max_files: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self._max_files = max_files
+        self._results: OrderedDict[str, _FileResult] = OrderedDict()
+        self._watched: dict[str, tuple[int, int, int] | None] = {}
+        # file -> the paths watched for it; watched path -> number of files watching it
+        self._watching: dict[str, tuple[str, ...]] = {}
+        self._watchers: Counter[str] = Counter()
+
+    def lint(self, path: str, *, text: str | None = None) -> list[Violation]:
+        path = os.path.abspath(path)
+        with self._lock:
+            # every request is a run of its own: NNO500 must show up for each file
+            configure_run(None)
+            project = run_project_checks(filename=path)
+            self._watch_project(path)
+
+            result = self._file_result(path, text)
+            return filter_noqa(project, [result.first_line]) + result.violations
+
+    def poll(self) -> list[str]:
+        """
+        Check watched paths once; re-lint changed files so the next request is a
+        cache hit. Returns the files that were re-linted.
+        """
+        with self._lock:
+            changed_project = False
+            for path, sig in list(self._watched.items()):
+                new_sig = stat_signature(path)
+                if new_sig != sig:
+                    self._watched[path] = new_sig
+                    changed_project = True
+            if changed_project:
+                invalidate_project_caches()
+
+            stale = [
+                path
+                for path, result in self._results.items()
+                if result.signature[0] == "file" and result.signature[1] != stat_signature(path)
+            ]
+            for path in stale:
+                del self._results[path]
+                if os.path.exists(path):
+                    self._file_result(path, None)
+                else:
+                    self._unwatch(path)
+            return stale
+
+    def watch(self, stop: threading.Event, *, interval: float = 0.5) -> None:
+        while not stop.wait(interval):
+            self.poll()
+
+    def _file_result(self, path: str, text: str | None) -> _FileResult:
+        if text is None:
+            signature: tuple[str, object] = ("file", stat_signature(path))
+        else:
+            signature = ("text", hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest())
+
+        cached = self._results.get(path)
+        if cached is not None and cached.signature == signature:
+            self._results.move_to_end(path)
+            return cached
+
+        if text is None:
+            lines = read_lines(path)
+            violations = check_text(text=lines, filename=path)
+        else:
+            # the tokenizer's lines: no breaks on \x0c, \x1c or \u2028 as str.splitlines() makes
+            lines = io.StringIO(text, newline=None).readlines()
+            violations = check_text(text=text, filename=path)
+        result = _FileResult(
+            _signature=signature,
+            _violations=filter_noqa(violations, lines),
+            _first_line=lines[0] if lines else "",
+        )
+        self._results[path] = result
+        self._results.move_to_end(path)
+        while len(self._results) > self._max_files:
+            evicted, _ = self._results.popitem(last=False)
+            self._unwatch(evicted)
+        return result
+
+    def _watch_project(self, path: str) -> None:
+        root = find_project_root(path)
+        paths = []
+        cur = os.path.dirname(path)
+        while True:
+            # directory mtime changes when marker files are created or removed
+            paths.append(cur)
+            if root is None or cur == root:
+                break
+            parent = os.path.dirname(cur)
+            if parent == cur:
+                break
+            cur = parent
+        if root is not None:
+            paths.append(os.path.join(root, "README.md"))
+
+        watching = tuple(paths)
+        if self._watching.get(path) == watching:
+            return
+        for watched in watching:
+            if watched not in self._watched:
+                self._watched[watched] = stat_signature(watched)
+            self._watchers[watched] += 1
+        self._unwatch(path)
+        self._watching[path] = watching
+
+    def _unwatch(self, path: str) -> None:
+        # stop watching what only path needed: the watch list lives as long as its cached result
+        for watched in self._watching.pop(path, ()):
+            self._watchers[watched] -= 1
+            if self._watchers[watched] <= 0:
+                del self._watchers[watched]
+                self._watched.pop(watched, None)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for raw in self.rfile:
+            try:
+                request = json.loads(raw)
+                response = self.server.dispatch(request)  # type: ignore[attr-defined]
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    JSON-lines server on a local socket. Requests:
+      {"op": "lint", "path": ..., "text": <optional unsaved buffer>}
+      {"op": "ping"} / {"op": "shutdown"}
+    """
+
+    def __init__(self, socket_path: str, daemon: LintDaemon | None = None) -> None:
+        if os.path.lexists(socket_path):
+            _remove_stale_socket(socket_path)
+        self.lint_daemon = daemon or LintDaemon()
+        super().__init__(socket_path, _Handler)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op == "lint":
+            violations = self.lint_daemon.lint(request["path"], text=request.get("text"))
+            return {"results": [[v.line, v.col, v.code, v.message] for v in violations]}
+        return {"error": f"unknown op {op!r}"}
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Unlink a socket left behind by a daemon that is gone; refuse to take over anything else."""
+    if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+        raise OSError(f"{socket_path} exists and is not a socket")
+    try:
+        request(socket_path, {"op": "ping"}, timeout=1.0)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    except ValueError:
+        pass
+    raise OSError(f"a daemon is already serving {socket_path}")
+
+
+def serve(socket_path: str, *, poll_interval: float = 0.5) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("daemon mode requires Unix domain sockets")
+    server = DaemonServer(socket_path)
+    stop = threading.Event()
+    watcher = threading.Thread(
+        target=server.lint_daemon.watch,
+        args=(stop,),
+        kwargs={"interval": poll_interval},
+        daemon=True,
+    )
+    watcher.start()
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+
+
+def request(socket_path: str, payload: dict, *, timeout: float = 30.0) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise OSError("daemon closed the connection")
+    return json.loads(line)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+from typing import Iterable
+
+from .checks.project import PROJECT_CODES
+from .core.types import Violation
+
+_HUNK_RE = re.compile(r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# None means "the whole file is new"
+LineRanges = list[tuple[int, int]] | None
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def _git(args: list[str], *, cwd: str) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "-c", "core.quotepath=off", *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+            check=False,
+        )
+    except OSError as e:
+        raise GitError(str(e)) from e
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.strip() or f"git {' '.join(args)} failed")
+    return proc.stdout
+
+
+def changed_lines(ref: str = "HEAD", *, cwd: str = ".") -> dict[str, LineRanges]:
+    """
+    Map each changed .py file (absolute path) to its added/modified line ranges.
+
+    Compares the working tree with `ref`; untracked files count as fully changed.
+    """
+    top = _git(["rev-parse", "--show-toplevel"], cwd=cwd).strip()
+    out: dict[str, LineRanges] = {}
+
+    current: str | None = None
+    diff = _git(["diff", "-U0", "--no-color", "--no-ext-diff", "--diff-filter=ACMR", ref, "--"], cwd=top)
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:]
+            if path.startswith("b/"):
+                path = path[2:]
+            current = os.path.join(top, path) if path.endswith(".py") else None
+            if current is not None:
+                out.setdefault(current, [])
+            continue
+        if current is None or not line.startswith("@@"):
+            continue
+        m = _HUNK_RE.match(line)
+        if m is None:
+            continue
+        start = int(m.group(1))
+        count = int(m.group(2)) if m.group(2) is not None else 1
+        ranges = out[current]
+        if count and ranges is not None:
+            ranges.append((start, start + count - 1))
+
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "--", "*.py"], cwd=top)
+    for path in untracked.splitlines():
+        out[os.path.join(top, path)] = None
+
+    return out
+
+
+def filter_to_ranges(violations: Iterable[Violation], ranges: LineRanges) -> list[Violation]:
+    """Keep project-level violations and those on changed lines."""
+    if ranges is None:
+        return list(violations)
+    return [
+        v
+        for v in violations
+        if v.code in PROJECT_CODES or any(start <= v.line <= end for start, end in ranges)
+    ]
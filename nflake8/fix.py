@@ -0,0 +1,1361 @@
+from __future__ import annotations
+
+import ast
+import bisect
+import io
+import os
+import tempfile
+import tokenize
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, Mapping, Sequence
+
+from .api import DEFAULT_EXCLUDE, discover_files
+from .checks.ast import run_ast_checks
+from .core.ids import enable_id_ledger, get_ledger_dir
+from .core.index import SymbolIndex, get_symbol_index
+from .core.patterns import expected_receiver_name, is_class_name
+from .core.root import find_project_root
+from .core.types import Violation
+from .rules.registry import get_rule_set
+from .runner import filter_noqa
+
+# Codes whose suggestion is a new identifier the fixer can apply
+FIX_CODES = frozenset(
+    {"NNO101", "NNO104", "NNO105", "NNO106", "NNO107", "NNO108", "NNO109", "NNO110", "NNO201", "NNO202", "NNO210"}
+)
+
+# A rename can make new violations fixable (derived class names follow their
+# base, receivers follow their class), so files are re-checked up to this often
+_MAX_PASSES = 8
+_MAX_CHUNK_SIZE = 64
+
+# Class names are planned first: receivers are derived from them
+_PRIORITY = {"NNO107": 0, "NNO105": 1, "NNO106": 2}
+
+# Decorators that neither register the function by name nor inject arguments by name
+_TRANSPARENT_DECORATORS = frozenset(
+    {
+        "abstractmethod",
+        "cache",
+        "cached_property",
+        "classmethod",
+        "dataclass",
+        "deleter",
+        "final",
+        "getter",
+        "lru_cache",
+        "override",
+        "property",
+        "setter",
+        "staticmethod",
+        "total_ordering",
+        "wraps",
+    }
+)
+
+# Scopes that read their names dynamically keep them
+_DYNAMIC_LOOKUPS = frozenset({"eval", "exec", "globals", "locals", "vars"})
+
+# Binding kinds the rules check, so the current name is valid where they are not flagged
+_CHECKED = frozenset({"class", "def", "iter", "iter_tuple", "name", "param"})
+
+_Pos = tuple[int, int]
+# (used, attrs) arguments of fix_file
+_Uses = tuple[dict[str, bool] | None, frozenset[str]]
+
+
+class FixError(RuntimeError):
+    """A file could not be rewritten safely; it is left as it was."""
+
+
+@dataclass(frozen=True, slots=True)
+class FixResult:
+    _filename: str
+    _renames: int
+    _error: str | None = None
+    # module-level names renamed, (old, new)
+    _exports: tuple[tuple[str, str], ...] = ()
+    _imports: int = 0
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def renames(self) -> int:
+        """Number of symbols renamed (each everywhere it occurs)."""
+        return self._renames
+
+    @property
+    def error(self) -> str | None:
+        return self._error
+
+    @property
+    def exports(self) -> tuple[tuple[str, str], ...]:
+        """Module-level names renamed, as (old, new): what other modules import changed."""
+        return self._exports
+
+    @property
+    def imports(self) -> int:
+        """Number of imported names updated to follow renames in the modules they come from."""
+        return self._imports
+
+
+def fix_files(
+    paths: Iterable[str],
+    *,
+    jobs: int = 1,
+    exclude: Sequence[str] = DEFAULT_EXCLUDE,
+) -> Iterator[FixResult]:
+    """
+    Rewrite files (directories are expanded to their .py files) on `jobs` worker
+    processes, then update the imports of renamed module-level names in every
+    module of the projects involved (looked up in their symbol index).
+
+    Module-level names are only renamed when every other module of the project
+    uses them in a way that can be updated, and class members keep the names
+    other modules read as attributes; names of files outside a project are kept.
+    """
+    files = discover_files(paths, exclude=exclude)
+    uses = _export_uses(files)
+    if jobs <= 1 or len(files) <= 1:
+        results = list(map(_fix_file_with_uses, files, map(uses.__getitem__, files)))
+    else:
+        chunksize = max(1, min(_MAX_CHUNK_SIZE, len(files) // (jobs * 4)))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(get_ledger_dir(),)) as pool:
+            results = list(pool.map(_fix_file_with_uses, files, map(uses.__getitem__, files), chunksize=chunksize))
+    yield from _update_importers(results)
+
+
+def _init_worker(ledger_dir: str | None) -> None:
+    if ledger_dir is not None:
+        enable_id_ledger(ledger_dir)
+
+
+def _fix_file_with_uses(filename: str, uses: _Uses) -> FixResult:
+    used, attrs = uses
+    return fix_file(filename, used=used, attrs=attrs)
+
+
+def fix_file(
+    filename: str,
+    *,
+    used: Mapping[str, bool] | None = None,
+    attrs: frozenset[str] = frozenset(),
+) -> FixResult:
+    """
+    Rename the symbols of one file to their suggested names and write it back
+    atomically, in its own encoding, line endings untouched.
+
+    `used` maps the module-level names other modules use to whether they must
+    keep their name (True) or their importers can follow a rename (False); the
+    parameters and members of used functions and classes are kept either way.
+    Unlisted module-level names are free to rename. With None (the default)
+    other modules may use any of them, so all are kept.
+
+    `attrs` are the attribute names other modules read: instances of any class
+    may reach them (returned from a function, say), so members with these names
+    are kept.
+    """
+    try:
+        text, encoding = _read_source(filename)
+    except (OSError, SyntaxError, UnicodeDecodeError) as e:
+        return FixResult(_filename=filename, _renames=0, _error=str(e))
+
+    try:
+        fixed, renames, exports = _fix_text(text, filename=filename, used=used, attrs=attrs)
+        if renames:
+            _write_atomic(filename, fixed.encode(encoding))
+    except (FixError, OSError, SyntaxError, ValueError) as e:
+        return FixResult(_filename=filename, _renames=0, _error=str(e))
+    return FixResult(_filename=filename, _renames=renames, _exports=tuple(exports.items()))
+
+
+def fix_source(text: str, *, filename: str) -> tuple[str, int]:
+    """
+    Apply the suggested names of `text` and return (new text, symbols renamed).
+
+    Each pass builds the module's symbol table, decides every rename against it
+    and rewrites all occurrences at their token positions at once. Renames that
+    could change what a name refers to are not made. Raises SyntaxError when
+    text does not parse and FixError when an edit does not land on the name it
+    expects.
+
+    Module-level names are renamed too, as if no other module used them.
+    """
+    text, total, _ = _fix_text(text, filename=filename, used={}, attrs=frozenset())
+    return text, total
+
+
+def _fix_text(
+    text: str, *, filename: str, used: Mapping[str, bool] | None, attrs: frozenset[str]
+) -> tuple[str, int, dict[str, str]]:
+    # also returns the module-level renames, old -> final name
+    total = 0
+    exports: dict[str, str] = {}
+    for _ in range(_MAX_PASSES):
+        tree = ast.parse(text, filename=filename)
+        lines = io.StringIO(text, newline="").readlines()
+        violations = run_ast_checks(tree=tree, filename=filename, rule_set=get_rule_set(FIX_CODES))
+        violations = filter_noqa([v for v in violations if v.code in FIX_CODES], lines)
+        if not violations:
+            break
+        table = _SymbolTable(tree, _Positions(text, lines))
+        _keep_used_exports(table, used, exports)
+        for klass in table.classes.values():
+            for name in attrs & klass.symbols.keys():
+                klass.symbols[name].keep = True
+        renamed = _RenamePlan(table).plan(violations)
+        if not renamed:
+            break
+        text = _apply(lines, renamed)
+        total += len(renamed)
+        for symbol in renamed:
+            if symbol.scope is table.module:
+                original = next((old for old, new in exports.items() if new == symbol.name), symbol.name)
+                exports[original] = symbol.new_name
+
+    if total:
+        try:
+            ast.parse(text, filename=filename)
+        except SyntaxError as e:
+            raise FixError(f"rewritten source does not parse: {e.msg}") from e
+    return text, total, exports
+
+
+def _keep_used_exports(table: _SymbolTable, used: Mapping[str, bool] | None, renamed: dict[str, str]) -> None:
+    """
+    Other modules may call used functions by keyword and reach the members of
+    used classes through instances, which cannot be followed: those keep their
+    names, and so do used names whose uses cannot be rewritten (all module-level
+    names when the uses are unknown). `renamed` maps original names to the
+    current ones after earlier passes.
+    """
+    current = None if used is None else {renamed.get(name, name): keep for name, keep in used.items()}
+    for name, symbol in table.module.symbols.items():
+        keep = True if current is None else current.get(name)
+        if keep is None:
+            continue
+        if keep:
+            symbol.keep = True
+        for node in symbol.defs:
+            if node in table.functions:
+                table.functions[node].decorated = True
+            elif node in table.classes:
+                klass = table.classes[node]
+                klass.decorated = True
+                for member in klass.symbols.values():
+                    member.keep = True
+
+
+def _export_uses(files: list[str]) -> dict[str, _Uses]:
+    """
+    For each file, how the other modules of its project use its module-level
+    names (see fix_file), None outside a project, or when some module uses it
+    in a way that cannot be followed (its module object used bare, a star
+    import, an unparsable module); and the attribute names the other modules
+    of the project read.
+    """
+    out: dict[str, dict[str, bool] | None] = dict.fromkeys(files)
+    attrs: dict[str, frozenset[str]] = dict.fromkeys(files, frozenset())
+    by_root: dict[str, list[str]] = {}
+    for filename in files:
+        root = find_project_root(filename)
+        if root is not None:
+            by_root.setdefault(root, []).append(filename)
+
+    for root, group in by_root.items():
+        index = get_symbol_index(root)
+        if index.refresh():
+            index.save()
+        targets: dict[str, str] = {}
+        for filename in group:
+            module = index.module_for(filename)
+            if module:
+                targets[module] = filename
+                out[filename] = {}
+        if not targets:
+            continue
+        # instances travel further than imports: every module may read their members
+        importers = {os.path.normcase(name) for name in index.importers(targets)}
+        read: Counter[str] = Counter()
+        own: dict[str, set[str]] = {}
+        for other in index.files:
+            refs = _scan_refs(other, index)
+            for module, filename in targets.items():
+                if _same_file(other, filename):
+                    own[filename] = set() if refs is None else refs.attrs
+                    continue
+                used = out[filename]
+                if used is None or (refs is not None and os.path.normcase(other) not in importers):
+                    continue
+                found = None if refs is None else refs.uses(module, index.exports(module) or frozenset())
+                if found is None:
+                    out[filename] = None
+                    continue
+                for name, keep in found.items():
+                    used[name] = used.get(name, False) or keep
+            if refs is not None:
+                read.update(refs.attrs)
+        for filename in targets.values():
+            mine = own.get(filename, set())
+            attrs[filename] = frozenset(name for name, count in read.items() if count > (name in mine))
+    return {filename: (out[filename], attrs[filename]) for filename in files}
+
+
+def _same_file(first: str, second: str) -> bool:
+    return os.path.normcase(os.path.abspath(first)) == os.path.normcase(os.path.abspath(second))
+
+
+def _scan_refs(filename: str, index: SymbolIndex) -> _ModuleRefs | None:
+    try:
+        text, _ = _read_source(filename)
+        tree = ast.parse(text, filename=filename)
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return None
+    return _ModuleRefs(filename, index).scan(tree)
+
+
+class _ModuleRefs(ast.NodeVisitor):
+    """
+    How one module refers to the names of other modules of its project.
+
+    `refs` are the uses a rename can follow: `from M import name` and
+    attributes of module objects (`M.name` after `import M as A`, `import M` or
+    `from P import M`, also down a chain of submodules, `pkg.mod.name`) where
+    the name holding the module is bound to nothing else in the file. Modules
+    used in any other way (star imports; the module object used bare or held by
+    a name bound otherwise too; the module path in a string) are `opaque`.
+    Identifiers in strings may be looked up by name (getattr), and dotted
+    strings (mock.patch targets) name a module's member.
+    """
+
+    def __init__(self, filename: str, index: SymbolIndex) -> None:
+        self._filename = filename
+        self._index = index
+        # names holding a module object -> the module
+        self._modules: dict[str, str] = {}
+        # (module, name) -> the import aliases and attributes naming it
+        self.refs: dict[tuple[str, str], list[ast.alias | ast.Attribute]] = {}
+        self.opaque: set[str] = set()
+        self.strings: set[str] = set()
+        self.paths: set[str] = set()
+        # every attribute name read or written here
+        self.attrs: set[str] = set()
+
+    def scan(self, tree: ast.Module) -> _ModuleRefs:
+        bindings: dict[str, set[str]] = {}
+        counts: Counter[str] = Counter()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    # `import a.b` binds the top-level package, `a.b` is reached through it
+                    name = alias.asname or alias.name.split(".")[0]
+                    bindings.setdefault(name, set()).add(alias.name if alias.asname else name)
+                    counts[name] += 1
+            elif isinstance(node, ast.ImportFrom):
+                module = self._index.resolve(self._filename, node.module, node.level or 0)
+                for alias in node.names if module is not None else ():
+                    if alias.name != "*" and self._index.is_module(f"{module}.{alias.name}"):
+                        name = alias.asname or alias.name
+                        bindings.setdefault(name, set()).add(f"{module}.{alias.name}")
+                        counts[name] += 1
+        bound = Counter(_bound_names(tree))
+        for name, modules in bindings.items():
+            if len(modules) == 1 and bound[name] == counts[name]:
+                self._modules[name] = next(iter(modules))
+            else:
+                self.opaque.update(modules)
+        self.visit(tree)
+        return self
+
+    def uses(self, module: str, exports: frozenset[str]) -> dict[str, bool] | None:
+        """The names of module used here, mapped to whether they must be kept; None when that cannot be told."""
+        if any(module == other or module.startswith(other + ".") for other in self.opaque):
+            return None
+        found: dict[str, bool] = {}
+        for owner, name in self.refs:
+            if owner == module:
+                found[name] = name in self.strings
+        if found:
+            for name in self.strings & exports:
+                found[name] = True
+        prefix = module + "."
+        for path in self.paths:
+            if path.startswith(prefix):
+                found[path[len(prefix) :].split(".")[0]] = True
+        return found
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = self._index.resolve(self._filename, node.module, node.level or 0)
+        if module is None:
+            return
+        for alias in node.names:
+            if alias.name == "*":
+                self.opaque.add(module)
+            elif self._index.is_module(f"{module}.{alias.name}"):
+                # a submodule, which the module may also bind itself
+                if alias.name in (self._index.exports(module) or ()):
+                    self.opaque.add(module)
+            else:
+                self.refs.setdefault((module, alias.name), []).append(alias)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        chain = [node]
+        while isinstance(chain[-1].value, ast.Attribute):
+            chain.append(chain[-1].value)
+        self.attrs.update(attribute.attr for attribute in chain)
+        root = chain[-1].value
+        module = self._modules.get(root.id) if isinstance(root, ast.Name) else None
+        if module is None:
+            self.generic_visit(node)
+            return
+        # down the submodules to the first member
+        for attribute in reversed(chain):
+            child = f"{module}.{attribute.attr}"
+            if not self._index.is_module(child):
+                self.refs.setdefault((module, attribute.attr), []).append(attribute)
+                return
+            module = child
+        self.opaque.add(module)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        module = self._modules.get(node.id)
+        if module is not None:
+            self.opaque.add(module)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        value = node.value
+        if not isinstance(value, str):
+            return
+        if value.isidentifier():
+            self.strings.add(value)
+        elif all(part.isidentifier() for part in value.split(".")):
+            self.paths.add(value)
+        if self._index.is_module(value):
+            self.opaque.add(value)
+
+
+def _update_importers(results: list[FixResult]) -> list[FixResult]:
+    """
+    Make `from M import old` in every module of the project follow the renames
+    of M (as `from M import new as old`, so the importing module is unchanged
+    otherwise), and likewise `A.old` and `P.M.old` on module objects (see
+    _ModuleRefs). Only the files the symbol index lists as referring to M are read.
+    """
+    by_root: dict[str, list[FixResult]] = {}
+    for result in results:
+        if result.exports:
+            root = find_project_root(result.filename)
+            if root is not None:
+                by_root.setdefault(root, []).append(result)
+    if not by_root:
+        return results
+
+    updated: dict[str, FixResult] = {}
+    for root, fixed in by_root.items():
+        index = get_symbol_index(root)
+        if index.refresh():
+            index.save()
+        renamed: dict[str, dict[str, str]] = {}
+        for result in fixed:
+            module = index.module_for(result.filename)
+            if module is not None:
+                renamed[module] = dict(result.exports)
+        for filename in index.importers(renamed):
+            result = _update_imports(filename, index, renamed)
+            if result is not None:
+                updated[os.path.normcase(filename)] = result
+
+    out: list[FixResult] = []
+    for result in results:
+        found = updated.pop(os.path.normcase(os.path.abspath(result.filename)), None)
+        if found is None:
+            out.append(result)
+        elif found.error is not None:
+            out.append(replace(result, _error=found.error))
+        else:
+            out.append(replace(result, _imports=found.imports))
+    out.extend(updated.values())
+    return out
+
+
+def _update_imports(filename: str, index: SymbolIndex, renamed: dict[str, dict[str, str]]) -> FixResult | None:
+    try:
+        text, encoding = _read_source(filename)
+    except (OSError, SyntaxError, UnicodeDecodeError) as e:
+        return FixResult(_filename=filename, _renames=0, _error=str(e))
+    if not any(old in text for names in renamed.values() for old in names):
+        return None
+
+    try:
+        tree = ast.parse(text, filename=filename)
+    except (SyntaxError, ValueError):
+        return None
+    lines = io.StringIO(text, newline="").readlines()
+    positions = _Positions(text, lines)
+    edits: dict[_Pos, tuple[str, str]] = {}
+    for (module, old), nodes in _ModuleRefs(filename, index).scan(tree).refs.items():
+        new = renamed.get(module, {}).get(old)
+        if new is None:
+            continue
+        for node in nodes:
+            if isinstance(node, ast.alias):
+                edits[positions.of(node)] = (old, new if node.asname else f"{new} as {old}")
+            else:
+                line, end = positions.end_of(node)
+                edits[(line, end - len(old))] = (old, new)
+
+    if not edits:
+        return None
+    try:
+        fixed = _apply_edits(lines, edits)
+        ast.parse(fixed, filename=filename)
+        _write_atomic(filename, fixed.encode(encoding))
+    except (FixError, OSError, SyntaxError, ValueError) as e:
+        return FixResult(_filename=filename, _renames=0, _error=str(e))
+    return FixResult(_filename=filename, _renames=0, _imports=len(edits))
+
+
+def _bound_names(tree: ast.AST) -> list[str]:
+    """Every name bound anywhere in tree, once per binding."""
+    out: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            out.append(node.id)
+        elif isinstance(node, ast.arg):
+            out.append(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            out.append(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            out.extend(alias.asname or alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            out.extend(node.names)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+            out.append(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            out.append(node.rest)
+    return out
+
+
+def _read_source(filename: str) -> tuple[str, str]:
+    with open(filename, "rb") as f:
+        raw = f.read()
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(raw).readline)
+    return raw.decode(encoding), encoding
+
+
+def _write_atomic(filename: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix=".tmp-", suffix=".py")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, os.stat(filename).st_mode & 0o7777)
+        os.replace(tmp_path, filename)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _apply(lines: list[str], renamed: list[_Symbol]) -> str:
+    """Rewrite every occurrence in a single pass over the lines."""
+    edits: dict[_Pos, tuple[str, str]] = {}
+    for symbol in renamed:
+        for pos in symbol.occurrences:
+            previous = edits.setdefault(pos, (symbol.name, symbol.new_name))
+            if previous != (symbol.name, symbol.new_name):
+                raise FixError(f"line {pos[0]}: {previous[0]!r} and {symbol.name!r} share a position")
+    return _apply_edits(lines, edits)
+
+
+def _apply_edits(lines: list[str], edits: dict[_Pos, tuple[str, str]]) -> str:
+    """Replace the name at each position (old, new), checking that old is really there."""
+    by_line: dict[int, list[tuple[int, str, str]]] = {}
+    for (line, col), (old, new) in edits.items():
+        by_line.setdefault(line, []).append((col, old, new))
+
+    out = list(lines)
+    for line, found in by_line.items():
+        text = out[line - 1]
+        for col, old, new in sorted(found, reverse=True):
+            end = col + len(old)
+            if text[col:end] != old or (end < len(text) and (text[end].isalnum() or text[end] == "_")):
+                raise FixError(f"line {line}: {old!r} not found at column {col + 1}")
+            text = text[:col] + new + text[end:]
+        out[line - 1] = text
+    return "".join(out)
+
+
+class _Positions:
+    """Converts AST byte offsets to str columns and finds names the AST gives no position for."""
+
+    def __init__(self, text: str, lines: list[str]) -> None:
+        self._lines = lines
+        self._names: list[tuple[int, int, str]] = [
+            (tok.start[0], tok.start[1], tok.string)
+            for tok in tokenize.generate_tokens(io.StringIO(text).readline)
+            if tok.type == tokenize.NAME
+        ]
+
+    def column(self, line: int, byte_col: int) -> int:
+        text = self._lines[line - 1] if 0 < line <= len(self._lines) else ""
+        if text.isascii():
+            return byte_col
+        return len(text.encode("utf-8")[:byte_col].decode("utf-8", errors="ignore"))
+
+    def of(self, node: ast.AST) -> _Pos:
+        return (node.lineno, self.column(node.lineno, node.col_offset))
+
+    def end_of(self, node: ast.AST) -> _Pos:
+        return (node.end_lineno, self.column(node.end_lineno, node.end_col_offset))
+
+    def name_after(self, name: str, start: _Pos, end: _Pos | None = None) -> _Pos | None:
+        """First NAME token `name` at or after start (and before end)."""
+        index = bisect.bisect_left(self._names, (start[0], start[1], ""))
+        for line, col, string in self._names[index:]:
+            if end is not None and (line, col) >= end:
+                return None
+            if string == name:
+                return (line, col)
+        return None
+
+
+class _Symbol:
+    """One variable of one scope: where it is bound and everywhere it occurs."""
+
+    __slots__ = (
+        "name",
+        "scope",
+        "sites",
+        "occurrences",
+        "defs",
+        "ref_scopes",
+        "loops",
+        "keep",
+        "receiver_of",
+        "new_name",
+    )
+
+    def __init__(self, name: str, scope: _Scope) -> None:
+        self.name = name
+        self.scope = scope
+        # ast positions of the binding nodes, as the rules report them
+        self.sites: list[tuple[_Pos, str]] = []
+        self.occurrences: set[_Pos] = set()
+        self.defs: list[ast.AST] = []
+        self.ref_scopes: set[_Scope] = set()
+        # spans of the for loops binding it, None once it is bound any other way
+        self.loops: list[tuple[_Pos, _Pos]] | None = []
+        self.keep = False
+        self.receiver_of: _Scope | None = None
+        self.new_name = name
+
+    @property
+    def only_def(self) -> ast.AST | None:
+        return self.defs[0] if len(self.sites) == 1 and len(self.defs) == 1 else None
+
+
+class _Scope:
+    __slots__ = (
+        "kind",
+        "node",
+        "parent",
+        "symbols",
+        "declared",
+        "unresolved",
+        "frozen",
+        "bases",
+        "decorated",
+        "first_param",
+        "receiver",
+        "klass",
+        "names_after",
+    )
+
+    def __init__(self, kind: str, node: ast.AST, parent: _Scope | None) -> None:
+        self.kind = kind
+        self.node = node
+        self.parent = parent
+        self.symbols: dict[str, _Symbol] = {}
+        self.declared: dict[str, str] = {}
+        self.unresolved: set[str] = set()
+        self.frozen = False
+        # classes: scopes of the bases, None if any of them is not a class of this module
+        self.bases: list[_Scope] | None = []
+        self.decorated = False
+        # functions: first positional parameter, whether the rules treat it as the
+        # receiver, and the class they see the function in
+        self.first_param: _Symbol | None = None
+        self.receiver = False
+        self.klass: _Scope | None = None
+        # names bound here once the planned renames are made
+        self.names_after: dict[str, list[_Symbol]] = {}
+
+    def within(self, other: _Scope) -> bool:
+        scope: _Scope | None = self
+        while scope is not None:
+            if scope is other:
+                return True
+            scope = scope.parent
+        return False
+
+
+class _SymbolTable(ast.NodeVisitor):
+    """
+    Scopes and symbols of a module, built in one walk (LEGB, class scopes not
+    visible from nested functions, comprehensions with their own scope).
+
+    Besides names, occurrences include member attributes reached through a
+    receiver, a class name or super(), and keyword arguments of calls that
+    resolve to a function of the module.
+    """
+
+    def __init__(self, tree: ast.Module, positions: _Positions) -> None:
+        self._positions = positions
+        self.module = _Scope("module", tree, None)
+        self.scopes: list[_Scope] = [self.module]
+        self.sites: dict[_Pos, list[_Symbol]] = {}
+        self.functions: dict[ast.AST, _Scope] = {}
+        self.function_sites: dict[_Pos, _Scope] = {}
+        self.classes: dict[ast.AST, _Scope] = {}
+        self.attr_names: set[str] = set()
+        self._scope = self.module
+        self._class: _Scope | None = None
+        self._target: tuple[str, tuple[_Pos, _Pos] | None] | None = None
+        self._loads: list[tuple[_Scope, ast.Name]] = []
+        self._attributes: list[tuple[_Scope, ast.Attribute]] = []
+        self._calls: list[tuple[_Scope, ast.Call]] = []
+        self._nonlocals: list[tuple[_Scope, str, _Pos | None, str]] = []
+        self._strings: set[str] = set()
+        self.visit(tree)
+        self._resolve()
+
+    # --- binding -------------------------------------------------------
+
+    def _bind(
+        self,
+        name: str,
+        pos: _Pos | None,
+        kind: str,
+        *,
+        site: _Pos | None = None,
+        node: ast.AST | None = None,
+        scope: _Scope | None = None,
+    ) -> _Symbol | None:
+        scope = scope or self._scope
+        declared = scope.declared.get(name)
+        if declared == "global":
+            scope = self.module
+        elif declared == "nonlocal":
+            self._nonlocals.append((scope, name, pos, kind))
+            return None
+        symbol = scope.symbols.get(name)
+        if symbol is None:
+            symbol = scope.symbols[name] = _Symbol(name, scope)
+            scope.names_after[name] = [symbol]
+        self._add_site(symbol, pos, kind, site=site, node=node)
+        return symbol
+
+    def _add_site(self, symbol: _Symbol, pos: _Pos | None, kind: str, *, site=None, node=None) -> None:
+        if pos is None:
+            symbol.keep = True
+        else:
+            symbol.occurrences.add(pos)
+        if site is not None:
+            symbol.sites.append((site, kind))
+            self.sites.setdefault(site, []).append(symbol)
+        else:
+            symbol.sites.append(((0, 0), kind))
+        if node is not None:
+            symbol.defs.append(node)
+        if self._target is not None and self._target[1] is not None and kind == self._target[0]:
+            if symbol.loops is not None:
+                symbol.loops.append(self._target[1])
+        else:
+            symbol.loops = None
+
+    def _push(self, kind: str, node: ast.AST) -> _Scope:
+        scope = _Scope(kind, node, self._scope)
+        self.scopes.append(scope)
+        return scope
+
+    def _visit_in(self, scope: _Scope, nodes: Iterable[ast.AST]) -> None:
+        outer, self._scope = self._scope, scope
+        for node in nodes:
+            self.visit(node)
+        self._scope = outer
+
+    # --- visitors ------------------------------------------------------
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        for expr in node.decorator_list:
+            self.visit(expr)
+        self._visit_signature(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+
+        opaque = not _transparent(node.decorator_list) or node.name.startswith("test")
+        # the rules check functions outside classes and methods, not functions nested in methods
+        checked = self._class is None or (self._scope.kind == "class" and node in self._scope.node.body)
+        kind = "def" if checked else "other"
+        symbol = self._bind(node.name, self._def_name(node), kind, site=_site(node), node=node)
+        if symbol is not None and opaque:
+            symbol.keep = True
+
+        scope = self._push("function", node)
+        scope.klass = self._class
+        scope.receiver = self._class is not None and not _has_decorator(node, "staticmethod")
+        scope.decorated = opaque
+        self.functions[node] = scope
+        self.function_sites[_site(node)] = scope
+        self._bind_params(scope, node.args, "param")
+        if self._scope.kind == "class" and scope.first_param is not None and not _has_decorator(node, "staticmethod"):
+            scope.first_param.receiver_of = self._scope
+        self._visit_in(scope, node.body)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._visit_signature(node.args, annotations=False)
+        scope = self._push("function", node)
+        scope.klass = self._class
+        self._bind_params(scope, node.args, "other")
+        self._visit_in(scope, [node.body])
+
+    def _visit_signature(self, args: ast.arguments, *, annotations: bool = True) -> None:
+        for expr in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            self.visit(expr)
+        if annotations:
+            for arg in _all_args(args):
+                if arg.annotation is not None:
+                    self.visit(arg.annotation)
+
+    def _bind_params(self, scope: _Scope, args: ast.arguments, kind: str) -> None:
+        for arg in _all_args(args):
+            symbol = self._bind(arg.arg, self._positions.of(arg), kind, site=_site(arg), scope=scope)
+            if symbol is not None and scope.first_param is None and (args.posonlyargs or args.args):
+                scope.first_param = symbol
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        for expr in node.decorator_list + node.bases + node.keywords:
+            self.visit(expr)
+        symbol = self._bind(node.name, self._def_name(node), "class", site=_site(node), node=node)
+        if symbol is not None and (not _transparent(node.decorator_list) or node.name.startswith("Test")):
+            symbol.keep = True
+
+        scope = self._push("class", node)
+        scope.decorated = bool(node.decorator_list)
+        self.classes[node] = scope
+        outer, self._class = self._class, scope
+        self._visit_in(scope, node.body)
+        self._class = outer
+
+    def _visit_comprehension(self, node: ast.AST, results: list[ast.AST]) -> None:
+        generators: list[ast.comprehension] = node.generators
+        self.visit(generators[0].iter)
+        scope = self._push("comprehension", node)
+        outer, self._scope = self._scope, scope
+        for index, generator in enumerate(generators):
+            if index:
+                self.visit(generator.iter)
+            self._visit_target(generator.target, None, checked=True)
+            for expr in generator.ifs:
+                self.visit(expr)
+        for expr in results:
+            self.visit(expr)
+        self._scope = outer
+
+    def visit_ListComp(self, node: ast.ListComp | ast.SetComp | ast.GeneratorExp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    visit_SetComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:
+        self._visit_comprehension(node, [node.key, node.value])
+
+    def visit_For(self, node: ast.For | ast.AsyncFor) -> None:
+        self.visit(node.iter)
+        # loops directly in a class body are not checked
+        checked = self._scope.kind != "class" or node not in self._scope.node.body
+        self._visit_target(node.target, (self._positions.of(node), self._positions.end_of(node)), checked=checked)
+        for stmt in node.body + node.orelse:
+            self.visit(stmt)
+
+    visit_AsyncFor = visit_For
+
+    def _visit_target(self, target: ast.AST, loop: tuple[_Pos, _Pos] | None, *, checked: bool) -> None:
+        kind = "iter" if isinstance(target, ast.Name) else "iter_tuple"
+        outer, self._target = self._target, (kind if checked else "other", loop)
+        self.visit(target)
+        self._target = outer
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self._loads.append((self._scope, node))
+            return
+        if isinstance(node.ctx, ast.Del):
+            kind = "other"
+        else:
+            kind = self._target[0] if self._target is not None else "name"
+        self._bind(node.id, self._positions.of(node), kind, site=_site(node))
+
+    def visit_NamedExpr(self, node: ast.NamedExpr) -> None:
+        self.visit(node.value)
+        scope = self._scope
+        while scope.kind == "comprehension" and scope.parent is not None:
+            scope = scope.parent
+        self._bind(node.target.id, self._positions.of(node.target), "name", site=_site(node.target), scope=scope)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            start = self._positions.end_of(node.type) if node.type is not None else self._positions.of(node)
+            self._bind(node.name, self._positions.name_after(node.name, start), "name", site=_site(node))
+        for stmt in node.body:
+            self.visit(stmt)
+
+    def visit_MatchAs(self, node: ast.MatchAs) -> None:
+        if node.pattern is not None:
+            self.visit(node.pattern)
+        if node.name is not None:
+            start = self._positions.end_of(node.pattern) if node.pattern is not None else self._positions.of(node)
+            self._bind(node.name, self._positions.name_after(node.name, start), "name", site=_site(node))
+
+    def visit_MatchStar(self, node: ast.MatchStar) -> None:
+        if node.name is not None:
+            position = self._positions.name_after(node.name, self._positions.of(node))
+            self._bind(node.name, position, "name", site=_site(node))
+
+    def visit_MatchMapping(self, node: ast.MatchMapping) -> None:
+        for expr in node.keys + node.patterns:
+            self.visit(expr)
+        if node.rest is not None:
+            start = self._positions.end_of(node.patterns[-1]) if node.patterns else self._positions.of(node)
+            self._bind(node.rest, self._positions.name_after(node.rest, start), "other")
+
+    def visit_Global(self, node: ast.Global | ast.Nonlocal) -> None:
+        kind = "global" if isinstance(node, ast.Global) else "nonlocal"
+        start: _Pos | None = self._positions.of(node)
+        for name in node.names:
+            self._scope.declared[name] = kind
+            pos = self._positions.name_after(name, start, self._positions.end_of(node)) if start else None
+            start = (pos[0], pos[1] + 1) if pos is not None else None
+            if kind == "global":
+                symbol = self._bind(name, pos, "decl", scope=self.module)
+                symbol.ref_scopes.add(self._scope)
+            else:
+                self._nonlocals.append((self._scope, name, pos, "decl"))
+
+    visit_Nonlocal = visit_Global
+
+    def visit_Import(self, node: ast.Import | ast.ImportFrom) -> None:
+        for alias in node.names:
+            self._bind(alias.asname or alias.name.split(".")[0], None, "import")
+
+    visit_ImportFrom = visit_Import
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        self.visit(node.value)
+        self.attr_names.add(node.attr)
+        self._attributes.append((self._scope, node))
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        self._calls.append((self._scope, node))
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        # getattr(obj, "name"), __all__, __slots__, ...: such names are kept
+        if isinstance(node.value, str) and node.value.isidentifier():
+            self._strings.add(node.value)
+
+    def _def_name(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) -> _Pos | None:
+        body = node.body[0] if node.body else node
+        return self._positions.name_after(node.name, self._positions.of(node), self._positions.of(body))
+
+    # --- resolution ----------------------------------------------------
+
+    def resolve(self, scope: _Scope, name: str, *, outer: bool = False) -> _Symbol | None:
+        """The symbol `name` refers to in scope (outer=True: as a nonlocal of scope)."""
+        current = scope.parent if outer else scope
+        first = not outer
+        while current is not None:
+            if current.kind == "class" and not first:
+                current = current.parent
+                continue
+            declared = current.declared.get(name)
+            if declared == "global":
+                return self.module.symbols.get(name)
+            if declared != "nonlocal" and name in current.symbols:
+                return current.symbols[name]
+            first = False
+            current = current.parent
+        return None
+
+    def _resolve(self) -> None:
+        for scope, name, pos, kind in self._nonlocals:
+            symbol = self.resolve(scope, name, outer=True)
+            if symbol is None or symbol.scope is self.module:
+                continue
+            if pos is None:
+                symbol.keep = True
+            else:
+                symbol.occurrences.add(pos)
+            symbol.ref_scopes.add(scope)
+            if kind != "decl":
+                symbol.loops = None
+
+        for scope, node in self._loads:
+            symbol = self.resolve(scope, node.id)
+            if symbol is None:
+                scope.unresolved.add(node.id)
+                continue
+            symbol.occurrences.add(self._positions.of(node))
+            symbol.ref_scopes.add(scope)
+
+        for scope in self.scopes:
+            if scope.unresolved & _DYNAMIC_LOOKUPS:
+                current: _Scope | None = scope
+                while current is not None:
+                    current.frozen = True
+                    current = current.parent
+
+        for node, scope in self.classes.items():
+            scope.bases = self._class_bases(node, scope)
+
+        unresolved_attrs: set[str] = set()
+        for scope, node in self._attributes:
+            member = self.member(scope, node)
+            if member is None:
+                unresolved_attrs.add(node.attr)
+                continue
+            end = self._positions.end_of(node)
+            member.occurrences.add((end[0], end[1] - len(node.attr)))
+
+        for scope, node in self._calls:
+            self._keyword_occurrences(scope, node)
+
+        for scope in self.scopes:
+            for symbol in scope.symbols.values():
+                if symbol.name in self._strings and scope.kind in ("module", "class"):
+                    symbol.keep = True
+                if scope.kind == "class" and (
+                    scope.bases is None or scope.decorated or symbol.name in unresolved_attrs
+                ):
+                    symbol.keep = True
+
+    def _class_bases(self, node: ast.ClassDef, scope: _Scope) -> list[_Scope] | None:
+        if node.keywords:
+            return None
+        bases: list[_Scope] = []
+        for expr in node.bases:
+            if isinstance(expr, ast.Name):
+                symbol = self.resolve(scope.parent, expr.id)
+                if symbol is None and expr.id == "object":
+                    continue
+                base = symbol.only_def if symbol is not None else None
+                if isinstance(base, ast.ClassDef):
+                    bases.append(self.classes[base])
+                    continue
+            return None
+        return bases
+
+    def lookup(self, klass: _Scope, name: str) -> _Symbol | None:
+        """Member `name` of a class or its first base defining it."""
+        if name in klass.symbols:
+            return klass.symbols[name]
+        for base in klass.bases or ():
+            found = self.lookup(base, name)
+            if found is not None:
+                return found
+        return None
+
+    def member(self, scope: _Scope, node: ast.Attribute) -> _Symbol | None:
+        """The class member an attribute refers to, if its owner is known statically."""
+        value = node.value
+        if isinstance(value, ast.Name):
+            symbol = self.resolve(scope, value.id)
+            if symbol is None:
+                return None
+            if symbol.receiver_of is not None and len(symbol.sites) == 1:
+                return self.lookup(symbol.receiver_of, node.attr)
+            klass = symbol.only_def
+            if isinstance(klass, ast.ClassDef):
+                return self.lookup(self.classes[klass], node.attr)
+            return None
+        if not isinstance(value, ast.Call) or not isinstance(value.func, ast.Name):
+            return None
+        called = self.resolve(scope, value.func.id)
+        if called is not None:
+            # a fresh instance: Class(...).attr
+            klass = called.only_def
+            if isinstance(klass, ast.ClassDef):
+                return self.lookup(self.classes[klass], node.attr)
+            return None
+        if value.func.id == "super" and not value.args:
+            method = scope
+            while method.kind == "comprehension" and method.parent is not None:
+                method = method.parent
+            owner = method.parent
+            if method.kind != "function" or owner is None or owner.kind != "class":
+                return None
+            for base in owner.bases or ():
+                found = self.lookup(base, node.attr)
+                if found is not None:
+                    return found
+        return None
+
+    def _keyword_occurrences(self, scope: _Scope, node: ast.Call) -> None:
+        keywords = [k for k in node.keywords if k.arg is not None]
+        if not keywords:
+            return
+        function: _Scope | None = None
+        callee: _Symbol | None = None
+        if isinstance(node.func, ast.Name):
+            callee = self.resolve(scope, node.func.id)
+        elif isinstance(node.func, ast.Attribute):
+            callee = self.member(scope, node.func)
+        target = callee.only_def if callee is not None else None
+        if isinstance(target, ast.ClassDef):
+            init = self.lookup(self.classes[target], "__init__")
+            target = init.only_def if init is not None else None
+        if target is not None:
+            function = self.functions.get(target)
+
+        if function is None:
+            # an unknown callee may still be a function of this module: keep its keywords
+            name = _callee_name(node.func)
+            for other in self.functions.values():
+                if name is not None and other.node.name == name:
+                    for keyword in keywords:
+                        if keyword.arg in other.symbols:
+                            other.symbols[keyword.arg].keep = True
+            return
+
+        for keyword in keywords:
+            param = function.symbols.get(keyword.arg)
+            if param is not None and any(kind == "param" for _, kind in param.sites):
+                param.occurrences.add(self._positions.of(keyword))
+
+
+class _RenamePlan:
+    """Chooses new names for the symbols the violations point at, without changing what any name refers to."""
+
+    def __init__(self, table: _SymbolTable) -> None:
+        self._table = table
+        self._groups = self._member_groups()
+        # builtins and unknown names used in a scope or any scope nested in it
+        self._unresolved_within = {scope: set(scope.unresolved) for scope in table.scopes}
+        for scope in reversed(table.scopes):
+            if scope.parent is not None:
+                self._unresolved_within[scope.parent] |= self._unresolved_within[scope]
+        self._class_names: set[str] = {n for s in table.scopes if s.kind == "class" for n in s.symbols}
+
+    def plan(self, violations: list[Violation]) -> list[_Symbol]:
+        requests = sorted(violations, key=lambda v: (_PRIORITY.get(v.code, 3), v.line, v.col))
+        targets = [(v, self._symbol_for(v)) for v in requests]
+        flagged: set[_Pos] = set()
+        for v, symbol in targets:
+            if symbol is not None:
+                flagged.add(symbol.sites[0][0] if v.code == "NNO210" else (v.line, v.col))
+        decided: set[_Symbol] = set()
+        renamed: list[_Symbol] = []
+        for v, symbol in targets:
+            if symbol is None or symbol in decided:
+                continue
+            group = self._groups.get(symbol, [symbol])
+            decided.update(group)
+            # a name that is valid somewhere (e.g. a parameter reassigned in the body,
+            # a member overridden by a valid one) would only be broken by the rename
+            if any(site not in flagged for member in group for site, kind in member.sites if kind in _CHECKED):
+                continue
+            for candidate in self._candidates(v, symbol):
+                if self._can_rename(group, candidate):
+                    self._rename(group, candidate)
+                    renamed.extend(group)
+                    break
+        return renamed
+
+    def _symbol_for(self, v: Violation) -> _Symbol | None:
+        found = self._table.sites.get((v.line, v.col), [])
+        if v.code == "NNO210":
+            function = self._function_at(v)
+            return function.first_param if function is not None else None
+        name = dict(v.args).get("name")
+        for symbol in found:
+            if v.code in ("NNO105", "NNO106", "NNO107"):
+                if isinstance(symbol.only_def, ast.ClassDef):
+                    return symbol
+            elif symbol.name == name:
+                return symbol
+        return None
+
+    def _function_at(self, v: Violation) -> _Scope | None:
+        return self._table.function_sites.get((v.line, v.col))
+
+    def _candidates(self, v: Violation, symbol: _Symbol) -> list[str]:
+        args = dict(v.args)
+        if v.code == "NNO210":
+            function = self._function_at(v)
+            klass = function.klass if function is not None else None
+            owner = self._class_symbol(klass)
+            if owner is None or not is_class_name(owner.new_name):
+                return []
+            return [expected_receiver_name(owner.new_name)]
+        if v.code == "NNO110":
+            if ((v.line, v.col), "iter") in symbol.sites:
+                return [args["expected"]]
+            # unpacked targets only need to look like iterators
+            return ["n" * depth for depth in range(1, 9)]
+        if v.code == "NNO201" and args["expected"] == "n<posint>":
+            return [f"n{index}" for index in range(1, 33)]
+        if v.code == "NNO107" and v.suggest == args.get("expected"):
+            return []
+        return [v.suggest] if v.suggest else []
+
+    def _class_symbol(self, klass: _Scope | None) -> _Symbol | None:
+        if klass is None or klass.parent is None:
+            return None
+        return klass.parent.symbols.get(klass.node.name)
+
+    def _member_groups(self) -> dict[_Symbol, list[_Symbol]]:
+        """
+        Members and the base members they override, which must keep one name,
+        and likewise the same-named parameters of overriding methods.
+        """
+        groups: dict[_Symbol, list[_Symbol]] = {}
+
+        def merge(symbol: _Symbol, other: _Symbol) -> None:
+            merged = groups.get(symbol, [symbol])
+            for member in groups.get(other, [other]):
+                if member not in merged:
+                    merged.append(member)
+            for member in merged:
+                groups[member] = merged
+
+        for klass in self._table.classes.values():
+            for symbol in klass.symbols.values():
+                for base in klass.bases or ():
+                    overridden = self._table.lookup(base, symbol.name)
+                    if overridden is not None:
+                        merge(symbol, overridden)
+
+        for members in list(groups.values()):
+            params: dict[str, _Symbol] = {}
+            for member in members:
+                function = self._table.functions.get(member.only_def)
+                for name, symbol in function.symbols.items() if function is not None else ():
+                    if symbol is function.first_param or not any(kind == "param" for _, kind in symbol.sites):
+                        continue
+                    if name in params:
+                        merge(symbol, params[name])
+                    else:
+                        params[name] = symbol
+        return groups
+
+    def _can_rename(self, group: list[_Symbol], new: str) -> bool:
+        for symbol in group:
+            scope = symbol.scope
+            if symbol.keep or scope.frozen or new == symbol.name or _is_dunder(symbol.name):
+                return False
+            if not (scope.receiver and symbol is scope.first_param) and self._opaque_param(symbol):
+                return False
+            if scope.kind == "class" and (new in self._table.attr_names or new in self._class_names):
+                return False
+            for other in scope.names_after.get(new, ()):
+                if other is not symbol and not _can_share(symbol, other):
+                    return False
+            if new in self._unresolved_within[scope]:
+                return False
+            # an outer `new` used in here would be captured
+            outer = scope.parent
+            while outer is not None:
+                for other in outer.names_after.get(new, ()):
+                    if any(ref.within(scope) for ref in other.ref_scopes):
+                        return False
+                outer = outer.parent
+            # uses of the symbol from nested scopes that bind `new` themselves
+            for ref in symbol.ref_scopes:
+                inner: _Scope | None = ref
+                while inner is not None and inner is not scope:
+                    if inner.names_after.get(new):
+                        return False
+                    inner = inner.parent
+        return True
+
+    def _opaque_param(self, symbol: _Symbol) -> bool:
+        # parameters callers outside the module may pass by keyword
+        scope = symbol.scope
+        if scope.kind != "function" or not any(kind == "param" for _, kind in symbol.sites):
+            return False
+        if scope.decorated:
+            return True
+        owner = scope.parent
+        return owner is not None and owner.kind == "class" and (owner.bases is None or owner.decorated)
+
+    def _rename(self, group: list[_Symbol], new: str) -> None:
+        for symbol in group:
+            names = symbol.scope.names_after
+            names[symbol.name] = [s for s in names.get(symbol.name, ()) if s is not symbol]
+            names.setdefault(new, []).append(symbol)
+            symbol.new_name = new
+            if symbol.scope.kind == "class":
+                self._class_names.add(new)
+
+
+def _can_share(symbol: _Symbol, other: _Symbol) -> bool:
+    """Loop variables only used inside their own, disjoint loops (and no closure) may have one name."""
+    if not symbol.loops or not other.loops:
+        return False
+    if symbol.ref_scopes - {symbol.scope} or other.ref_scopes - {other.scope}:
+        return False
+    if not _inside_loops(symbol) or not _inside_loops(other):
+        return False
+    return all(a[1] <= b[0] or b[1] <= a[0] for a in symbol.loops for b in other.loops)
+
+
+def _inside_loops(symbol: _Symbol) -> bool:
+    return all(any(start <= pos < end for start, end in symbol.loops) for pos in symbol.occurrences)
+
+
+def _site(node: ast.AST) -> _Pos:
+    return (node.lineno, node.col_offset)
+
+
+def _all_args(args: ast.arguments) -> list[ast.arg]:
+    out = list(args.posonlyargs) + list(args.args)
+    if args.vararg is not None:
+        out.append(args.vararg)
+    out.extend(args.kwonlyargs)
+    if args.kwarg is not None:
+        out.append(args.kwarg)
+    return out
+
+
+def _callee_name(expr: ast.AST) -> str | None:
+    if isinstance(expr, ast.Name):
+        return expr.id
+    if isinstance(expr, ast.Attribute):
+        return expr.attr
+    return None
+
+
+def _decorator_name(expr: ast.AST) -> str | None:
+    return _callee_name(expr.func if isinstance(expr, ast.Call) else expr)
+
+
+def _transparent(decorators: list[ast.expr]) -> bool:
+    return all(_decorator_name(d) in _TRANSPARENT_DECORATORS for d in decorators)
+
+
+def _has_decorator(node: ast.FunctionDef | ast.AsyncFunctionDef, name: str) -> bool:
+    return any(_decorator_name(d) == name for d in node.decorator_list)
+
+
+def _is_dunder(name: str) -> bool:
+    return len(name) > 4 and name.startswith("__") and name.endswith("__")
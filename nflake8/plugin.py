@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import atexit
+import multiprocessing
+import os
+import sys
 from functools import lru_cache
 from importlib import resources
 from typing import Iterable
 
 from . import __version__
-from .checks.ast import run_ast_checks
 from .checks.project import run_project_checks
-from .checks.tokens import run_token_checks
+from .core.cache import ResultCache, cache_key
+from .core.errors import ALL_CODES
+from .core.ids import disable_id_ledger, enable_id_ledger, get_ledger_dir
+from .core.index import SymbolIndex, get_symbol_index
+from .core.profile import checkpoint, collect, disable_profiling, enable_profiling, timed
+from .core.root import configure_run, find_project_root
+from .core.source import read_lines
+from .core.runs import default_runs_dir, end_run, start_run
+from .core.types import Violation
+from .rules.registry import get_rule_set
+from .runner import _is_suppressed, check_source
 
 
 @lru_cache(maxsize=1)
@@ -20,14 +33,70 @@ def _load_phasalo_art() -> str:
     )
 
 
+def _uses_multiple_jobs(options) -> bool:
+    """
+    Whether flake8 will check files on more than one worker process: --jobs
+    (auto is the CPU count) above 1 and more than one file, as flake8 itself
+    checks a single file or stdin in the main process.
+    """
+    jobs = getattr(options, "jobs", None)
+    if jobs is None:
+        return False
+    if getattr(jobs, "is_auto", False):
+        n_jobs = multiprocessing.cpu_count()
+    else:
+        try:
+            n_jobs = int(getattr(jobs, "n_jobs", jobs))
+        except (TypeError, ValueError):
+            return False
+    if n_jobs <= 1:
+        return False
+    filenames = getattr(options, "filenames", None) or ["."]
+    if "-" in filenames:
+        return False
+    return len(filenames) > 1 or os.path.isdir(filenames[0])
+
+
+def _enabled_codes(options) -> frozenset[str] | None:
+    """
+    Codes flake8 will report with these options (--select, --ignore and their
+    extend- variants), or None when that cannot be decided here. Rules and check
+    layers that cannot emit any of them are not run.
+    """
+    try:
+        from flake8.style_guide import Decision, DecisionEngine
+
+        engine = DecisionEngine(options)
+        return frozenset(code for code in ALL_CODES if engine.decision_for(code) is Decision.Selected)
+    except (ImportError, AttributeError, TypeError):
+        return None
+
+
+def _report_profile(json_path: str | None) -> None:
+    profile = collect()
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write(profile.to_json() + "\n")
+    else:
+        sys.stderr.write(profile.format_summary())
+
+
 class NNotationChecker:
     name = "n-notation"
     version = __version__
 
-    def __init__(self, tree, filename: str, lines=None):
+    _cache: ResultCache | None = None
+    _suggestions: bool = True
+    _enabled_codes: frozenset[str] | None = None
+    _noqa: bool = True
+    _symbol_index: bool = False
+    _index_dir: str | None = None
+
+    def __init__(self, tree, filename: str, lines=None, file_tokens=None):
         self._tree = tree
         self._filename = filename
         self._lines = lines
+        self._file_tokens = file_tokens
 
     @classmethod
     def add_options(cls, parser) -> None:
@@ -37,6 +106,44 @@ class NNotationChecker:
             action="store_true",
             help="Print PHASALO ascii art and exit.",
         )
+        parser.add_option(
+            "--nno-cache-dir",
+            default=None,
+            parse_from_config=True,
+            help="Directory for the N notation result cache (disabled by default).",
+        )
+        parser.add_option(
+            "--nno-cache-max-entries",
+            default=10000,
+            type=int,
+            parse_from_config=True,
+            help="Maximum number of files kept in the N notation result cache.",
+        )
+        parser.add_option(
+            "--nno-symbol-index",
+            default=False,
+            action="store_true",
+            parse_from_config=True,
+            help="Check from-imports of project modules against a project-wide index of their names (NNO304).",
+        )
+        parser.add_option(
+            "--nno-id-ledger",
+            default=False,
+            action="store_true",
+            parse_from_config=True,
+            help="Give suggested names ids that are unique in the project, recorded in a ledger between runs.",
+        )
+        parser.add_option(
+            "--nno-profile",
+            default=False,
+            action="store_true",
+            help="Print time, calls and violations per N notation rule and check layer at exit.",
+        )
+        parser.add_option(
+            "--nno-profile-json",
+            default=None,
+            help="Write the N notation profile as JSON to this file instead of printing it.",
+        )
 
     @classmethod
     def parse_options(cls, options) -> None:
@@ -45,26 +152,137 @@ class NNotationChecker:
             print(_load_phasalo_art(), end="")
             raise SystemExit(0)
 
-    def _read_text(self) -> str:
+        # flake8 -q only prints filenames; do not build suggested names for it
+        cls._suggestions = not getattr(options, "quiet", 0)
+        cls._enabled_codes = _enabled_codes(options)
+        cls._noqa = not getattr(options, "disable_noqa", False)
+
+        cache_dir = getattr(options, "nno_cache_dir", None)
+        if cache_dir:
+            cls._cache = ResultCache(
+                cache_dir,
+                max_entries=getattr(options, "nno_cache_max_entries", 10000),
+            )
+        else:
+            cls._cache = None
+
+        # the index lives next to the result cache, or in the temp directory;
+        # the one of the current project is brought up to date before workers start
+        cls._symbol_index = bool(getattr(options, "nno_symbol_index", False))
+        cls._index_dir = os.path.join(cache_dir, "index") if cache_dir else None
+        if cls._symbol_index:
+            root = find_project_root(os.path.join(os.getcwd(), "__init__.py"))
+            if root is not None:
+                get_symbol_index(root, directory=cls._index_dir)
+        if getattr(options, "nno_id_ledger", False):
+            enable_id_ledger(cls._index_dir)
+        else:
+            disable_id_ledger()
+
+        profile_json = getattr(options, "nno_profile_json", None)
+        profiling = bool(getattr(options, "nno_profile", False) or profile_json)
+
+        # NNO500 must be reported once per root, not once per --jobs worker;
+        # the same run directory collects the workers' profiles
+        run_dir: str | None = None
+        if _uses_multiple_jobs(options):
+            runs_dir = os.path.join(cache_dir, "runs") if cache_dir else default_runs_dir()
+            try:
+                run_dir = start_run(runs_dir)
+            except OSError:
+                run_dir = None
+            if run_dir is not None and multiprocessing.parent_process() is None:
+                # registered first, so it runs after the profile report
+                atexit.register(end_run, run_dir)
+        configure_run(run_dir)
+
+        if profiling:
+            enable_profiling(run_dir)
+            if multiprocessing.parent_process() is None:
+                atexit.register(_report_profile, profile_json)
+        else:
+            disable_profiling()
+
+    @classmethod
+    def _cache_settings(cls) -> dict[str, object]:
+        codes = cls._enabled_codes
+        settings: dict[str, object] = {
+            "rules": [type(rule).__name__ for rule in get_rule_set(codes).rules],
+            "codes": None if codes is None else sorted(codes),
+        }
+        if get_ledger_dir() is not None:
+            # suggested ids come from the ledger instead of hashes
+            settings["id_ledger"] = True
+        return settings
+
+    def _read_lines(self) -> list[str]:
+        # flake8's lines are used as they are: no joined copy of the file
         if self._lines is not None:
-            return "".join(self._lines)
-        try:
-            with open(self._filename, "r", encoding="utf-8") as f:
-                return f.read()
-        except OSError:
-            return ""
+            return self._lines
+        return read_lines(self._filename)
 
     def run(self) -> Iterable[tuple[int, int, str, type]]:
         # Project checks
-        for v in run_project_checks(filename=self._filename):
-            yield v.to_flake8(type(self))
-
-        # AST checks
-        if self._tree is not None:
-            for v in run_ast_checks(tree=self._tree, filename=self._filename):
-                yield v.to_flake8(type(self))
-
-        # Token checks
-        text = self._read_text()
-        for v in run_token_checks(text=text, filename=self._filename):
-            yield v.to_flake8(type(self))
+        project = timed("layer:project", run_project_checks, filename=self._filename, codes=self._enabled_codes)
+        yield from self._report(project)
+
+        # AST + token checks, replayed from the cache when the file is unchanged
+        yield from self._report(self._run_file_checks())
+
+        checkpoint()
+
+    def _report(self, violations: list[Violation]) -> Iterable[tuple[int, int, str, type]]:
+        # flake8 would drop deselected and noqa'd results after formatting them;
+        # drop them here so their messages are never built
+        enabled = self._enabled_codes
+        lines = self._lines if self._noqa else None
+        plugin_type = type(self)
+        for v in violations:
+            if enabled is not None and v.code not in enabled:
+                continue
+            if lines and 1 <= v.line <= len(lines) and _is_suppressed(v.code, lines[v.line - 1]):
+                continue
+            yield v.to_flake8(plugin_type, with_suggestion=self._suggestions)
+
+    def _get_symbol_index(self) -> SymbolIndex | None:
+        cls = type(self)
+        if not cls._symbol_index:
+            return None
+        root = find_project_root(self._filename)
+        if root is None:
+            return None
+        return get_symbol_index(root, directory=cls._index_dir)
+
+    def _run_file_checks(self) -> list[Violation]:
+        lines = self._read_lines()
+        index = self._get_symbol_index()
+        cache = type(self)._cache
+        if cache is None:
+            return self._check_lines(lines, index)
+
+        settings = self._cache_settings()
+        if index is not None:
+            # results depend on the imported modules only, not on the whole index
+            settings["symbol_index"] = index.dependency_digest(self._filename, self._tree)
+        key = cache_key(
+            content=(line.encode("utf-8", "surrogatepass") for line in lines),
+            filename=self._filename,
+            settings=settings,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        violations = self._check_lines(lines, index)
+        cache.put(key, violations)
+        return violations
+
+    def _check_lines(self, lines: list[str], index: SymbolIndex | None) -> list[Violation]:
+        return check_source(
+            text=lines,
+            filename=self._filename,
+            tree=self._tree,
+            tokens=self._file_tokens,
+            codes=self._enabled_codes,
+            index=index,
+        )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import ast
 
+from ..core.suggestions import Suggestion
 from ..core.types import Violation
 
 
@@ -16,13 +17,18 @@ def violation_at_node(
     code: str,
     message: str,
     *,
+    args: dict[str, str] | None = None,
     prefer_docstring_expr: bool = False,
+    suggest: Suggestion | str | None = None,
 ) -> Violation:
     """
     Create a Violation located at node.lineno/col_offset
 
     If prefer_docstring_expr=True, and node is Module/Class/Function, point to the
     first statement expression (where docstring literal lives).
+
+    `message` is an ErrorCodes template; it is formatted with `args` only when the
+    violation is reported. `suggest` is appended to the message as "(suggest ...)" when it is rendered.
     """
     if prefer_docstring_expr and isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
         if (
@@ -31,10 +37,17 @@ def violation_at_node(
             and isinstance(getattr(node.body[0], "value", None), ast.Constant)
         ):
             if isinstance(node.body[0].value.value, str):
-                return violation_at_node(node.body[0], code, message, prefer_docstring_expr=False)
+                return violation_at_node(node.body[0], code, message, args=args, suggest=suggest)
 
     line, col = node_location(node)
-    return Violation(_line=line, _col=col, _code=code, _message=message)
+    return Violation(
+        _line=line,
+        _col=col,
+        _code=code,
+        _message=message,
+        _args=tuple(args.items()) if args else (),
+        _suggest=suggest,
+    )
 
 
 def has_decorator(node: ast.FunctionDef | ast.AsyncFunctionDef, name: str) -> bool:
@@ -13,6 +13,12 @@ class Source:
     _current_class: ast.ClassDef | None
     _tree: ast.AST
     _filename: str
+    _is_class_body_stmt: bool = False
+    _loop_depth: int = 0
+    _generator_index: int = 0
+    _scope: str = ""
+    # names declared `global`/`nonlocal` in the scope -> the scope that binds them
+    _declared: dict[str, str] | None = None
 
     @property
     def node(self) -> ast.AST:
@@ -30,10 +36,47 @@ class Source:
     def filename(self) -> str:
         return self._filename
 
+    @property
+    def is_class_body_stmt(self) -> bool:
+        """True when node is a statement directly in current_class.body."""
+        return self._is_class_body_stmt
+
+    @property
+    def loop_depth(self) -> int:
+        """Number of for/async for loops enclosing node."""
+        return self._loop_depth
+
+    @property
+    def generator_index(self) -> int:
+        """Position of a comprehension node in its parent's generators."""
+        return self._generator_index
+
+    @property
+    def scope(self) -> str:
+        """Dotted names of the functions and classes enclosing node ("" at module level)."""
+        return self._scope
+
+    def scope_for(self, name: str) -> str:
+        """The scope a binding of name here belongs to: the declaring one for `global`/`nonlocal` names."""
+        if self._declared is not None:
+            return self._declared.get(name, self._scope)
+        return self._scope
+
+    def scope_of(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) -> str:
+        """The scope of the names bound inside node (its parameters, its body)."""
+        return f"{self._scope}.{node.name}" if self._scope else node.name
+
 
 class Rule(Protocol):
     """Protocol for N-notation rules analysis."""
 
+    node_types: tuple[type[ast.AST], ...]
+    codes: frozenset[str]
+
     def check(self, source: Source) -> list[Violation]:
         """Check source for violations and return list of detected violations."""
         ...
+
+    def reset(self) -> None:
+        """Drop per-file state before the next file is checked."""
+        return None
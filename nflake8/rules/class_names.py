@@ -4,18 +4,17 @@ import ast
 
 from ..core.errors import ErrorCodes
 from ..core.patterns import expected_direct_base_name, is_class_name, is_derived_class_name
-from ..core.suggestions import (
-    format_with_suggestion,
-    suggest_class_name,
-    suggest_derived_class_suffix,
-)
+from ..core.suggestions import Suggestion, suggestion
 from ..core.types import Violation
 from .ast_utils import node_location, violation_at_node
 from .base import Rule, Source
 
 
 class ClassNames(Rule):
-    """Validate class names and derived-class base chain (NNO106, NNO107)."""
+    """Validate class names and derived-class base chain (NNO105, NNO106, NNO107)."""
+
+    codes = frozenset({"NNO105", "NNO106", "NNO107"})
+    node_types = (ast.ClassDef,)
 
     def check(self, source: Source) -> list[Violation]:
         node = source.node
@@ -31,9 +30,15 @@ class ClassNames(Rule):
                 violation_at_node(
                     node,
                     "NNO106",
-                    format_with_suggestion(
-                        ErrorCodes.NNO106.format(name=node.name),
-                        suggest=suggest_class_name(filename=source.filename, line=line, col=col),
+                    ErrorCodes.NNO106,
+                    args={"name": node.name},
+                    suggest=suggestion(
+                        "class",
+                        filename=source.filename,
+                        line=line,
+                        col=col,
+                        name=node.name,
+                        scope=source.scope_for(node.name),
                     ),
                 )
             )
@@ -45,29 +50,31 @@ class ClassNames(Rule):
                 if is_class_name(base_name):
                     direct_base = base_name
 
-            suggested_root = direct_base
-            if suggested_root is None:
-                suggested_root = suggest_class_name(
-                    filename=source.filename,
-                    line=line,
-                    col=col,
-                )
-
-            suggested_suffix = suggest_derived_class_suffix(
+            suggested_root: str | Suggestion = direct_base or suggestion(
+                "class",
+                filename=source.filename,
+                line=line,
+                col=col,
+                name=node.name,
+                scope=source.scope_for(node.name),
+            )
+            suggested = suggestion(
+                "derived",
                 filename=source.filename,
                 line=line,
                 col=col,
+                head=suggested_root,
+                name=node.name,
+                scope=source.scope_for(node.name),
             )
-            suggested = suggested_root + suggested_suffix
 
             violations.append(
                 violation_at_node(
                     node,
                     "NNO105",
-                    format_with_suggestion(
-                        ErrorCodes.NNO105.format(name=node.name),
-                        suggest=suggested,
-                    ),
+                    ErrorCodes.NNO105,
+                    args={"name": node.name},
+                    suggest=suggested,
                 )
             )
             return violations
@@ -91,10 +98,9 @@ class ClassNames(Rule):
                         violation_at_node(
                             node,
                             "NNO107",
-                            format_with_suggestion(
-                                ErrorCodes.NNO107.format(expected=expected_base),
-                                suggest=suggest_value,
-                            ),
+                            ErrorCodes.NNO107,
+                            args={"expected": expected_base},
+                            suggest=suggest_value,
                         )
                     )
 
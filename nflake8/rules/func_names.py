@@ -4,7 +4,7 @@ import ast
 
 from ..core.errors import ErrorCodes
 from ..core.patterns import is_func_name
-from ..core.suggestions import format_with_suggestion, suggest_func_name
+from ..core.suggestions import suggestion
 from ..core.types import Violation
 from .ast_utils import node_location, violation_at_node
 from .base import Rule, Source
@@ -13,6 +13,9 @@ from .base import Rule, Source
 class FuncNames(Rule):
     """Validate non-method function names (NNO104)."""
 
+    codes = frozenset({"NNO104"})
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
     def check(self, source: Source) -> list[Violation]:
         node = source.node
 
@@ -31,9 +34,15 @@ class FuncNames(Rule):
             violation_at_node(
                 node,
                 "NNO104",
-                format_with_suggestion(
-                    ErrorCodes.NNO104.format(name=node.name),
-                    suggest=suggest_func_name(filename=source.filename, line=line, col=col),
+                ErrorCodes.NNO104,
+                args={"name": node.name},
+                suggest=suggestion(
+                    "func",
+                    filename=source.filename,
+                    line=line,
+                    col=col,
+                    name=node.name,
+                    scope=source.scope_for(node.name),
                 ),
             )
         ]
@@ -4,11 +4,7 @@ import ast
 
 from ..core.errors import ErrorCodes
 from ..core.patterns import is_private_member_name, is_public_member_name
-from ..core.suggestions import (
-    format_with_suggestion,
-    suggest_private_member_name,
-    suggest_public_member_name,
-)
+from ..core.suggestions import suggestion
 from ..core.types import Violation
 from .ast_utils import node_location, violation_at_node
 from .base import Rule, Source
@@ -37,49 +33,51 @@ def _collect_name_targets(node: ast.AST) -> list[ast.Name]:
     return []
 
 
-def _is_direct_class_body_stmt(node: ast.AST, current_class: ast.ClassDef | None) -> bool:
-    if current_class is None:
-        return False
-    return any(stmt is node for stmt in current_class.body)
-
-
 class MemberNames(Rule):
     """Validate class members names: n_<...> / _n<...> (NNO108, NNO109)."""
 
+    codes = frozenset({"NNO108", "NNO109"})
+    node_types = (
+        ast.FunctionDef,
+        ast.AsyncFunctionDef,
+        ast.Assign,
+        ast.AnnAssign,
+        ast.AugAssign,
+    )
+
     def check(self, source: Source) -> list[Violation]:
         node = source.node
-        current_class = source.current_class
 
-        if current_class is None:
+        if source.current_class is None:
             return []
 
-        if not _is_direct_class_body_stmt(node, current_class):
+        if not source.is_class_body_stmt:
             return []
 
         # Methods
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            return self._check_member_name(node, node.name, filename=source.filename)
+            return self._check_member_name(node, node.name, filename=source.filename, scope=source.scope)
 
         # Class attributes (incl annotated / augmented)
         if isinstance(node, ast.Assign):
-            return self._check_member_targets(node.targets, filename=source.filename)
+            return self._check_member_targets(node.targets, filename=source.filename, scope=source.scope)
 
         if isinstance(node, ast.AnnAssign):
-            return self._check_member_targets([node.target], filename=source.filename)
+            return self._check_member_targets([node.target], filename=source.filename, scope=source.scope)
 
         if isinstance(node, ast.AugAssign):
-            return self._check_member_targets([node.target], filename=source.filename)
+            return self._check_member_targets([node.target], filename=source.filename, scope=source.scope)
 
         return []
 
-    def _check_member_targets(self, targets: list[ast.AST], *, filename: str) -> list[Violation]:
+    def _check_member_targets(self, targets: list[ast.AST], *, filename: str, scope: str) -> list[Violation]:
         violations: list[Violation] = []
         for t in targets:
             for name_node in _collect_name_targets(t):
-                violations.extend(self._check_member_name(name_node, name_node.id, filename=filename))
+                violations.extend(self._check_member_name(name_node, name_node.id, filename=filename, scope=scope))
         return violations
 
-    def _check_member_name(self, node: ast.AST, name: str, *, filename: str) -> list[Violation]:
+    def _check_member_name(self, node: ast.AST, name: str, *, filename: str, scope: str) -> list[Violation]:
         line, col = node_location(node)
 
         if name.startswith("_"):
@@ -89,9 +87,10 @@ class MemberNames(Rule):
                 violation_at_node(
                     node,
                     "NNO109",
-                    format_with_suggestion(
-                        ErrorCodes.NNO109.format(name=name),
-                        suggest=suggest_private_member_name(filename=filename, line=line, col=col),
+                    ErrorCodes.NNO109,
+                    args={"name": name},
+                    suggest=suggestion(
+                        "member_private", filename=filename, line=line, col=col, name=name, scope=scope
                     ),
                 )
             ]
@@ -103,9 +102,8 @@ class MemberNames(Rule):
             violation_at_node(
                 node,
                 "NNO108",
-                format_with_suggestion(
-                    ErrorCodes.NNO108.format(name=name),
-                    suggest=suggest_public_member_name(filename=filename, line=line, col=col),
-                ),
+                ErrorCodes.NNO108,
+                args={"name": name},
+                suggest=suggestion("member_public", filename=filename, line=line, col=col, name=name, scope=scope),
             )
         ]
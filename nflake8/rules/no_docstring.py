@@ -11,6 +11,9 @@ from .base import Rule, Source
 class NoDocstring(Rule):
     """Forbid module/class/function docstrings (NNO602)."""
 
+    codes = frozenset({"NNO602"})
+    node_types = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
     def check(self, source: Source) -> list[Violation]:
         node = source.node
         if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
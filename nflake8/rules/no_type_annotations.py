@@ -11,6 +11,9 @@ from .base import Rule, Source
 class NoTypeAnnotations(Rule):
     """Forbid ALL type annotations (vars + args + return) (NNO701)"""
 
+    codes = frozenset({"NNO701"})
+    node_types = (ast.AnnAssign, ast.FunctionDef, ast.AsyncFunctionDef)
+
     def check(self, source: Source) -> list[Violation]:
         node = source.node
 
@@ -4,7 +4,7 @@ import ast
 
 from ..core.errors import ErrorCodes
 from ..core.patterns import is_required_param_name, is_var_name
-from ..core.suggestions import format_with_suggestion, suggest_optional_param_name
+from ..core.suggestions import suggestion
 from ..core.types import Violation
 from .ast_utils import has_decorator, node_location, violation_at_node
 from .base import Rule, Source
@@ -13,6 +13,9 @@ from .base import Rule, Source
 class ParamNames(Rule):
     """Validate function/method parameter names (NNO201, NNO202)."""
 
+    codes = frozenset({"NNO201", "NNO202"})
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
     def check(self, source: Source) -> list[Violation]:
         node = source.node
         if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
@@ -25,6 +28,7 @@ class ParamNames(Rule):
         )
 
         violations: list[Violation] = []
+        scope = source.scope_of(node)
 
         # Positional params: posonlyargs + args
         pos_params: list[ast.arg] = list(args.posonlyargs) + list(args.args)
@@ -42,6 +46,7 @@ class ParamNames(Rule):
                 self._check_one_param(
                     a,
                     filename=source.filename,
+                    scope=scope,
                     is_required=is_required,
                     expected_required=expected_required,
                 )
@@ -51,13 +56,17 @@ class ParamNames(Rule):
         kw_defaults = list(args.kw_defaults or [])
         for a, d in zip(list(args.kwonlyargs), kw_defaults):
             is_required = d is None
-            violations.extend(self._check_one_param(a, filename=source.filename, is_required=is_required))
+            violations.extend(self._check_one_param(a, filename=source.filename, scope=scope, is_required=is_required))
 
         # *args / **kwargs are always optional-like
         if args.vararg is not None:
-            violations.extend(self._check_one_param(args.vararg, filename=source.filename, is_required=False))
+            violations.extend(
+                self._check_one_param(args.vararg, filename=source.filename, scope=scope, is_required=False)
+            )
         if args.kwarg is not None:
-            violations.extend(self._check_one_param(args.kwarg, filename=source.filename, is_required=False))
+            violations.extend(
+                self._check_one_param(args.kwarg, filename=source.filename, scope=scope, is_required=False)
+            )
 
         return violations
 
@@ -66,6 +75,7 @@ class ParamNames(Rule):
         node: ast.arg,
         *,
         filename: str,
+        scope: str,
         is_required: bool,
         expected_required: str | None = None,
     ) -> list[Violation]:
@@ -87,10 +97,9 @@ class ParamNames(Rule):
                 violation_at_node(
                     node,
                     "NNO201",
-                    format_with_suggestion(
-                        ErrorCodes.NNO201.format(expected=expected, name=name),
-                        suggest=suggested,
-                    ),
+                    ErrorCodes.NNO201,
+                    args={"expected": expected, "name": name},
+                    suggest=suggested,
                 )
             ]
 
@@ -102,9 +111,8 @@ class ParamNames(Rule):
             violation_at_node(
                 node,
                 "NNO202",
-                format_with_suggestion(
-                    ErrorCodes.NNO202.format(name=name),
-                    suggest=suggest_optional_param_name(filename=filename, line=line, col=col),
-                ),
+                ErrorCodes.NNO202,
+                args={"name": name},
+                suggest=suggestion("var", filename=filename, line=line, col=col, name=name, scope=scope),
             )
         ]
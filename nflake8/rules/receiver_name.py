@@ -4,7 +4,6 @@ import ast
 
 from ..core.errors import ErrorCodes
 from ..core.patterns import expected_receiver_name
-from ..core.suggestions import format_with_suggestion
 from ..core.types import Violation
 from .ast_utils import first_positional_arg, has_decorator, violation_at_node
 from .base import Rule, Source
@@ -13,6 +12,9 @@ from .base import Rule, Source
 class ReceiverName(Rule):
     """Validate method receiver name (NNO210)"""
 
+    codes = frozenset({"NNO210"})
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
     def check(self, source: Source) -> list[Violation]:
         node = source.node
         current_class = source.current_class
@@ -37,9 +39,8 @@ class ReceiverName(Rule):
             violation_at_node(
                 node,
                 "NNO210",
-                format_with_suggestion(
-                    ErrorCodes.NNO210.format(expected=expected, name=got),
-                    suggest=expected,
-                ),
+                ErrorCodes.NNO210,
+                args={"expected": expected, "name": got},
+                suggest=expected,
             )
         ]
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import ast
+from functools import lru_cache
+
 from .base import Rule
 from .class_names import ClassNames
 from .func_names import FuncNames
@@ -22,3 +25,54 @@ def get_all_rules() -> list[Rule]:
         ReceiverName(),
         VarNames(),
     ]
+
+
+def build_dispatch_table(rules: list[Rule]) -> dict[type[ast.AST], tuple[Rule, ...]]:
+    table: dict[type[ast.AST], list[Rule]] = {}
+    for rule in rules:
+        for node_type in rule.node_types:
+            table.setdefault(node_type, []).append(rule)
+    return {node_type: tuple(bucket) for node_type, bucket in table.items()}
+
+
+class RuleSet:
+    """
+    Rule instances shared by every file checked in this process.
+
+    Lifecycle:
+    - created once per process by get_rule_set();
+    - begin_file() is called before each file, so rules can drop per-file caches.
+    """
+
+    def __init__(self, rules: list[Rule]) -> None:
+        self._rules = tuple(rules)
+        self._dispatch = build_dispatch_table(rules)
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        return self._rules
+
+    @property
+    def dispatch(self) -> dict[type[ast.AST], tuple[Rule, ...]]:
+        return self._dispatch
+
+    def begin_file(self) -> None:
+        for rule in self._rules:
+            rule.reset()
+
+
+def get_rule_set(codes: frozenset[str] | None = None) -> RuleSet:
+    """
+    Shared rule set for this process. With `codes` (the codes flake8 will
+    report), rules that cannot emit any of them are left out.
+    """
+    # one cache key however codes is passed (lru_cache tells get_rule_set() from get_rule_set(None))
+    return _cached_rule_set(codes)
+
+
+@lru_cache(maxsize=8)
+def _cached_rule_set(codes: frozenset[str] | None) -> RuleSet:
+    rules = get_all_rules()
+    if codes is not None:
+        rules = [rule for rule in rules if rule.codes & codes]
+    return RuleSet(rules)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import ast
+import re
+import tokenize
+from typing import Iterable
+
+from .checks.ast import run_ast_checks
+from .checks.project import run_project_checks
+from .checks.tokens import TOKEN_CODES, run_token_checks
+from .core.index import SymbolIndex
+from .core.profile import checkpoint, timed
+from .core.source import SourceText, joined, read_lines
+from .core.types import Violation
+from .rules.registry import get_rule_set
+
+_NOQA_RE = re.compile(
+    r"#\s*noqa(?::[\s]?(?P<codes>[A-Z]+[0-9]+(?:[,\s]+[A-Z]+[0-9]+)*))?",
+    re.IGNORECASE,
+)
+_CODE_SPLIT_RE = re.compile(r"[,\s]+")
+
+
+def check_source(
+    *,
+    text: SourceText,
+    filename: str,
+    tree: ast.AST | None = None,
+    tokens: Iterable[tokenize.TokenInfo] | None = None,
+    codes: frozenset[str] | None = None,
+    index: SymbolIndex | None = None,
+) -> list[Violation]:
+    """
+    AST + token checks for one file (what NNotationChecker runs after project checks).
+
+    With `codes`, only those codes are reported, and rules and layers that cannot
+    emit any of them do not run at all. `index` is the project's symbol index
+    (for NNO304); without it imported names are not looked up.
+    """
+    v: list[Violation] = []
+
+    # AST checks
+    rule_set = get_rule_set(codes)
+    if tree is not None and rule_set.rules:
+        v.extend(timed("layer:ast", run_ast_checks, tree=tree, filename=filename, rule_set=rule_set))
+
+    # Token checks
+    if codes is None or TOKEN_CODES & codes:
+        v.extend(
+            timed(
+                "layer:tokens",
+                run_token_checks,
+                text=text,
+                filename=filename,
+                tree=tree,
+                tokens=tokens,
+                codes=codes,
+                index=index,
+            )
+        )
+
+    if codes is not None:
+        # a rule may emit several codes, only some of them selected
+        v = [x for x in v if x.code in codes]
+    return v
+
+
+def check_file(filename: str) -> list[Violation]:
+    """
+    Run all three check layers on a file outside flake8.
+
+    Mirrors flake8's behaviour where the plugin cannot: unparsable files get a
+    single E999, and `# noqa` comments are honoured.
+    """
+    lines = read_lines(filename)
+    v = timed("layer:project", run_project_checks, filename=filename)
+    v.extend(check_text(text=lines, filename=filename))
+    checkpoint()
+    return filter_noqa(v, lines)
+
+
+def check_text(*, text: SourceText, filename: str, index: SymbolIndex | None = None) -> list[Violation]:
+    """
+    Parse text (a string or its lines) and run the AST + token checks; E999 if
+    it does not parse. Lines are only joined for the parser, not kept joined.
+    """
+    try:
+        tree = ast.parse(joined(text), filename=filename)
+    except (SyntaxError, ValueError) as e:
+        line = getattr(e, "lineno", None) or 1
+        col = max((getattr(e, "offset", None) or 1) - 1, 0)
+        msg = getattr(e, "msg", None) or str(e)
+        return [Violation(_line=line, _col=col, _code="E999", _message=f"{type(e).__name__}: {msg}")]
+
+    return check_source(text=text, filename=filename, tree=tree, index=index)
+
+
+def read_text(filename: str) -> str:
+    return "".join(read_lines(filename))
+
+
+def filter_noqa(violations: list[Violation], lines: list[str]) -> list[Violation]:
+    out: list[Violation] = []
+    for v in violations:
+        if 1 <= v.line <= len(lines) and _is_suppressed(v.code, lines[v.line - 1]):
+            continue
+        out.append(v)
+    return out
+
+
+def _is_suppressed(code: str, line: str) -> bool:
+    if "#" not in line:
+        return False
+    m = _NOQA_RE.search(line)
+    if m is None:
+        return False
+    codes = m.group("codes")
+    if not codes:
+        return True
+    return any(code.startswith(c.upper()) for c in _CODE_SPLIT_RE.split(codes) if c)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from collections import Counter
+from typing import Mapping
+
+
+class ViolationStats:
+    """
+    Violation counts per file and code; totals per code and per directory are
+    derived from them. Stats of separate workers are combined with merge().
+    """
+
+    def __init__(self) -> None:
+        self._files: dict[str, Counter[str]] = {}
+
+    def add(self, filename: str, counts: Mapping[str, int]) -> None:
+        """Record a checked file (also when it has no violations)."""
+        found = self._files.get(filename)
+        if found is None:
+            self._files[filename] = Counter(counts)
+        else:
+            found.update(counts)
+
+    def merge(self, other: ViolationStats) -> None:
+        for filename, counts in other._files.items():
+            self.add(filename, counts)
+
+    @property
+    def files(self) -> int:
+        """Number of files checked."""
+        return len(self._files)
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_code().values())
+
+    def by_file(self) -> dict[str, Counter[str]]:
+        return {filename: counts for filename, counts in self._files.items() if counts}
+
+    def by_code(self) -> Counter[str]:
+        out: Counter[str] = Counter()
+        for counts in self._files.values():
+            out.update(counts)
+        return out
+
+    def by_directory(self) -> dict[str, Counter[str]]:
+        """Counts per directory of the files (not including subdirectories)."""
+        out: dict[str, Counter[str]] = {}
+        for filename, counts in self._files.items():
+            if counts:
+                out.setdefault(os.path.dirname(filename) or ".", Counter()).update(counts)
+        return out
+
+    def to_json(self) -> str:
+        data = {
+            "files": self.files,
+            "total": self.total,
+            "by_code": _sorted_counts(self.by_code()),
+            "by_directory": {path: _sorted_counts(c) for path, c in sorted(self.by_directory().items())},
+            "by_file": {path: _sorted_counts(c) for path, c in sorted(self.by_file().items())},
+        }
+        return json.dumps(data, indent=2)
+
+    def to_csv(self) -> str:
+        """Rows of scope (code, directory, file), path, code, count."""
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(["scope", "path", "code", "count"])
+        for code, count in _sorted_counts(self.by_code()).items():
+            writer.writerow(["code", "", code, count])
+        for scope, groups in (("directory", self.by_directory()), ("file", self.by_file())):
+            for path, counts in sorted(groups.items()):
+                for code, count in _sorted_counts(counts).items():
+                    writer.writerow([scope, path, code, count])
+        return out.getvalue()
+
+
+def _sorted_counts(counts: Mapping[str, int]) -> dict[str, int]:
+    return {code: counts[code] for code in sorted(counts)}
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import ast
+import os
 from dataclasses import dataclass
 
-from nflake8.rules.base import Rule, Source
+from nflake8.checks.ast import run_ast_checks
+from nflake8.rules.base import Rule
+from nflake8.rules.registry import RuleSet
 from nflake8.core.types import Violation
 
 
@@ -22,31 +25,13 @@ class RunResult:
 
 def run_rule_on_source(rule: Rule, source_text: str, *, filename: str = "n1.py") -> RunResult:
     tree = ast.parse(source_text)
-    violations: list[Violation] = []
-    class_stack: list[ast.ClassDef] = []
-
-    def visit(node: ast.AST) -> None:
-        current_class = class_stack[-1] if class_stack else None
-        violations.extend(
-            rule.check(
-                Source(
-                    _node=node,
-                    _current_class=current_class,
-                    _tree=tree,
-                    _filename=filename,
-                )
-            )
-        )
-
-        if isinstance(node, ast.ClassDef):
-            class_stack.append(node)
-            for child in ast.iter_child_nodes(node):
-                visit(child)
-            class_stack.pop()
-            return
-
-        for child in ast.iter_child_nodes(node):
-            visit(child)
-
-    visit(tree)
+    violations = run_ast_checks(tree=tree, filename=filename, rule_set=RuleSet([rule]))
     return RunResult(_violations=violations)
+
+
+def write_file(path: str, text: str = "") -> str:
+    """Write text to path (creating its directories) and return path."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import ast
+import unittest
+
+from nflake8.checks.ast import run_ast_checks
+from nflake8.rules.registry import RuleSet, build_dispatch_table, get_all_rules
+
+_SOURCE = '''\
+"""doc"""
+import os
+count = 0
+
+
+class Foo(Base):
+    bar: int = 1
+    _baz = 2
+
+    def method(self, a, b=1, *args, **kwargs) -> None:
+        """doc"""
+        for i in range(3):
+            for j in range(3):
+                x = [k for k in range(3) for m in range(2)]
+        with open("x") as f:
+            pass
+        try:
+            pass
+        except Exception as e:
+            pass
+        if (y := 1):
+            pass
+
+
+def helper(x):
+    match x:
+        case [first, *rest]:
+            pass
+        case {"a": value}:
+            pass
+'''
+
+
+def _all_node_types() -> list[type[ast.AST]]:
+    out: list[type[ast.AST]] = []
+    pending: list[type[ast.AST]] = [ast.AST]
+    while pending:
+        cls = pending.pop()
+        out.append(cls)
+        pending.extend(cls.__subclasses__())
+    return out
+
+
+class _EveryNodeRuleSet(RuleSet):
+    """Reference rule set: every rule is offered every node."""
+
+    @property
+    def dispatch(self):
+        return {t: self.rules for t in _all_node_types()}
+
+
+class TestAstDispatch(unittest.TestCase):
+    def test_dispatch_matches_running_every_rule_on_every_node(self) -> None:
+        tree = ast.parse(_SOURCE)
+        reference = run_ast_checks(tree=tree, filename="n1.py", rule_set=_EveryNodeRuleSet(get_all_rules()))
+        expected = [(v.line, v.col, v.code) for v in reference]
+        got = [(v.line, v.col, v.code) for v in run_ast_checks(tree=tree, filename="n1.py")]
+
+        self.assertEqual(sorted(expected), sorted(got))
+
+    def test_dispatch_table_skips_unhandled_node_types(self) -> None:
+        table = build_dispatch_table(get_all_rules())
+        self.assertNotIn(ast.Name, table)
+        self.assertNotIn(ast.Constant, table)
+        self.assertIn(ast.ClassDef, table)
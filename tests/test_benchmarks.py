@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import ast
+import unittest
+
+from benchmarks.__main__ import bench_module
+from benchmarks.corpus import generate_module
+from nflake8.runner import check_source
+
+
+class TestBenchmarkCorpus(unittest.TestCase):
+    def test_generated_sizes_are_close_to_requested(self) -> None:
+        for size in (100, 1000):
+            lines = generate_module(size).count("\n")
+            self.assertGreaterEqual(lines, size)
+            self.assertLess(lines, size + 100)
+
+    def test_n_notation_corpus_is_clean_and_legacy_corpus_is_not(self) -> None:
+        clean = generate_module(300)
+        legacy = generate_module(300, n_notation=False)
+        self.assertEqual(check_source(text=clean, filename="n1.py", tree=ast.parse(clean)), [])
+        self.assertTrue(check_source(text=legacy, filename="n1.py", tree=ast.parse(legacy)))
+
+    def test_bench_module_reports_every_layer_and_rule(self) -> None:
+        rows = bench_module(generate_module(100), filename="n1.py", repeat=1)
+        targets = {row["target"] for row in rows}
+        self.assertTrue({"layer:project", "layer:ast", "layer:tokens", "rule:VarNames"} <= targets)
+        self.assertTrue(all(row["lines_per_second"] for row in rows))
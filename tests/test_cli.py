@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from nflake8.cli import discover_files, main
+from nflake8.core.patterns import README_DECLARATION_BLOCK
+from nflake8.runner import check_file
+from tests.helpers import write_file
+
+
+class TestCli(unittest.TestCase):
+    def test_discover_files_biggest_first_and_skips_excluded(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            small = write_file(os.path.join(root, "n1.py"), "n1234567890 = 1\n")
+            big = write_file(os.path.join(root, "N1", "n2.py"), "n1234567890 = 1\n" * 50)
+            write_file(os.path.join(root, "__pycache__", "n3.py"), "")
+            write_file(os.path.join(root, "n4.txt"), "")
+
+            self.assertEqual(discover_files([root]), [big, small])
+
+    def test_main_prints_flake8_format_and_exit_code(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            write_file(os.path.join(root, "README.md"), README_DECLARATION_BLOCK)
+            path = write_file(os.path.join(root, "n1.py"), "count = 1\n")
+
+            for jobs in ("1", "2"):
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    code = main(["-j", jobs, root])
+                self.assertEqual(code, 1)
+                self.assertTrue(out.getvalue().startswith(f"{path}:1:1: NNO101 var-name invalid got count"))
+
+    def test_noqa_suppresses_codes(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            write_file(os.path.join(root, "README.md"), README_DECLARATION_BLOCK)
+            path = write_file(os.path.join(root, "n1.py"), "count = 1  # noqa: NNO101\nother = 2  # noqa\n")
+            self.assertEqual(check_file(path), [])
+
+    def test_syntax_error_reports_e999(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            write_file(os.path.join(root, "README.md"), README_DECLARATION_BLOCK)
+            path = write_file(os.path.join(root, "n1.py"), "def (:\n")
+            self.assertEqual([v.code for v in check_file(path)], ["E999"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import ast
+import unittest
+from unittest import mock
+
+from nflake8.checks import project, tokens
+from nflake8.checks.project import run_project_checks
+from nflake8.core.errors import ALL_CODES
+from nflake8.rules.registry import get_all_rules, get_rule_set
+from nflake8.runner import check_source
+
+_SRC = "# comment\nimport os\nx = 1\n\n\ndef f(a):\n    return a\n"
+
+
+class TestCodeSelection(unittest.TestCase):
+    def test_every_code_belongs_to_a_rule_or_layer(self) -> None:
+        rule_codes = frozenset().union(*(rule.codes for rule in get_all_rules()))
+        self.assertEqual(rule_codes | tokens.TOKEN_CODES | project.PROJECT_CODES, ALL_CODES)
+
+    def test_rule_set_keeps_only_rules_with_enabled_codes(self) -> None:
+        rule_set = get_rule_set(frozenset({"NNO104", "NNO601"}))
+        self.assertEqual([type(rule).__name__ for rule in rule_set.rules], ["FuncNames"])
+        self.assertEqual(get_rule_set(frozenset({"NNO601"})).rules, ())
+
+    def test_only_selected_codes_are_reported(self) -> None:
+        codes = frozenset({"NNO101", "NNO601"})
+        got = check_source(text=_SRC, filename="n1.py", tree=ast.parse(_SRC), codes=codes)
+        self.assertEqual(sorted({v.code for v in got}), ["NNO101", "NNO601"])
+
+        everything = check_source(text=_SRC, filename="n1.py", tree=ast.parse(_SRC))
+        self.assertEqual(got, [v for v in everything if v.code in codes])
+
+    def test_no_tokenize_pass_without_comment_and_import_codes(self) -> None:
+        with mock.patch.object(tokens, "_iter_tokens") as iter_tokens, mock.patch.object(
+            tokens, "_check_imports"
+        ) as imports:
+            got = check_source(text=_SRC, filename="n1.py", tree=ast.parse(_SRC), codes=frozenset({"NNO104"}))
+        iter_tokens.assert_not_called()
+        imports.assert_not_called()
+        self.assertEqual([v.code for v in got], ["NNO104"])
+
+    def test_comment_codes_only_skip_imports(self) -> None:
+        with mock.patch.object(tokens, "_check_imports") as imports:
+            got = check_source(text=_SRC, filename="n1.py", tree=ast.parse(_SRC), codes=frozenset({"NNO601"}))
+        imports.assert_not_called()
+        self.assertEqual([v.code for v in got], ["NNO601"])
+
+    def test_project_root_is_not_searched_for_filename_only(self) -> None:
+        with mock.patch.object(project, "find_project_root") as find_root:
+            got = run_project_checks(filename="bad.py", codes=frozenset({"NNO401"}))
+        find_root.assert_not_called()
+        self.assertEqual([v.code for v in got], ["NNO401"])
+
+
+if __name__ == "__main__":
+    unittest.main()
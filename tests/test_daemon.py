@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from nflake8.core.patterns import README_DECLARATION_BLOCK
+from tests.helpers import write_file
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "daemon mode requires Unix domain sockets")
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        from nflake8.daemon import LintDaemon
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        write_file(os.path.join(self.root, "pyproject.toml"), "")
+        write_file(os.path.join(self.root, "README.md"), README_DECLARATION_BLOCK)
+        self.path = os.path.join(self.root, "n1.py")
+        write_file(self.path, "count = 1\n")
+        self.daemon = LintDaemon()
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_unchanged_file_is_served_from_memory(self) -> None:
+        from nflake8 import daemon as daemon_module
+
+        first = self.daemon.lint(self.path)
+        with mock.patch.object(daemon_module, "check_text", side_effect=AssertionError):
+            second = self.daemon.lint(self.path)
+        self.assertEqual(first, second)
+        self.assertEqual([v.code for v in second], ["NNO101"])
+
+    def test_unsaved_text_is_linted(self) -> None:
+        codes = [v.code for v in self.daemon.lint(self.path, text="n1234567890 = 1  # hi\n")]
+        self.assertEqual(codes, ["NNO601"])
+
+    def test_unsaved_text_lines_match_the_tokenizer(self) -> None:
+        text = "n1234567890 = 1\n\x0c\nfoo = 2  # noqa: NNO101\n"
+        write_file(self.path, text)
+        self.assertEqual(self.daemon.lint(self.path), [])
+        self.assertEqual(self.daemon.lint(self.path, text=text), [])
+
+    def test_watched_paths_follow_the_cached_results(self) -> None:
+        from nflake8.daemon import LintDaemon
+
+        daemon = LintDaemon(max_files=1)
+        paths = []
+        for name in ("N1", "N2"):
+            os.mkdir(os.path.join(self.root, name))
+            paths.append(os.path.join(self.root, name, "n1.py"))
+            write_file(paths[-1], "n1 = 1\n")
+            daemon.lint(paths[-1])
+        self.assertNotIn(os.path.dirname(paths[0]), daemon._watched)
+        self.assertIn(os.path.dirname(paths[1]), daemon._watched)
+        self.assertIn(self.root, daemon._watched)
+
+    def test_poll_relints_changed_file_and_invalidates_readme(self) -> None:
+        self.daemon.lint(self.path)
+
+        write_file(self.path, "n1234567890 = 1\n")
+        os.utime(self.path, ns=(1, 1))
+        write_file(os.path.join(self.root, "README.md"), "nothing here\n")
+
+        self.assertEqual(self.daemon.poll(), [os.path.abspath(self.path)])
+        self.assertEqual([v.code for v in self.daemon.lint(self.path)], ["NNO500"])
+
+    def test_server_roundtrip(self) -> None:
+        from nflake8.daemon import DaemonServer, request
+
+        socket_path = os.path.join(self.root, "d.sock")
+        server = DaemonServer(socket_path, self.daemon)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            self.assertEqual(request(socket_path, {"op": "ping"}), {"ok": True})
+            response = request(socket_path, {"op": "lint", "path": self.path})
+            self.assertEqual([r[2] for r in response["results"]], ["NNO101"])
+        finally:
+            request(socket_path, {"op": "shutdown"})
+            thread.join(timeout=5)
+            server.server_close()
+
+    def test_running_daemon_is_not_taken_over(self) -> None:
+        from nflake8.daemon import DaemonServer, request
+
+        socket_path = os.path.join(self.root, "d.sock")
+        server = DaemonServer(socket_path, self.daemon)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with self.assertRaisesRegex(OSError, "already serving"):
+                DaemonServer(socket_path)
+            self.assertEqual(request(socket_path, {"op": "ping"}), {"ok": True})
+        finally:
+            request(socket_path, {"op": "shutdown"})
+            thread.join(timeout=5)
+            server.socket.close()
+
+        # the socket file of a daemon that is gone is replaced
+        self.assertTrue(os.path.exists(socket_path))
+        DaemonServer(socket_path).server_close()
+
+        with self.assertRaisesRegex(OSError, "not a socket"):
+            DaemonServer(self.path)
+        self.assertTrue(os.path.exists(self.path))
+
+
+class TestSocketPath(unittest.TestCase):
+    def test_runtime_dir_or_private_temp_dir(self) -> None:
+        from nflake8.daemon import default_socket_path
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": tmp}):
+                self.assertEqual(default_socket_path(), os.path.join(tmp, "nflake8.sock"))
+
+            with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}), mock.patch.object(
+                tempfile, "gettempdir", return_value=tmp
+            ):
+                path = default_socket_path()
+                self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+
+                os.chmod(os.path.dirname(path), 0o777)
+                with self.assertRaisesRegex(OSError, "not a private directory"):
+                    default_socket_path()
+
+
+if __name__ == "__main__":
+    unittest.main()
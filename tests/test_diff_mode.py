@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import subprocess
+import tempfile
+import unittest
+
+from nflake8.cli import main
+from nflake8.core.patterns import README_DECLARATION_BLOCK
+from nflake8.core.types import Violation
+from nflake8.diff import changed_lines, filter_to_ranges
+from tests.helpers import write_file
+
+
+def _git(root: str, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=n", "-c", "user.email=n@n", *args],
+        cwd=root,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+class TestDiffMode(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self._tmp.name)
+        _git(self.root, "init", "-q")
+        write_file(os.path.join(self.root, "README.md"), README_DECLARATION_BLOCK)
+        write_file(os.path.join(self.root, "n1.py"), "a = 1\nb = 2\nc = 3\n")
+        write_file(os.path.join(self.root, "n2.py"), "d = 1\n")
+        _git(self.root, "add", "-A")
+        _git(self.root, "commit", "-q", "-m", "init")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_changed_lines_reports_hunks_and_untracked_files(self) -> None:
+        write_file(os.path.join(self.root, "n1.py"), "a = 1\nbb = 2\nc = 3\n")
+        write_file(os.path.join(self.root, "n3.py"), "e = 1\n")
+
+        changed = changed_lines(cwd=self.root)
+
+        self.assertEqual(
+            changed,
+            {
+                os.path.join(self.root, "n1.py"): [(2, 2)],
+                os.path.join(self.root, "n3.py"): None,
+            },
+        )
+
+    def test_filter_keeps_project_codes_and_changed_lines(self) -> None:
+        vs = [
+            Violation(_line=1, _col=0, _code="NNO420", _message=""),
+            Violation(_line=1, _col=0, _code="NNO101", _message=""),
+            Violation(_line=2, _col=0, _code="NNO101", _message=""),
+        ]
+        self.assertEqual(filter_to_ranges(vs, [(2, 3)]), [vs[0], vs[2]])
+        self.assertEqual(filter_to_ranges(vs, None), vs)
+
+    def test_cli_diff_hunks(self) -> None:
+        write_file(os.path.join(self.root, "n1.py"), "a = 1\nbb = 2\nc = 3\n")
+
+        out = io.StringIO()
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            with contextlib.redirect_stdout(out):
+                code = main(["-j", "1", "--diff", "--diff-hunks"])
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(code, 1)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("n1.py:2:1: NNO101 var-name invalid got bb "))
+
+
+if __name__ == "__main__":
+    unittest.main()
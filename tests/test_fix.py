@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import ast
+import contextlib
+import io
+import os
+import tempfile
+import textwrap
+import unittest
+
+from nflake8.cli import main
+from nflake8.core.patterns import README_DECLARATION_BLOCK
+from nflake8.fix import FIX_CODES, fix_file, fix_files, fix_source
+from nflake8.runner import check_source
+
+_SRC = textwrap.dedent(
+    """\
+    class Base:
+        limit = 3
+
+        def run(self, count, *, verbose=False):
+            total = 0
+            for i in range(count):
+                total += i
+            for j in range(self.limit):
+                total += j
+            return self.scale(total, verbose=verbose)
+
+        def scale(self, value, verbose=False):
+            return -value if verbose else value
+
+
+    class Child(Base):
+        def run(self, count, *, verbose=False):
+            return super().run(count, verbose=verbose) + Base.limit
+
+
+    def make(size):
+        items = [x * 2 for x in range(size)]
+        try:
+            return Child().run(len(items), verbose=True)
+        except ValueError as err:
+            return str(err)
+
+
+    result = make(4)
+    """
+)
+
+
+def _run(text: str) -> dict[str, object]:
+    namespace: dict[str, object] = {}
+    exec(compile(text, "n1.py", "exec"), namespace)
+    return namespace
+
+
+def _remaining(text: str) -> list[str]:
+    got = check_source(text=text, filename="n1.py", tree=ast.parse(text), codes=FIX_CODES)
+    return sorted(v.code for v in got)
+
+
+class TestFixSource(unittest.TestCase):
+    def test_renames_every_symbol_consistently(self) -> None:
+        fixed, renames = fix_source(_SRC, filename="n1.py")
+
+        self.assertEqual(_remaining(fixed), [])
+        self.assertGreater(renames, 10)
+        expected = _run(_SRC)["result"]
+        self.assertEqual(_run(fixed)[fixed.splitlines()[-1].split(" = ")[0]], expected)
+
+    def test_uses_the_suggested_names(self) -> None:
+        src = "count = 1\nprint(count)\n"
+        suggested = [v.suggest for v in check_source(text=src, filename="n1.py", tree=ast.parse(src))]
+
+        fixed, _ = fix_source(src, filename="n1.py")
+        self.assertEqual(fixed, f"{suggested[0]} = 1\nprint({suggested[0]})\n")
+
+    def test_overrides_and_keywords_keep_one_name(self) -> None:
+        fixed, _ = fix_source(_SRC, filename="n1.py")
+        tree = ast.parse(fixed)
+        methods = [
+            node
+            for klass in tree.body
+            if isinstance(klass, ast.ClassDef)
+            for node in klass.body
+            if isinstance(node, ast.FunctionDef) and node.args.kwonlyargs
+        ]
+        self.assertEqual(len({m.name for m in methods}), 1)
+        self.assertEqual(len({m.args.kwonlyargs[0].arg for m in methods}), 1)
+        self.assertNotIn("verbose", fixed)
+
+    def test_sequential_loops_share_the_iterator_name(self) -> None:
+        src = "def f(a):\n    for i in a:\n        print(i)\n    for j in a:\n        print(j)\n"
+        fixed, _ = fix_source(src, filename="n1.py")
+        self.assertIn("    for n in n1:\n        print(n)\n    for n in n1:\n        print(n)\n", fixed)
+
+    def test_does_not_capture_other_names(self) -> None:
+        # renaming i to n would make the loop read i instead of the global n
+        src = "def f():\n    for i in range(3):\n        print(i, n)\n"
+        fixed, _ = fix_source(src, filename="n1.py")
+        self.assertIn("for i in range(3):", fixed)
+
+    def test_keeps_names_used_from_outside(self) -> None:
+        src = textwrap.dedent(
+            """\
+            import os
+            from unittest import TestCase
+
+
+            class Case(TestCase):
+                value = 1
+
+                def check(self, flag=False):
+                    return getattr(self, "value")
+
+
+            def test_thing(tmp_path):
+                return tmp_path
+            """
+        )
+        fixed, _ = fix_source(src, filename="n1.py")
+        for kept in ("import os", "value = 1", "def check(", "flag=False", "def test_thing(tmp_path):"):
+            self.assertIn(kept, fixed)
+
+    def test_noqa_lines_are_left_alone(self) -> None:
+        src = "count = 1  # noqa: NNO101\nother = count\n"
+        fixed, renames = fix_source(src, filename="n1.py")
+        self.assertEqual(renames, 1)
+        self.assertTrue(fixed.startswith("count = 1  # noqa: NNO101\nn"))
+
+    def test_non_ascii_columns_and_crlf(self) -> None:
+        src = 'label = "é"; value = label\r\nprint(value)\r\n'
+        fixed, _ = fix_source(src, filename="n1.py")
+        self.assertEqual(_remaining(fixed), [])
+        self.assertEqual(fixed.count("\r\n"), 2)
+        self.assertIn('"é"', fixed)
+
+
+class TestFixFiles(unittest.TestCase):
+    def test_fix_file_rewrites_in_place(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "n1.py")
+            with open(path, "wb") as f:
+                f.write(b"# -*- coding: latin-1 -*-\nname = '\xe9'\n")
+
+            result = fix_file(path, used={})
+            self.assertIsNone(result.error)
+            self.assertEqual(result.renames, 1)
+            with open(path, "rb") as f:
+                data = f.read()
+            self.assertTrue(data.startswith(b"# -*- coding: latin-1 -*-\nn"))
+            self.assertTrue(data.endswith(b" = '\xe9'\n"))
+            self.assertEqual(os.listdir(root), ["n1.py"])
+
+    def test_unparsable_file_is_reported_and_untouched(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "n1.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("def (:\n")
+
+            result = fix_file(path)
+            self.assertIsNotNone(result.error)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "def (:\n")
+
+    def test_fix_files_on_a_pool_and_cli(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, "README.md"), "w", encoding="utf-8") as f:
+                f.write(README_DECLARATION_BLOCK)
+            paths = []
+            for index in range(3):
+                paths.append(os.path.join(root, f"n{index + 1}.py"))
+                with open(paths[-1], "w", encoding="utf-8") as f:
+                    f.write(f"count = {index}\n")
+
+            results = sorted(fix_files([root], jobs=2), key=lambda r: r.filename)
+            self.assertEqual([(r.filename, r.renames) for r in results], [(p, 1) for p in paths])
+
+            with open(paths[0], "w", encoding="utf-8") as f:
+                f.write("count = 0\n")
+            out, err = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                code = main(["-j", "1", "--nno-fix", root])
+            self.assertEqual(code, 0)
+            self.assertEqual(out.getvalue(), "")
+            self.assertIn("renamed 1 symbols", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import ast
+import multiprocessing
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from nflake8.core import ids
+from nflake8.core.ids import IdLedger, disable_id_ledger, enable_id_ledger
+from nflake8.runner import check_source
+
+
+def _suggestions(source: str, filename: str = "n1.py") -> list[str]:
+    got = check_source(text=source, filename=filename, tree=ast.parse(source), codes=frozenset({"NNO101"}))
+    return [v.suggest for v in got]
+
+
+def _allocate(path: str, keys: list[str]) -> dict[str, int]:
+    ledger = IdLedger(path)
+    return {key: ledger.id_for(key) for key in keys}
+
+
+class TestSymbolIds(unittest.TestCase):
+    def test_one_id_per_symbol(self) -> None:
+        got = _suggestions("count = 1\ncount = 2\n\n\ndef f():\n    count = 3\n")
+        self.assertEqual(len(got), 3)
+        self.assertEqual(got[0], got[1])
+        self.assertNotEqual(got[0], got[2])
+
+    def test_global_names_keep_the_module_id(self) -> None:
+        got = _suggestions("count = 0\n\n\ndef f():\n    global count\n    count = 1\n\n\ndef g():\n    count = 2\n")
+        self.assertEqual(len(got), 3)
+        self.assertEqual(got[0], got[1])
+        self.assertNotEqual(got[0], got[2])
+
+    def test_nonlocal_names_keep_the_id_of_the_binding_function(self) -> None:
+        source = (
+            "def f():\n    data = 1\n\n    def g():\n        nonlocal data\n        data = 2\n\n"
+            "        class K:\n            def h(n):\n                nonlocal data\n                data = 3\n"
+        )
+        got = _suggestions(source)
+        self.assertEqual(len(got), 3)
+        self.assertEqual(len(set(got)), 1)
+
+    def test_ledger_ids_follow_the_project_not_the_checkout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            self.addCleanup(disable_id_ledger)
+            enable_id_ledger(os.path.join(tmp, "ids"))
+            got = []
+            for name in ("a", "b"):
+                root = os.path.join(tmp, name)
+                os.makedirs(root)
+                open(os.path.join(root, "README.md"), "w").close()
+                got.append(_suggestions("count = 1\n", filename=os.path.join(root, "n1.py")))
+            self.assertEqual(got[0], got[1])
+
+
+class TestIdLedger(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "ledger.ids")
+
+    def test_colliding_hashes_get_distinct_ids_that_persist(self) -> None:
+        with mock.patch.object(ids, "hashed_id", return_value=ids.ID_SPACE - 1):
+            first = _allocate(self.path, ["a", "b", "c"])
+        self.assertEqual(sorted(first.values()), [0, 1, ids.ID_SPACE - 1])
+
+        reloaded = IdLedger(self.path)
+        self.assertEqual(len(reloaded), 3)
+        self.assertEqual({key: reloaded.id_for(key) for key in first}, first)
+
+    def test_first_claim_of_an_id_wins(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("0000000007 a\n0000000007 b\n0000000008 a\n")
+
+        ledger = IdLedger(self.path)
+        self.assertEqual(ledger.id_for("a"), 7)
+        self.assertEqual(len(ledger), 1)
+        with mock.patch.object(ids, "hashed_id", return_value=7):
+            self.assertEqual(ledger.id_for("b"), 8)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_workers_allocate_unique_ids(self) -> None:
+        keys = [f"key{i}" for i in range(40)]
+        # a tiny id space makes every worker collide with the others
+        with mock.patch.object(ids, "ID_SPACE", 50):
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=4, mp_context=context) as pool:
+                seen = list(pool.map(_allocate, [self.path] * 4, [keys[i::2] + keys[::3] for i in range(4)]))
+
+        final = IdLedger(self.path)
+        self.assertEqual(len(set(final.id_for(key) for key in keys)), len(keys))
+        for worker in seen:
+            self.assertEqual(worker, {key: final.id_for(key) for key in worker})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import ast
+import unittest
+from types import SimpleNamespace
+
+from nflake8.core.errors import ErrorCodes
+from nflake8.core.types import Violation
+from nflake8.plugin import NNotationChecker
+
+
+class _Template(str):
+    """ErrorCodes template that counts how often it is formatted."""
+
+    calls = 0
+
+    def format_map(self, mapping):  # type: ignore[override]
+        type(self).calls += 1
+        return super().format_map(mapping)
+
+
+class TestLazyMessages(unittest.TestCase):
+    def test_message_is_formatted_from_args(self) -> None:
+        v = Violation(_line=1, _col=0, _code="NNO101", _message=ErrorCodes.NNO101, _args=(("name", "x"),))
+        self.assertEqual(v.template, ErrorCodes.NNO101)
+        self.assertEqual(v.message, "var-name invalid got x")
+        self.assertEqual(v.to_flake8(object)[2], "NNO101 var-name invalid got x")
+
+    def test_deselected_and_noqa_violations_are_never_formatted(self) -> None:
+        _Template.calls = 0
+        template = _Template(ErrorCodes.NNO101)
+        violations = [
+            Violation(_line=1, _col=0, _code="NNO101", _message=template, _args=(("name", "a"),)),
+            Violation(_line=2, _col=0, _code="NNO101", _message=template, _args=(("name", "b"),)),
+            Violation(_line=1, _col=0, _code="NNO104", _message=template, _args=(("name", "c"),)),
+        ]
+        lines = ["a = 1\n", "b = 2  # noqa: NNO101\n"]
+
+        class _Checker(NNotationChecker):
+            _enabled_codes = frozenset({"NNO101"})
+
+        checker = _Checker(ast.parse("".join(lines)), "n1.py", lines=lines)
+        reported = list(checker._report(violations))
+
+        self.assertEqual([r[2] for r in reported], ["NNO101 var-name invalid got a"])
+        self.assertEqual(_Template.calls, 1)
+
+    def test_disable_noqa_keeps_suppressed_lines(self) -> None:
+        lines = ["a = 1  # noqa\n"]
+        violations = [Violation(_line=1, _col=0, _code="NNO101", _message=ErrorCodes.NNO101, _args=(("name", "a"),))]
+
+        class _Checker(NNotationChecker):
+            _noqa = False
+
+        checker = _Checker(ast.parse("".join(lines)), "n1.py", lines=lines)
+        self.assertEqual(len(list(checker._report(violations))), 1)
+
+    def test_enabled_codes_without_flake8_options(self) -> None:
+        from nflake8.plugin import _enabled_codes
+
+        # options that DecisionEngine cannot read leave every code enabled
+        self.assertIsNone(_enabled_codes(SimpleNamespace()))
+
+
+if __name__ == "__main__":
+    unittest.main()
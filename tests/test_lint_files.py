@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import nflake8
+from nflake8 import api
+from nflake8.core.ids import disable_id_ledger, enable_id_ledger, get_ledger_dir
+from nflake8.core.root import configure_run
+from nflake8.runner import check_file
+from tests.helpers import write_file
+
+
+def _tree(root: str) -> list[str]:
+    write_file(os.path.join(root, "pyproject.toml"), "")
+    return [
+        write_file(os.path.join(root, "N1", f"n{i}.py"), "count = 1\n" * (i + 1) + "# comment\n")
+        for i in range(12)
+    ]
+
+
+class TestLintFiles(unittest.TestCase):
+    def test_ordered_results_follow_the_input(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            files = _tree(root)
+            for jobs in (1, 3):
+                with self.subTest(jobs=jobs):
+                    results = list(nflake8.lint_files(files, jobs=jobs, ordered=True, chunksize=2))
+                    self.assertEqual([r.filename for r in results], files)
+
+    def test_results_match_check_file(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            files = _tree(root)
+            results = {r.filename: r.violations for r in nflake8.lint_files([root], jobs=3)}
+            self.assertEqual(sorted(results), sorted(files))
+            for filename in files:
+                configure_run(None)
+                expected = [v for v in check_file(filename) if v.code != "NNO500"]
+                self.assertEqual([v for v in results[filename] if v.code != "NNO500"], expected)
+
+    def test_project_checks_run_once_in_this_process(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            files = _tree(root)
+            with mock.patch.object(api, "run_project_checks", wraps=api.run_project_checks) as project:
+                results = list(nflake8.lint_files(files, jobs=3, chunksize=4))
+            self.assertEqual(project.call_count, len(files))
+            self.assertEqual(sum(v.code == "NNO500" for r in results for v in r.violations), 1)
+
+    def test_files_are_submitted_in_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            files = _tree(root)
+            with mock.patch.object(api, "_check_chunk", wraps=api._check_chunk) as check_chunk:
+                # wrapped functions can not be pickled: run the chunks in-process
+                with mock.patch.object(api, "ProcessPoolExecutor", _InlineExecutor):
+                    results = list(nflake8.lint_files(files, jobs=2, chunksize=5))
+            self.assertEqual([len(call.args[0]) for call in check_chunk.call_args_list], [5, 5, 2])
+            self.assertEqual(len(results), len(files))
+
+    def test_spawned_workers_use_the_id_ledger(self) -> None:
+        spawn = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+        with tempfile.TemporaryDirectory() as ledger_dir:
+            self.addCleanup(disable_id_ledger)
+            enable_id_ledger(ledger_dir)
+            chunks = iter([[("n1.py", [], False)], [("n2.py", [], False)]])
+            with mock.patch.object(api, "ProcessPoolExecutor", spawn):
+                seen = list(api._lint_in_pool(_worker_ledger_dir, chunks, jobs=2, ordered=True, indexes=[]))
+            self.assertEqual(seen, [ledger_dir, ledger_dir])
+
+
+def _worker_ledger_dir(chunk: list) -> str | None:
+    return get_ledger_dir()
+
+
+class _InlineExecutor:
+    def __init__(self, *, max_workers, initializer, initargs) -> None:
+        initializer(*initargs)
+
+    def __enter__(self) -> "_InlineExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+if __name__ == "__main__":
+    unittest.main()
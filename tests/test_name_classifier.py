@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+import unittest
+
+from nflake8.core import patterns
+from nflake8.core.patterns import NameKind, classify_name
+
+# The regular expressions the classifier replaced; kept here as the reference.
+_REFERENCE = {
+    "is_var_name": re.compile(r"n(?:\d{10}|[01]{10})\Z"),
+    "is_func_name": re.compile(r"n(?:\d{10}|[01]{10})\Z"),
+    "is_const_name": re.compile(r"N\d{10}\Z"),
+    "is_class_name": re.compile(r"N\d{10}(?:n\d{10})*\Z"),
+    "is_derived_class_name": re.compile(r"N\d{10}(?:n\d{10})+\Z"),
+    "is_public_member_name": re.compile(r"n_(?:\d{10}|[01]{10})\Z"),
+    "is_private_member_name": re.compile(r"_n(?:\d{10}|[01]{10})\Z"),
+    "is_iterator_name": re.compile(r"n+\Z"),
+    "is_required_param_name": re.compile(r"n[1-9]\d*\Z"),
+    "is_import_alias": re.compile(r"N[1-9]\d*\Z"),
+    "is_from_alias": re.compile(r"(?:N\d{10}(?:n\d{10})*|n(?:\d{10}|[01]{10}))\Z"),
+}
+
+_NAMES = [
+    "",
+    "n",
+    "nn",
+    "nnnn",
+    "N",
+    "n1",
+    "n0",
+    "n01",
+    "n12",
+    "N1",
+    "N0",
+    "N12",
+    "n1234567890",
+    "n0101010101",
+    "n0000000000",
+    "n12345678901",
+    "n123456789",
+    "N1234567890",
+    "N0000000001",
+    "N1234567890n0987654321",
+    "N1234567890n0987654321n1111111111",
+    "N1234567890n",
+    "N1234567890n123",
+    "N1234567890N1234567890",
+    "n_1234567890",
+    "n_0101010101",
+    "n_123",
+    "_n1234567890",
+    "_n123",
+    "__init__",
+    "self",
+    "count",
+    "n١٢٣٤٥٦٧٨٩٠",
+    "n²234567890",
+    "N١",
+    "nn1234567890",
+    "n1234567890\n",
+]
+
+
+class TestNameClassifier(unittest.TestCase):
+    def test_matches_reference_regexes(self) -> None:
+        for name in _NAMES:
+            for func_name, regex in _REFERENCE.items():
+                with self.subTest(name=name, func=func_name):
+                    self.assertEqual(
+                        getattr(patterns, func_name)(name),
+                        bool(regex.fullmatch(name)),
+                    )
+
+    def test_segments(self) -> None:
+        self.assertEqual(classify_name("N1234567890n0000000001").segments, (1234567890, 1))
+        self.assertEqual(classify_name("n0101010101").segments, (101010101,))
+        self.assertEqual(classify_name("N12").segments, (12,))
+        self.assertEqual(classify_name("_n0000000007").segments, (7,))
+        self.assertEqual(classify_name("count").segments, ())
+
+    def test_kinds_combine(self) -> None:
+        kinds = classify_name("n0101010101").kinds
+        self.assertTrue(kinds & NameKind.VAR)
+        self.assertTrue(kinds & NameKind.BOOL_VAR)
+        self.assertTrue(kinds & NameKind.FROM_ALIAS)
+        self.assertFalse(kinds & NameKind.REQUIRED_PARAM)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import ast
+import json
+import os
+import tempfile
+import unittest
+
+from nflake8.core.profile import Profiler, collect, disable_profiling, enable_profiling, get_profiler, timed
+from nflake8.runner import check_source
+
+
+class TestProfile(unittest.TestCase):
+    def tearDown(self) -> None:
+        disable_profiling()
+
+    def test_disabled_by_default_and_timed_is_transparent(self) -> None:
+        self.assertIsNone(get_profiler())
+        self.assertEqual(timed("x", lambda *, n: [n], n=1), [1])
+
+    def test_collects_layers_and_rules(self) -> None:
+        profiler = enable_profiling()
+        src = "import os\ncount = 1  # hi\n"
+        check_source(text=src, filename="n1.py", tree=ast.parse(src))
+
+        stats = profiler.snapshot()
+        self.assertEqual(stats["layer:ast"][1:], [1, 1])
+        self.assertEqual(stats["layer:tokens"][1:], [1, 2])
+        self.assertEqual(stats["rule:VarNames"][1:], [1, 1])
+        self.assertIn("tokens:imports", stats)
+
+    def test_collect_merges_worker_dumps(self) -> None:
+        with tempfile.TemporaryDirectory() as run_dir:
+            enable_profiling(run_dir).add("rule:VarNames", 1.0, 2)
+            with open(os.path.join(run_dir, "profile-999999.json"), "w", encoding="utf-8") as f:
+                json.dump({"rule:VarNames": [0.5, 3, 1], "layer:ast": [2.0, 1, 0]}, f)
+
+            total = collect().snapshot()
+
+        self.assertEqual(total["rule:VarNames"], [1.5, 4, 3])
+        self.assertEqual(total["layer:ast"], [2.0, 1, 0])
+
+    def test_summary_is_sorted_by_time(self) -> None:
+        p = Profiler()
+        p.add("a", 0.1, 0)
+        p.add("b", 0.3, 1)
+        lines = p.format_summary().splitlines()
+        self.assertTrue(lines[1].startswith("b"))
+        self.assertEqual(json.loads(p.to_json())["profile"][0]["name"], "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
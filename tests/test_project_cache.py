@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from nflake8.core import root as root_module
+from nflake8.core.patterns import README_DECLARATION_BLOCK
+from nflake8.core.root import ProjectCache, find_project_root, get_readme_status, invalidate_project_caches
+from tests.helpers import write_file
+
+
+class TestProjectCache(unittest.TestCase):
+    def test_lru_bound(self) -> None:
+        cache = ProjectCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b", default=None))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_changed_signature_is_a_miss(self) -> None:
+        cache = ProjectCache()
+        cache.put("a", 1, (1, 2, 3))
+        self.assertEqual(cache.get("a", (1, 2, 3)), 1)
+        self.assertIsNone(cache.get("a", (9, 2, 3), default=None))
+        self.assertIsNone(cache.get("a", (1, 2, 3), default=None))
+
+    def test_claim_is_atomic(self) -> None:
+        cache = ProjectCache()
+        wins: list[bool] = []
+        barrier = threading.Barrier(8)
+
+        def claim() -> None:
+            barrier.wait()
+            wins.append(cache.claim("root"))
+
+        threads = [threading.Thread(target=claim) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(wins), [False] * 7 + [True])
+
+        cache.clear()
+        self.assertTrue(cache.claim("root"))
+
+
+class TestRootCaches(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_project_caches()
+
+    def test_intermediate_directories_are_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            write_file(os.path.join(d, "pyproject.toml"))
+            first = write_file(os.path.join(d, "N1", "N2", "n1.py"))
+            sibling = write_file(os.path.join(d, "N1", "N3", "n1.py"))
+            self.assertEqual(find_project_root(first), os.path.abspath(d))
+
+            with mock.patch.object(root_module.os.path, "isfile", wraps=os.path.isfile) as isfile:
+                self.assertEqual(find_project_root(sibling), find_project_root(first))
+            # only N3 itself was probed for markers; N1 and the root came from the cache
+            probed = {os.path.dirname(call.args[0]) for call in isfile.call_args_list}
+            self.assertEqual(probed, {os.path.dirname(sibling)})
+
+    def test_removed_marker_is_noticed(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            marker = write_file(os.path.join(d, "N1", "tox.ini"))
+            path = os.path.join(d, "N1", "n1.py")
+            self.assertEqual(find_project_root(path), os.path.dirname(marker))
+            os.unlink(marker)
+            self.assertNotEqual(find_project_root(path), os.path.dirname(marker))
+
+    def test_readme_edit_is_noticed(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            readme = write_file(os.path.join(d, "README.md"), "nothing\n")
+            self.assertFalse(get_readme_status(d).ok)
+            with open(readme, "a", encoding="utf-8") as f:
+                f.write(README_DECLARATION_BLOCK)
+            self.assertTrue(get_readme_status(d).ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import builtins
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from nflake8.checks import project
+from nflake8.checks.project import run_project_checks, scan_project
+from nflake8.cli import main
+from nflake8.core.root import configure_run, invalidate_project_caches
+from tests.helpers import write_file
+
+
+def _tree(root: str) -> list[str]:
+    write_file(os.path.join(root, "pyproject.toml"), "[project]\nname='x'\n")
+    return [
+        write_file(os.path.join(root, "n1.py")),
+        write_file(os.path.join(root, "N1", "N1_2", "n2.py")),
+        write_file(os.path.join(root, "N1", "bad", "N2", "n3.py")),
+        write_file(os.path.join(root, "N1", "bad", "N2", "setup.py")),
+        # nested project: directories are checked from its own root
+        write_file(os.path.join(root, "vendor", "lib", "tox.ini")),
+        write_file(os.path.join(root, "vendor", "lib", "N3", "n4.py")),
+    ]
+
+
+class TestProjectScan(unittest.TestCase):
+    def setUp(self) -> None:
+        configure_run(None)
+        invalidate_project_caches()
+
+    def test_scan_matches_per_file_checks(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            files = _tree(root)
+            scanned = dict(scan_project([root]))
+            self.assertEqual(sorted(scanned), sorted(f for f in files if f.endswith(".py")))
+
+            configure_run(None)
+            for filename, violations in scanned.items():
+                with self.subTest(filename=filename):
+                    self.assertEqual(
+                        [v for v in violations if v.code != "NNO500"],
+                        [v for v in run_project_checks(filename=filename) if v.code != "NNO500"],
+                    )
+            self.assertEqual(
+                sorted(os.path.basename(f) for f, vs in scanned.items() for v in vs if v.code == "NNO420"),
+                ["n3.py", "setup.py"],
+            )
+
+    def test_each_directory_is_listed_once_and_no_file_is_opened(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            _tree(root)
+            real_open = builtins.open
+
+            def no_python(path, *args, **kwargs):
+                if str(path).endswith(".py"):
+                    raise AssertionError(f"opened {path}")
+                return real_open(path, *args, **kwargs)
+
+            with mock.patch.object(project.os, "scandir", wraps=os.scandir) as scandir, mock.patch(
+                "builtins.open", no_python
+            ):
+                list(scan_project([root]))
+            listed = [call.args[0] for call in scandir.call_args_list]
+            self.assertEqual(len(listed), len(set(listed)))
+            self.assertEqual(len(listed), 8)
+
+    def test_directory_names_are_checked_once(self) -> None:
+        project._directory_violation.cache_clear()
+        with tempfile.TemporaryDirectory() as root:
+            write_file(os.path.join(root, "pyproject.toml"))
+            for i in range(5):
+                write_file(os.path.join(root, "N1", "bad", f"n{i}.py"))
+            with mock.patch.object(project, "_DIR_RE", wraps=project._DIR_RE) as dir_re:
+                list(scan_project([root]))
+            self.assertEqual(dir_re.fullmatch.call_count, 2)
+
+    def test_cli_project_only(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            path = write_file(os.path.join(root, "N1", "bad_name.py"), "# not parsed (\n")
+            write_file(os.path.join(root, "pyproject.toml"))
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main(["--project-only", root])
+            self.assertEqual(code, 1)
+            self.assertEqual(
+                [line.split(" ")[1] for line in out.getvalue().splitlines()],
+                ["NNO401", "NNO500"],
+            )
+            self.assertTrue(out.getvalue().startswith(f"{path}:1:1: NNO401"))
+
+
+if __name__ == "__main__":
+    unittest.main()
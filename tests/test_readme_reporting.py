@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from nflake8.checks import project as project_module
+from nflake8.checks.project import run_project_checks
+from nflake8.core.root import claim_readme_check, configure_run
+from nflake8.core.runs import end_run, start_run
+from nflake8.plugin import _uses_multiple_jobs
+
+
+class TestReadmeReporting(unittest.TestCase):
+    def tearDown(self) -> None:
+        configure_run(None)
+
+    def _make_project(self, root: str) -> list[str]:
+        with open(os.path.join(root, "pyproject.toml"), "w", encoding="utf-8") as f:
+            f.write("[project]\nname='x'\nversion='0.0.0'\n")
+        files = []
+        for name in ("n1.py", "n2.py"):
+            path = os.path.join(root, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("")
+            files.append(path)
+        return files
+
+    def test_reported_once_per_root_in_one_process(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            configure_run(None)
+            codes = [v.code for f in self._make_project(root) for v in run_project_checks(filename=f)]
+            self.assertEqual(codes.count("NNO500"), 1)
+
+    def test_reported_once_across_processes_sharing_a_run_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as run_dir:
+            files = self._make_project(root)
+
+            configure_run(run_dir)
+            first = [v.code for v in run_project_checks(filename=files[0])]
+
+            # a second worker: fresh in-process state, same run directory
+            configure_run(run_dir)
+            with mock.patch.object(project_module, "get_readme_status", side_effect=AssertionError):
+                second = [v.code for v in run_project_checks(filename=files[1])]
+
+            self.assertIn("NNO500", first)
+            self.assertNotIn("NNO500", second)
+
+    def test_claim_without_run_dir_is_per_process(self) -> None:
+        configure_run(None)
+        self.assertTrue(claim_readme_check("/some/root"))
+        self.assertFalse(claim_readme_check("/some/root"))
+
+
+class TestRunCoordination(unittest.TestCase):
+    def test_only_runs_with_several_workers_coordinate(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "n1.py")
+            cases = [
+                (SimpleNamespace(jobs="4", filenames=[root]), True),
+                (SimpleNamespace(jobs="4", filenames=[path, path]), True),
+                (SimpleNamespace(jobs="4", filenames=[path]), False),
+                (SimpleNamespace(jobs="4", filenames=["-"]), False),
+                (SimpleNamespace(jobs="1", filenames=[root]), False),
+                (SimpleNamespace(filenames=[root]), False),
+            ]
+            for options, expected in cases:
+                with self.subTest(options=options):
+                    self.assertEqual(_uses_multiple_jobs(options), expected)
+
+    def test_end_run_removes_the_run_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as runs_dir, mock.patch.dict(os.environ):
+            run_dir = start_run(runs_dir)
+            open(os.path.join(run_dir, "readme-x"), "w").close()
+            end_run(run_dir)
+            self.assertFalse(os.path.exists(run_dir))
+            self.assertNotIn("NFLAKE8_RUN_ID", os.environ)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from nflake8.core import suggestions
+from nflake8.core.cache import ResultCache, cache_key
+from nflake8.core.suggestions import suggestion
+from nflake8.core.types import Violation
+
+
+def _violation(line: int) -> Violation:
+    return Violation(_line=line, _col=4, _code="NNO101", _message="var-name invalid got x")
+
+
+def _files(directory: str) -> list[str]:
+    out: list[str] = []
+    for dirpath, _, filenames in os.walk(directory):
+        out.extend(os.path.join(dirpath, f) for f in filenames)
+    return out
+
+
+class TestResultCache(unittest.TestCase):
+    def test_roundtrip(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            cache = ResultCache(d)
+            key = cache_key(content=b"x = 1\n", filename="n1.py", settings={})
+            self.assertIsNone(cache.get(key))
+
+            cache.put(key, [_violation(1), _violation(2)])
+            self.assertEqual(ResultCache(d).get(key), [_violation(1), _violation(2)])
+
+    def test_suggestions_are_stored_unrendered(self) -> None:
+        root = suggestion("class", filename="n1.py", line=1, col=0, name="Foo", scope="")
+        suggest = suggestion("derived", filename="n1.py", line=1, col=0, head=root, name="Foo", scope="")
+        violations = [
+            Violation(_line=1, _col=0, _code="NNO105", _message="x", _suggest=suggest),
+            Violation(_line=2, _col=0, _code="NNO210", _message="y", _suggest="self"),
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            cache = ResultCache(d)
+            key = cache_key(content=b"", filename="n1.py", settings={})
+            with mock.patch.object(suggestions, "_hashed_symbol_id", side_effect=AssertionError):
+                cache.put(key, violations)
+                replayed = ResultCache(d).get(key)
+            self.assertEqual(replayed, violations)
+            self.assertEqual(replayed[0].message, violations[0].message)
+
+    def test_key_depends_on_content_filename_and_settings(self) -> None:
+        base = cache_key(content=b"x = 1\n", filename="n1.py", settings={"rules": ["A"]})
+        self.assertNotEqual(base, cache_key(content=b"x = 2\n", filename="n1.py", settings={"rules": ["A"]}))
+        self.assertNotEqual(base, cache_key(content=b"x = 1\n", filename="n2.py", settings={"rules": ["A"]}))
+        self.assertNotEqual(base, cache_key(content=b"x = 1\n", filename="n1.py", settings={"rules": ["B"]}))
+
+    def test_corrupt_entry_is_a_miss(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            cache = ResultCache(d)
+            key = cache_key(content=b"", filename="n1.py", settings={})
+            cache.put(key, [_violation(1)])
+            with open(_files(d)[0], "w", encoding="utf-8") as f:
+                f.write("[[1, 2")
+            self.assertIsNone(cache.get(key))
+
+    def test_writes_leave_no_temp_files(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            cache = ResultCache(d)
+            cache.put(cache_key(content=b"", filename="n1.py", settings={}), [])
+            self.assertFalse([p for p in _files(d) if os.path.basename(p).startswith(".tmp-")])
+
+    def test_prune_bounds_entry_count(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            cache = ResultCache(d, max_entries=10)
+            for i in range(30):
+                cache.put(cache_key(content=str(i).encode(), filename="n1.py", settings={}), [])
+            cache.prune()
+            self.assertLessEqual(len(_files(d)), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import ast
+import unittest
+
+from unittest import mock
+
+from nflake8.checks.ast import run_ast_checks
+from nflake8.rules.registry import RuleSet, get_rule_set
+from nflake8.rules.var_names import VarNames
+
+
+class TestRuleSet(unittest.TestCase):
+    def test_rule_set_is_shared_by_the_process(self) -> None:
+        self.assertIs(get_rule_set(), get_rule_set())
+        self.assertIs(get_rule_set(), get_rule_set(None))
+        self.assertIs(get_rule_set(), get_rule_set(codes=None))
+
+    def test_begin_file_resets_every_rule(self) -> None:
+        rule = VarNames()
+        rule_set = RuleSet([rule])
+        with mock.patch.object(rule, "reset") as reset:
+            run_ast_checks(tree=ast.parse("n1234567890 = 1\n"), filename="n1.py", rule_set=rule_set)
+        reset.assert_called_once_with()
+
+    def test_results_do_not_leak_between_files(self) -> None:
+        src = "for n in range(3):\n    for nn in range(3):\n        pass\n"
+        first = run_ast_checks(tree=ast.parse(src), filename="n1.py")
+        second = run_ast_checks(tree=ast.parse(src), filename="n1.py")
+        self.assertEqual(first, second)
+        self.assertNotIn("NNO110", [v.code for v in second])
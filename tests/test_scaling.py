@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import ast
+import time
+import unittest
+
+from nflake8.checks.ast import run_ast_checks
+
+_BLOCK = """\
+def n{idx:010d}(n1):
+    for n in range(n1):
+        for nn in range(n):
+            n0000000001 = [nnn for nnn in range(nn)]
+    return n1
+
+"""
+
+
+def _make_source(blocks: int) -> str:
+    return "".join(_BLOCK.format(idx=i) for i in range(blocks))
+
+
+def _best_time(tree: ast.AST, *, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_ast_checks(tree=tree, filename="n1.py")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+class TestAstScaling(unittest.TestCase):
+    def test_ast_checks_scale_linearly_with_file_size(self) -> None:
+        small = ast.parse(_make_source(100))
+        large = ast.parse(_make_source(800))
+
+        ratio = _best_time(large) / _best_time(small)
+
+        # 8x more code: linear is ~8x, the old per-loop parent map rebuild was ~64x
+        self.assertLess(ratio, 24)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import ast
+import io
+import os
+import tempfile
+import tokenize
+import unittest
+from unittest import mock
+
+from nflake8.checks.tokens import run_token_checks
+from nflake8.core import source
+from nflake8.core.cache import cache_key
+from nflake8.core.source import read_lines
+from nflake8.runner import check_file
+
+_LATIN1 = '# -*- coding: latin-1 -*-\nn1 = "\xe9"\r\nn2 = 2\n'.encode("latin-1")
+
+
+class TestReadLines(unittest.TestCase):
+    def _write(self, d: str, data: bytes) -> str:
+        path = os.path.join(d, "n1.py")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_coding_cookie_and_universal_newlines(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = self._write(d, _LATIN1)
+            self.assertEqual(read_lines(path), ["# -*- coding: latin-1 -*-\n", 'n1 = "\xe9"\n', "n2 = 2\n"])
+
+    def test_mapped_files_read_the_same(self) -> None:
+        samples = (
+            _LATIN1,
+            b"\xef\xbb\xbfn1 = 1\nn2 = '\xc3\xa9'",
+            "n1 = 1\n".encode("utf-8") * 50,
+            b"n1 = 1\rn2 = 2\r\nn3 = 3\r",
+            b"n1 = 1\r\r\nn2 = '\xc3\xa9'\rn3 = 3",
+        )
+        with tempfile.TemporaryDirectory() as d:
+            for data in samples:
+                path = self._write(d, data)
+                encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+                with open(path, encoding=encoding, newline=None) as f:
+                    expected = f.readlines()
+                for threshold in (1, 1 << 20):
+                    with self.subTest(data=data, threshold=threshold):
+                        with mock.patch.object(source, "MMAP_THRESHOLD", threshold):
+                            self.assertEqual(read_lines(path), expected)
+
+    def test_undecodable_or_missing_file_is_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = self._write(d, b"# coding: nope\n")
+            self.assertEqual(read_lines(path), [])
+            self.assertEqual(read_lines(os.path.join(d, "missing.py")), [])
+
+    def test_check_file_honours_the_cookie(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = self._write(d, _LATIN1)
+            codes = [(v.line, v.code) for v in check_file(path)]
+            self.assertIn((1, "NNO601"), codes)
+            self.assertNotIn("E999", [code for _, code in codes])
+
+
+class TestLineView(unittest.TestCase):
+    def test_lines_and_text_give_the_same_results(self) -> None:
+        text = "import os\n\n# comment\nfrom typing import List\nn1 = 1  # noqa\n"
+        lines = text.splitlines(keepends=True)
+        for tree in (None, ast.parse(text)):
+            with self.subTest(tree=tree is not None):
+                self.assertEqual(
+                    run_token_checks(text=lines, filename="n1.py", tree=tree),
+                    run_token_checks(text=text, filename="n1.py", tree=tree),
+                )
+
+    def test_cache_key_is_the_same_for_chunks(self) -> None:
+        lines = ["n1 = 1\n", "n2 = 2\n"]
+        self.assertEqual(
+            cache_key(content=(line.encode() for line in lines), filename="n1.py", settings={}),
+            cache_key(content="".join(lines).encode(), filename="n1.py", settings={}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import nflake8
+from nflake8.cli import main
+from nflake8.core import suggestions
+from nflake8.stats import ViolationStats
+
+_SOURCE = "import os\ncount = 1\n\n\ndef f(value):\n    return value\n"
+
+
+def _project(root: str, files: int) -> None:
+    open(os.path.join(root, "pyproject.toml"), "w").close()
+    os.makedirs(os.path.join(root, "n1"))
+    for i in range(files):
+        with open(os.path.join(root, "n1" if i % 2 else "", f"n{i}.py"), "w", encoding="utf-8") as f:
+            f.write(_SOURCE)
+    with open(os.path.join(root, "n100.py"), "w", encoding="utf-8") as f:
+        f.write("")
+
+
+class TestViolationStats(unittest.TestCase):
+    def test_merge_and_reports(self) -> None:
+        first = ViolationStats()
+        first.add("n1/n1.py", {"NNO101": 2})
+        first.add("n2.py", {})
+        second = ViolationStats()
+        second.add("n1/n1.py", {"NNO104": 1})
+        second.add("n1/n3.py", {"NNO101": 1})
+        first.merge(second)
+
+        self.assertEqual((first.files, first.total), (3, 4))
+        self.assertEqual(first.by_code(), Counter({"NNO101": 3, "NNO104": 1}))
+        self.assertEqual(first.by_directory(), {"n1": Counter({"NNO101": 3, "NNO104": 1})})
+        data = json.loads(first.to_json())
+        self.assertEqual(data["by_file"], {"n1/n1.py": {"NNO101": 2, "NNO104": 1}, "n1/n3.py": {"NNO101": 1}})
+        self.assertEqual(
+            first.to_csv().splitlines(),
+            [
+                "scope,path,code,count",
+                "code,,NNO101,3",
+                "code,,NNO104,1",
+                "directory,n1,NNO101,3",
+                "directory,n1,NNO104,1",
+                "file,n1/n1.py,NNO101,2",
+                "file,n1/n1.py,NNO104,1",
+                "file,n1/n3.py,NNO101,1",
+            ],
+        )
+
+    def test_lint_stats_counts_what_lint_files_reports(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            _project(root, files=6)
+            expected = ViolationStats()
+            for result in nflake8.lint_files([root]):
+                expected.add(result.filename, result.batch.count_by_code())
+
+            # counting never renders a suggested name
+            with mock.patch.object(suggestions, "_hashed_symbol_id", side_effect=AssertionError):
+                got = nflake8.lint_stats([root], jobs=2, chunksize=2)
+            self.assertEqual(got.files, 7)
+            self.assertEqual(got.to_json(), expected.to_json())
+
+    def test_cli_prints_only_the_report(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            _project(root, files=2)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main(["-j", "2", "--nno-stats", "--nno-stats-format", "csv", root])
+            self.assertEqual(code, 1)
+            lines = out.getvalue().splitlines()
+            self.assertEqual(lines[0], "scope,path,code,count")
+            self.assertFalse([line for line in lines if ".py:" in line])
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main(["--nno-stats", "--project-only", "--exit-zero", root])
+            self.assertEqual(code, 0)
+            self.assertEqual(json.loads(out.getvalue())["files"], 3)
+
+    def test_cli_path_right_after_the_flag(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            _project(root, files=2)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main(["--nno-stats", root])
+            self.assertEqual(code, 1)
+            self.assertEqual(json.loads(out.getvalue())["files"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
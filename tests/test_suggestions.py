@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import unittest
+import zlib
+from unittest import mock
+
+from nflake8.core import suggestions
+from nflake8.core.ids import hashed_id
+from nflake8.core.suggestions import suggestion
+from nflake8.core.types import Violation
+
+
+class TestStableIds(unittest.TestCase):
+    def test_position_digits_hash_the_full_payload(self) -> None:
+        for kind, filename, line, col in [("var", "n1.py", 1, 0), ("class", "pkg/nmod.py", 120, 33)]:
+            expected = zlib.crc32(f"{kind}|{filename}|{line}|{col}".encode("utf-8")) % 10**10
+            self.assertEqual(
+                suggestions._stable_10_digits(kind=kind, filename=filename, line=line, col=col),
+                f"{expected:010d}",
+            )
+
+    def test_symbol_digits_do_not_depend_on_the_position(self) -> None:
+        first = suggestion("var", filename="n1.py", line=1, col=0, name="x", scope="f")
+        second = suggestion("var", filename="n1.py", line=9, col=4, name="x", scope="f")
+        self.assertEqual(str(first), str(second))
+        self.assertNotEqual(str(first), str(suggestion("var", filename="n1.py", line=1, col=0, name="x")))
+
+    def test_symbol_digits_resume_from_the_hashed_prefix(self) -> None:
+        for kind, filename, scope, name in [("var", "n1.py", "", "x"), ("class", "pkg/nmod.py", "f.g", "Foo")]:
+            expected = hashed_id(f"{kind}|{filename}|{scope}|{name}")
+            got = suggestions._symbol_10_digits(kind=kind, filename=filename, scope=scope, name=name)
+            self.assertEqual(got, f"{expected:010d}")
+
+        suggestions._prefix_state.cache_clear()
+        suggestions._hashed_symbol_id.cache_clear()
+        for name in ("x", "y", "x"):
+            suggestions._symbol_10_digits(kind="var", filename="n1.py", scope="", name=name)
+        self.assertEqual(suggestions._prefix_state.cache_info().misses, 1)
+        self.assertEqual(suggestions._hashed_symbol_id.cache_info().hits, 1)
+
+    def test_batch_ids_match_one_by_one(self) -> None:
+        symbols = [("var", "n1.py", "", "x"), ("func", "n1.py", "f", "g"), ("var", "n2.py", "", "x")]
+        with mock.patch.object(suggestions, "ledger_for", wraps=suggestions.ledger_for) as located:
+            got = suggestions.symbol_ids(symbols)
+        self.assertEqual(located.call_count, 2)
+        self.assertEqual(
+            got,
+            [suggestions._symbol_10_digits(kind=k, filename=f, scope=s, name=n) for k, f, s, n in symbols],
+        )
+
+        root = suggestion("class", filename="n1.py", line=2, col=0, name="Foo")
+        suggests = [
+            root,
+            "n",
+            suggestion("derived", filename="n1.py", line=2, col=0, head=root, name="Foo"),
+            suggestion("var", filename="n1.py", line=3, col=4),
+        ]
+        self.assertEqual(suggestions.suggest_names(suggests), [str(s) for s in suggests])
+
+
+class TestSuggestion(unittest.TestCase):
+    def test_derived_renders_head_and_suffix(self) -> None:
+        root = suggestion("class", filename="n1.py", line=2, col=0, name="Foo")
+        derived = suggestion("derived", filename="n1.py", line=2, col=0, head=root, name="Foo")
+        digits = suggestions._symbol_10_digits(kind="derived", filename="n1.py", scope="", name="Foo")
+        self.assertEqual(str(derived), f"{root}n{digits}")
+        self.assertTrue(str(root).startswith("N"))
+
+    def test_violation_renders_suggestion_lazily(self) -> None:
+        v = Violation(
+            _line=1,
+            _col=0,
+            _code="NNO101",
+            _message="var-name invalid got x",
+            _suggest=suggestion("var", filename="n1.py", line=1, col=0, name="x"),
+        )
+        expected = suggestions._symbol_10_digits(kind="var", filename="n1.py", scope="", name="x")
+        with mock.patch.object(suggestions, "_symbol_10_digits", wraps=suggestions._symbol_10_digits) as digits:
+            self.assertEqual(v.to_flake8(object, with_suggestion=False)[2], "NNO101 var-name invalid got x")
+            digits.assert_not_called()
+
+            self.assertEqual(v.message, f"var-name invalid got x (suggest n{expected})")
+            self.assertTrue(digits.called)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from nflake8.api import lint_files
+from nflake8.checks.tokens import run_token_checks
+from nflake8.cli import main
+from nflake8.core.index import SymbolIndex, clear_symbol_indexes
+from nflake8.fix import fix_files
+from tests.helpers import write_file
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(tmp.name, "project")
+        self.store = os.path.join(tmp.name, "index")
+        write_file(os.path.join(self.root, "README.md"), "")
+        write_file(
+            os.path.join(self.root, "N1", "n1.py"), "n1 = 1\n\n\ndef n2():\n    n3 = 1\n\n\nclass N1:\n    n4 = 1\n"
+        )
+        write_file(os.path.join(self.root, "N1", "n2.py"), "from .n1 import *\n")
+        write_file(os.path.join(self.root, "N1", "N1_1", "n3.py"), "if n1:\n    import os as N1\n")
+        write_file(os.path.join(self.root, "N2", "README.md"), "")
+        write_file(os.path.join(self.root, "N2", "n1.py"), "n9 = 1\n")
+
+    def test_top_level_names_per_module(self) -> None:
+        index = SymbolIndex(self.root)
+        self.assertEqual(index.refresh(), 3)
+
+        self.assertEqual(index.exports("N1.n1"), {"n1", "n2", "N1"})
+        self.assertEqual(index.exports("N1.N1_1.n3"), {"N1"})
+        # a nested project root is indexed on its own
+        self.assertIsNone(index.exports("N2.n1"))
+        self.assertTrue(index.has_name("N1", "N1_1"))
+        self.assertTrue(index.has_name("N1.n2", "anything"))
+        self.assertFalse(index.has_name("N1.n1", "n3"))
+        self.assertIsNone(index.has_name("os", "path"))
+
+    def test_relative_imports_resolve_from_the_file(self) -> None:
+        index = SymbolIndex(self.root)
+        filename = os.path.join(self.root, "N1", "N1_1", "n3.py")
+        self.assertEqual(index.resolve(filename, "n1", 2), "N1.n1")
+        self.assertEqual(index.resolve(filename, None, 1), "N1.N1_1")
+        self.assertIsNone(index.resolve(filename, "n1", 4))
+
+    def test_refresh_only_rereads_changed_files(self) -> None:
+        index = SymbolIndex(self.root)
+        index.refresh()
+        index.save(directory=self.store)
+
+        loaded = SymbolIndex.load(self.root, directory=self.store)
+        self.assertEqual(loaded.digest, index.digest)
+        self.assertEqual(loaded.refresh(), 0)
+
+        write_file(os.path.join(self.root, "N1", "n1.py"), "n5 = 1\n")
+        os.unlink(os.path.join(self.root, "N1", "n2.py"))
+        self.assertEqual(loaded.refresh(), 2)
+        self.assertEqual(loaded.exports("N1.n1"), {"n5"})
+        self.assertIsNone(loaded.exports("N1.n2"))
+
+
+class TestImportedNames(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(clear_symbol_indexes)
+        self.root = tmp.name
+        write_file(os.path.join(self.root, "README.md"), "")
+        write_file(os.path.join(self.root, "N1", "n1.py"), "n1234567890 = 1\n")
+        self.index = SymbolIndex(self.root)
+        self.index.refresh()
+
+    def _check(self, source: str) -> list[tuple[str, str | None]]:
+        filename = os.path.join(self.root, "N1", "n2.py")
+        v = run_token_checks(text=source, filename=filename, index=self.index)
+        return [(x.code, x.suggest) for x in v if x.code == "NNO304"]
+
+    def test_missing_name_is_reported_with_the_closest_one(self) -> None:
+        self.assertEqual(self._check("from N1.n1 import n1234567891\n"), [("NNO304", "n1234567890")])
+        self.assertEqual(self._check("from .n1 import n1234567891\n"), [("NNO304", "n1234567890")])
+
+    def test_existing_names_and_other_modules_pass(self) -> None:
+        self.assertEqual(self._check("from N1.n1 import n1234567890\n"), [])
+        self.assertEqual(self._check("from N1 import n1\n"), [])
+        self.assertEqual(self._check("from os import n1234567890\n"), [])
+
+    def test_lint_files_only_looks_names_up_when_asked(self) -> None:
+        write_file(os.path.join(self.root, "N1", "n2.py"), "from N1.n1 import n1\n")
+        for symbol_index in (False, True):
+            with self.subTest(symbol_index=symbol_index):
+                codes = [
+                    v.code
+                    for r in lint_files([self.root], jobs=2, symbol_index=symbol_index)
+                    for v in r.violations
+                ]
+                self.assertEqual(codes.count("NNO304"), int(symbol_index))
+
+
+class TestFixImporters(unittest.TestCase):
+    def test_renamed_names_are_followed_by_their_importers(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            self.addCleanup(clear_symbol_indexes)
+            write_file(os.path.join(root, "README.md"), "")
+            write_file(os.path.join(root, "N1", "n1.py"), "def helper():\n    return 1\n")
+            importer = os.path.join(root, "N1", "n2.py")
+            write_file(
+                importer,
+                "from N1.n1 import helper\nfrom .n1 import helper as N1\nimport N1.n1 as N2\n\n"
+                "print(helper(), N1(), N2.helper())\n",
+            )
+
+            out, err = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                main(["-j", "1", "--nno-fix", os.path.join(root, "N1", "n1.py")])
+            self.assertIn("updated 3 imports", err.getvalue())
+
+            with open(os.path.join(root, "N1", "n1.py"), encoding="utf-8") as f:
+                new = f.read().split("(")[0].split()[-1]
+            with open(importer, encoding="utf-8") as f:
+                self.assertEqual(
+                    f.read(),
+                    f"from N1.n1 import {new} as helper\nfrom .n1 import {new} as N1\nimport N1.n1 as N2\n\n"
+                    f"print(helper(), N1(), N2.{new}())\n",
+                )
+            results = list(fix_files([importer]))
+            self.assertEqual([(r.renames, r.imports) for r in results], [(0, 0)])
+
+    def test_module_objects_are_followed_down_submodules(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            self.addCleanup(clear_symbol_indexes)
+            write_file(os.path.join(root, "README.md"), "")
+            write_file(os.path.join(root, "N1", "__init__.py"), "")
+            write_file(os.path.join(root, "N1", "n1.py"), "def helper(value):\n    return value\n")
+            importer = os.path.join(root, "N1", "n2.py")
+            write_file(importer, "import N1.n1\nfrom N1 import n1 as N3\n\nresult = N1.n1.helper(1) + N3.helper(2)\n")
+
+            results = list(fix_files([os.path.join(root, "N1", "n1.py")]))
+            self.assertEqual(sorted((r.renames, r.imports) for r in results), [(0, 2), (1, 0)])
+            with open(os.path.join(root, "N1", "n1.py"), encoding="utf-8") as f:
+                new = f.read().split("(")[0].split()[-1]
+            self.assertNotEqual(new, "helper")
+            with open(importer, encoding="utf-8") as f:
+                self.assertEqual(
+                    f.read(), f"import N1.n1\nfrom N1 import n1 as N3\n\nresult = N1.n1.{new}(1) + N3.{new}(2)\n"
+                )
+            index = SymbolIndex(root)
+            index.refresh()
+            self.assertEqual(index.importers(["N1.n1"]), [importer])
+
+            namespace: dict[str, object] = {}
+            with mock.patch.object(sys, "path", [root, *sys.path]):
+                self.addCleanup(lambda: [sys.modules.pop(m, None) for m in ("N1", "N1.n1", "N1.n2")])
+                exec("from N1.n2 import result", namespace)
+            self.assertEqual(namespace["result"], 3)
+
+    def test_members_of_instances_returned_to_other_modules_are_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            self.addCleanup(clear_symbol_indexes)
+            write_file(os.path.join(root, "README.md"), "")
+            write_file(os.path.join(root, "N1", "__init__.py"), "")
+            write_file(
+                os.path.join(root, "N1", "n1.py"),
+                "class Shape:\n    def __init__(self, size):\n        self.size = size\n\n"
+                "    def area(self):\n        return self.size * self.size\n\n\n"
+                "def build(size=2):\n    return Shape(size)\n",
+            )
+            write_file(os.path.join(root, "n2.py"), "import N1.n1\n\nassert N1.n1.build().area() == 4\n")
+
+            list(fix_files([root]))
+            with open(os.path.join(root, "N1", "n1.py"), encoding="utf-8") as f:
+                text = f.read()
+            self.assertNotIn("class Shape", text)
+            self.assertIn("def area(", text)
+
+            namespace: dict[str, object] = {}
+            with mock.patch.object(sys, "path", [root, *sys.path]):
+                self.addCleanup(lambda: [sys.modules.pop(m, None) for m in ("N1", "N1.n1", "n2")])
+                exec("import n2", namespace)
+
+    def test_names_used_in_ways_importers_cannot_follow_are_kept(self) -> None:
+        module = "def helper(size):\n    return size\n\n\ndef other():\n    return 2\n"
+        importers = {
+            "import N1.n1\n\nprint(N1.n1)\n": {"helper", "other", "size"},
+            "from N1 import n1\n\nprint(n1.other())\nn1 = None\n": {"helper", "other", "size"},
+            "import importlib\n\nprint(importlib.import_module('N1.n1').other())\n": {"helper", "other", "size"},
+            "import N1.n1 as N2\n\nprint(getattr(N2, 'other')())\n": {"helper", "other", "size"},
+            "from N1.n1 import helper\n\nprint(helper(size=1))\n": {"size"},
+            "from N1.n1 import *\n": {"helper", "other", "size"},
+        }
+        for source, kept in importers.items():
+            with self.subTest(source=source), tempfile.TemporaryDirectory() as root:
+                self.addCleanup(clear_symbol_indexes)
+                write_file(os.path.join(root, "README.md"), "")
+                write_file(os.path.join(root, "N1", "n1.py"), module)
+                write_file(os.path.join(root, "N1", "n2.py"), source)
+
+                list(fix_files([os.path.join(root, "N1", "n1.py")]))
+                with open(os.path.join(root, "N1", "n1.py"), encoding="utf-8") as f:
+                    text = f.read()
+                self.assertEqual({name for name in ("helper", "other", "size") if name in text}, kept)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import ast
+import io
+import tokenize
+import unittest
+from unittest import mock
+
+from nflake8.checks import tokens as tokens_module
+from nflake8.checks.tokens import run_token_checks
+from nflake8.runner import check_text
+
+_SOURCE = """\
+import os
+import N1.n1
+
+# comment
+from typing import List
+"""
+
+
+def _codes(violations) -> list[tuple[int, str]]:
+    return [(v.line, v.code) for v in violations]
+
+
+class TestTokenInputs(unittest.TestCase):
+    def test_prebuilt_tree_and_tokens_match_standalone_results(self) -> None:
+        standalone = run_token_checks(text=_SOURCE, filename="n1.py")
+
+        tree = ast.parse(_SOURCE)
+        toks = list(tokenize.generate_tokens(io.StringIO(_SOURCE).readline))
+        reused = run_token_checks(text=_SOURCE, filename="n1.py", tree=tree, tokens=toks)
+
+        self.assertEqual(_codes(standalone), _codes(reused))
+        self.assertIn("NNO601", [c for _, c in _codes(reused)])
+
+    def test_prebuilt_tree_is_not_reparsed(self) -> None:
+        tree = ast.parse(_SOURCE)
+        with mock.patch.object(tokens_module.ast, "parse", side_effect=AssertionError):
+            run_token_checks(text=_SOURCE, filename="n1.py", tree=tree)
+
+    def test_prebuilt_tokens_are_not_retokenized(self) -> None:
+        toks = list(tokenize.generate_tokens(io.StringIO(_SOURCE).readline))
+        with mock.patch.object(tokens_module, "_iter_tokens", side_effect=AssertionError):
+            run_token_checks(text=_SOURCE, filename="n1.py", tokens=toks)
+
+
+_IMPORT_CODES = frozenset({"NNO301", "NNO302", "NNO303", "NNO310", "NNO311", "NNO312"})
+
+
+class TestImportBlockStreaming(unittest.TestCase):
+    def _consumed_lines(self, source: str, *, codes: frozenset[str] | None) -> tuple[list, int]:
+        seen: list[int] = []
+        real = tokens_module._iter_tokens
+
+        def counting(text: str):
+            for tok in real(text):
+                seen.append(tok.start[0])
+                yield tok
+
+        with mock.patch.object(tokens_module, "_iter_tokens", counting):
+            got = run_token_checks(text=source, filename="n1.py", codes=codes)
+        return got, max(seen)
+
+    def test_tokenizing_stops_after_imports_without_comment_codes(self) -> None:
+        body = "".join(f"n{i} = {i}  # comment\n" for i in range(1000))
+        source = "import os\nfrom typing import (\n    List,\n)\n\n" + body
+
+        got, last_line = self._consumed_lines(source, codes=_IMPORT_CODES)
+        self.assertLessEqual(last_line, 6)
+        self.assertEqual(_codes(got), [(1, "NNO301"), (2, "NNO302")])
+
+        everything, last_line = self._consumed_lines(source, codes=None)
+        self.assertEqual(last_line, len(source.splitlines()) + 1)
+        self.assertEqual([v for v in everything if v.code in _IMPORT_CODES], got)
+
+    def test_import_block_end_matches_the_tree(self) -> None:
+        sources = [
+            '"""doc"""\nimport os\n',
+            "import os; x = 1\nimport sys\n",
+            "import os\n\n# comment\nimport sys\n@dec\ndef f():\n    import re\n",
+            "import os\nif True:\n    import sys\n",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                standalone = run_token_checks(text=source, filename="n1.py", codes=_IMPORT_CODES)
+                with_tree = run_token_checks(
+                    text=source, filename="n1.py", tree=ast.parse(source), codes=_IMPORT_CODES
+                )
+                self.assertEqual(_codes(standalone), _codes(with_tree))
+
+    def test_syntax_error_after_the_import_block(self) -> None:
+        # only the import block is parsed: its checks still run, while a full
+        # check reports the file as E999 only
+        source = "import os\nimport N1.n1 as n2\n\nx = = 1\n"
+        for codes in (_IMPORT_CODES, None):
+            with self.subTest(codes=codes):
+                got = run_token_checks(text=source, filename="n1.py", codes=codes)
+                self.assertEqual(_codes(got), [(1, "NNO301"), (2, "NNO311")])
+        self.assertEqual([v.code for v in check_text(text=source, filename="n1.py")], ["E999"])
@@ -86,3 +86,27 @@ with open("x", "w") as f:
         r = run_rule_on_source(VarNames(), src)
         self.assertIn("NNO101", r.codes)
         self.assertTrue(any("(suggest " in v.message for v in r.violations))
+
+    def test_reports_wrong_third_comprehension_iterator(self) -> None:
+        src = "n1234567890 = [n for n in range(3) for nn in range(3) for n in range(3)]\n"
+        r = run_rule_on_source(VarNames(), src)
+        self.assertEqual(r.codes, ["NNO110"])
+
+    def test_loop_depth_counts_loops_around_nested_function(self) -> None:
+        src = """\
+for n in range(3):
+    def n1234567890():
+        for nn in range(3):
+            pass
+"""
+        r = run_rule_on_source(VarNames(), src)
+        self.assertNotIn("NNO110", r.codes)
+
+    def test_checks_assignment_in_method_body(self) -> None:
+        src = """\
+class N1234567890:
+    def n_1234567890(n1234567890):
+        count = 0
+"""
+        r = run_rule_on_source(VarNames(), src)
+        self.assertIn("NNO101", r.codes)
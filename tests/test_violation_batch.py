@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import ast
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import nflake8
+from nflake8.core import suggestions
+from nflake8.core.batch import ViolationBatch
+from nflake8.core.types import Violation
+from nflake8.runner import check_source
+
+_SOURCE = "import os\ncount = 1  # comment\n\n\ndef f(value, *, flag=False):\n    return value\n"
+
+
+def _violations() -> list[Violation]:
+    v = check_source(text=_SOURCE, filename="n1.py", tree=ast.parse(_SOURCE))
+    v.append(Violation(_line=7, _col=0, _code="E999", _message="SyntaxError: invalid syntax"))
+    v.append(Violation(_line=8, _col=2, _code="X100", _message="custom"))
+    return v
+
+
+class TestViolationBatch(unittest.TestCase):
+    def test_round_trip_keeps_every_field(self) -> None:
+        violations = _violations()
+        batch = ViolationBatch.from_violations(violations)
+        self.assertEqual(len(batch), len(violations))
+        self.assertEqual(list(batch), violations)
+        self.assertEqual(batch[1], violations[1])
+        self.assertEqual(list(batch.lines), [v.line for v in violations])
+
+    def test_counts_and_selection_do_not_render_messages(self) -> None:
+        violations = _violations()
+        batch = ViolationBatch.from_violations(violations)
+        with mock.patch.object(suggestions, "_hashed_symbol_id", side_effect=AssertionError):
+            counts = batch.count_by_code()
+            selected = batch.select(frozenset({"NNO601", "X100"}))
+        self.assertEqual(sum(counts.values()), len(violations))
+        self.assertEqual(counts["NNO601"], 1)
+        self.assertEqual([v.code for v in selected], ["NNO601", "X100"])
+
+    def test_pickles_codes_by_name(self) -> None:
+        batch = ViolationBatch.from_violations(_violations())
+        copy = pickle.loads(pickle.dumps(batch))
+        self.assertEqual(list(copy), list(batch))
+        self.assertEqual(list(copy.to_flake8(object)), [v.to_flake8(object) for v in batch])
+
+    def test_lint_files_results_carry_batches(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            open(os.path.join(root, "pyproject.toml"), "w").close()
+            for i in range(3):
+                with open(os.path.join(root, f"n{i}.py"), "w", encoding="utf-8") as f:
+                    f.write(_SOURCE)
+            results = list(nflake8.lint_files([root], jobs=2))
+            for result in results:
+                self.assertEqual(sum(result.batch.count_by_code().values()), len(result.violations))
+                self.assertIs(result.violations, result.violations)
+
+
+if __name__ == "__main__":
+    unittest.main()